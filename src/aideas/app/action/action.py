@@ -4,6 +4,7 @@ import uuid
 from typing import Union, Any
 
 from .variable_parser import get_run_arg_replacement
+from .variable_template import TextTemplate
 from ..config import split_preserving_quotes
 from ..env import get_agent_results_dir, get_content_dir
 
@@ -34,18 +35,31 @@ class Action:
            run_context: 'RunContext' = None) -> 'Action':
         if action_signature == 'none':
             return Action.none()
-        parts: list[str] = split_preserving_quotes(action_signature, remove_quotes=True)
-        if len(parts) == 0:
-            raise ValueError(f'Unsupported action: {stage_item_id}.{action_signature}')
 
-        name, args = Action.__split_into_name_and_args(parts)
+        name, args = Action.parse_signature(stage_item_id, action_signature)
 
         for i in range(len(args)):
-            args[i] = get_run_arg_replacement(
-                [agent_name, stage_id, stage_item_id], args[i], run_context)
+            template = TextTemplate.of(args[i])
+            if template.has_variables():
+                args[i] = get_run_arg_replacement(
+                    [agent_name, stage_id, stage_item_id], args[i], run_context, template)
 
         return Action(agent_name, stage_id, stage_item_id, name, args)
 
+    @staticmethod
+    def parse_signature(stage_item_id: str, action_signature: str) -> tuple[str, list[str]]:
+        """
+        Input: wait 3
+        Output: (wait, [3])
+        :param stage_item_id: The id of the stage item having the action. Used in error messages.
+        :param action_signature: The action signature to parse.
+        :return: The name and the arguments of the action, with variables not replaced.
+        """
+        parts: list[str] = split_preserving_quotes(action_signature, remove_quotes=True)
+        if len(parts) == 0:
+            raise ValueError(f'Unsupported action: {stage_item_id}.{action_signature}')
+        return Action.__split_into_name_and_args(parts)
+
     def __init__(self,
                  agent_name: str,
                  stage_id: str,
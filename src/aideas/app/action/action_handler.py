@@ -7,7 +7,7 @@ import time
 # If removed we get ImportError for eval(action: Action) function below
 import importlib
 from enum import Enum, unique
-from typing import Union, TypeVar, Any
+from typing import Union, TypeVar, Any, Callable
 
 from pyu.io.file import read_content, write_content
 from .action import Action
@@ -65,6 +65,32 @@ DEFAULT_FILE_NAME = "result.txt"
 class ActionHandler:
     __ALL_FILE_TYPES = '*'
 
+    # Dispatch table, from action name to the function which handles the action.
+    __HANDLERS: dict[str, Callable[['ActionHandler', RunContext, Action], ActionResult]] = {
+        ActionId.ASK_FOR_HELP.value: lambda handler, _, action: handler.ask_for_help(action),
+        ActionId.CONTEXT.value: lambda handler, run_context, action: handler.context(run_context, action),
+        ActionId.EVAL.value: lambda handler, _, action: handler.eval(action),
+        ActionId.EXEC.value: lambda handler, _, action: handler.exec(action),
+        ActionId.GET_FILE_CONTENT.value: lambda handler, _, action: handler.get_file_content(action),
+        ActionId.GET_FILES.value: lambda handler, _, action: handler.get_files(action),
+        ActionId.GET_FIRST_FILE.value: lambda handler, _, action: handler.get_first_file(action),
+        ActionId.GET_NEWEST_FILE_IN_DIR.value:
+            lambda handler, _, action: handler.get_newest_file_in_dir(action),
+        ActionId.LOG.value: lambda handler, _, action: handler.log(action),
+        ActionId.PUBLISH_CONTENT.value:
+            lambda handler, run_context, action: handler.publish_content(run_context, action),
+        ActionId.RETURN.value: lambda handler, _, action: ActionResult.success(action, action.get_args()),
+        ActionId.RUN_SUBPROCESS.value: lambda handler, _, action: handler.run_subprocess(action),
+        ActionId.SAVE_FILE.value: lambda handler, _, action: handler.save_file(action),
+        ActionId.SAVE_TEXT.value: lambda handler, _, action: handler.save_text(action),
+        ActionId.STARTS_WITH.value: lambda handler, _, action: handler.starts_with(action),
+        ActionId.TRANSLATE.value:
+            lambda handler, run_context, action: handler.translate(run_context, action),
+        ActionId.TRANSLATE_SUBTITLES.value:
+            lambda handler, run_context, action: handler.translate_subtitles(run_context, action),
+        ActionId.WAIT.value: lambda handler, _, action: handler.wait(action),
+    }
+
     @staticmethod
     def noop() -> 'ActionHandler':
         return NOOP
@@ -114,44 +140,11 @@ class ActionHandler:
     def _execute_by_key(self, run_context: RunContext, action: Action, key: str) -> ActionResult:
         if action == Action.none():
             result = ActionResult.none()
-        elif key == ActionId.ASK_FOR_HELP.value:
-            result: ActionResult = self.ask_for_help(action)
-        elif key == ActionId.CONTEXT.value:
-            result: ActionResult = self.context(run_context, action)
-        elif key == ActionId.EVAL.value:
-            result: ActionResult = self.eval(action)
-        elif key == ActionId.EXEC.value:
-            result: ActionResult = self.exec(action)
-        elif key == ActionId.GET_FILE_CONTENT.value:
-            result: ActionResult = self.get_file_content(action)
-        elif key == ActionId.GET_FILES.value:
-            result: ActionResult = self.get_files(action)
-        elif key == ActionId.GET_FIRST_FILE.value:
-            result: ActionResult = self.get_first_file(action)
-        elif key == ActionId.GET_NEWEST_FILE_IN_DIR.value:
-            result: ActionResult = self.get_newest_file_in_dir(action)
-        elif key == ActionId.LOG.value:
-            result: ActionResult = self.log(action)
-        elif key == ActionId.PUBLISH_CONTENT.value:
-            result: ActionResult = self.publish_content(run_context, action)
-        elif key == ActionId.RETURN.value:
-            result: ActionResult = ActionResult.success(action, action.get_args())
-        elif key == ActionId.RUN_SUBPROCESS.value:
-            result: ActionResult = self.run_subprocess(action)
-        elif key == ActionId.SAVE_FILE.value:
-            result: ActionResult = self.save_file(action)
-        elif key == ActionId.SAVE_TEXT.value:
-            result: ActionResult = self.save_text(action)
-        elif key == ActionId.STARTS_WITH.value:
-            result: ActionResult = self.starts_with(action)
-        elif key == ActionId.TRANSLATE.value:
-            result: ActionResult = self.translate(run_context, action)
-        elif key == ActionId.TRANSLATE_SUBTITLES.value:
-            result: ActionResult = self.translate_subtitles(run_context, action)
-        elif key == ActionId.WAIT.value:
-            result: ActionResult = self.wait(action)
         else:
-            raise ValueError(f'Unsupported: {action}')
+            handle = ActionHandler.__HANDLERS.get(key, None)
+            if handle is None:
+                raise ValueError(f'Unsupported: {action}')
+            result: ActionResult = handle(self, run_context, action)
         logger.debug(f'{result}')
         return result
 
@@ -161,12 +154,12 @@ class ActionHandler:
 
     @staticmethod
     def translate(run_context: RunContext, action: Action) -> ActionResult:
-        translation_cfg = run_context.values(['service-url', 'chunk-size', 'user-agent', 'verbose'])
+        translation_cfg = run_context.values(['service-url', 'chunk-size', 'max-concurrency', 'user-agent', 'verbose'])
         return TranslateAction.of_config(translation_cfg).execute(run_context, action)
 
     @staticmethod
     def translate_subtitles(run_context: RunContext, action: Action) -> ActionResult:
-        translation_cfg = run_context.values(['service-url', 'chunk-size', 'user-agent', 'verbose'])
+        translation_cfg = run_context.values(['service-url', 'chunk-size', 'max-concurrency', 'user-agent', 'verbose'])
         return TranslateSubtitlesAction.of_config(translation_cfg).execute(run_context, action)
 
     @staticmethod
@@ -0,0 +1,90 @@
+import functools
+import logging
+from typing import Union
+
+from .action import Action
+from .variable_parser import get_run_arg_replacement
+from .variable_template import TextTemplate
+
+logger = logging.getLogger(__name__)
+
+RUN_STAGES = 'run_stages'
+
+
+class PlannedAction:
+    """
+    An action signature, parsed once. Only the arguments having variables are resolved
+    each time an action is created from it, as their values are only known at run time.
+    """
+    def __init__(self, agent_name: str, stage_id: str, stage_item_id: str, signature: str):
+        self.__agent_name = agent_name
+        self.__stage_id = stage_id
+        self.__stage_item_id = stage_item_id
+        self.__signature = signature
+        self.__run_stages = signature.startswith(RUN_STAGES)
+        self.__none = signature == 'none'
+        self.__name = ''
+        self.__args: list[tuple[str, Union[TextTemplate, None]]] = []
+        self.__error: Union[ValueError, None] = None
+        if not self.__run_stages and not self.__none:
+            try:
+                self.__name, args = Action.parse_signature(stage_item_id, signature)
+            except ValueError as ex:
+                # Raised when the action is to be run, as it would have been without a plan.
+                self.__error = ex
+                args = []
+            for arg in args:
+                template = TextTemplate.of(arg)
+                self.__args.append((arg, template if template.has_variables() else None))
+
+    def to_action(self, run_context: 'RunContext' = None) -> Action:
+        """
+        Create the action, replacing the variables in its arguments with their current values.
+        Equivalent to ``Action.of``.
+        :param run_context: The run context, from which the variables are resolved.
+        :return: The action.
+        """
+        if self.__none:
+            return Action.none()
+        if self.__run_stages:
+            raise ValueError(f'Not an action: {self.__signature}')
+        if self.__error is not None:
+            raise self.__error
+        curr_path = [self.__agent_name, self.__stage_id, self.__stage_item_id]
+        args = [arg if template is None
+                else get_run_arg_replacement(curr_path, arg, run_context, template)
+                for arg, template in self.__args]
+        return Action(self.__agent_name, self.__stage_id, self.__stage_item_id, self.__name, args)
+
+    def get_signature(self) -> str:
+        return self.__signature
+
+    def get_name(self) -> str:
+        return self.__name
+
+    def is_run_stages(self) -> bool:
+        return self.__run_stages
+
+    def has_variables(self) -> bool:
+        return any(template is not None for _, template in self.__args)
+
+
+class ActionPlan:
+    """
+    The actions of a stage item, parsed once and reused each time the stage item is run,
+    e.g. on retries, iterations and subsequent runs of the same agent.
+    """
+    @staticmethod
+    @functools.lru_cache(maxsize=2048)
+    def of(agent_name: str,
+           stage_id: str,
+           stage_item_id: str,
+           action_signatures: tuple[str, ...]) -> 'ActionPlan':
+        return ActionPlan([PlannedAction(agent_name, stage_id, stage_item_id, signature)
+                           for signature in action_signatures])
+
+    def __init__(self, actions: list[PlannedAction]):
+        self.__actions = tuple(actions)
+
+    def get_actions(self) -> tuple[PlannedAction, ...]:
+        return self.__actions
@@ -1,3 +1,4 @@
+import itertools
 import logging
 import os.path
 import shutil
@@ -13,15 +14,19 @@ from pyu.io.file import read_content, write_content
 
 from ..action.action import Action
 from ..action.action_result import ActionResult
-from ..agent.translation.subtitles import grouping_subtitle, subtitle_read, subtitle_save
+from ..action.publish_orchestrator import PublishOrchestrator
+from ..agent.translation.subtitles import CaptionsWriter, group_captions, read_captions
 from ..agent.translation.translator import Translator
 from ..config import RunArg
-from ..env import Env, require_env_value
+from ..env import Env, get_env_value, require_env_value
 from ..run_context import RunContext
 from ..text import list_from_object
 
 logger = logging.getLogger(__name__)
 
+# The number of grouped captions translated at a time.
+SUBTITLES_BATCH_SIZE: int = 200
+
 
 def _detect_language_code_from_filename(filename: str) -> Union[str, None]:
     file_ext = require_env_value(Env.SUBTITLES_FILE_EXTENSION)
@@ -54,12 +59,25 @@ class PublishContentAction:
 
         configs = self.__action_configs(run_context, content)
 
-        results: dict[str, PostResult] = App().publish_content(platforms, content, configs)
-        # results: dict[str, PostResult] = {}
-        # for platform in platforms:
-        #     results[platform] = PostResult(success=True, post_url="https://example.com")
+        def publish(platform: str) -> PostResult:
+            # We publish to one platform at a time, so the results have only that platform.
+            return next(iter(App().publish_content([platform], content, configs).values()))
+
+        orchestrator = PublishOrchestrator(
+            publish,
+            float(get_env_value(Env.PUBLISH_TIMEOUT_SECONDS)),
+            int(get_env_value(Env.PUBLISH_MAX_RETRIES)))
+
+        def on_result(platform: str, result: PostResult):
+            self.__log_result(platform, result)
+            # Each platform's result is streamed to watchers of the task, as soon as it is known
+            run_context.publish_event('post', {
+                'agent': action.get_agent_name(), 'stage': action.get_stage_id(),
+                'stage-item': action.get_stage_item_id(), 'action': action.get_name(),
+                'platform': platform, 'success': result.success, 'post-url': result.post_url,
+                'message': result.message})
 
-        self.__log_results(results)
+        results: dict[str, PostResult] = orchestrator.publish(platforms, on_result)
 
         return self.__to_action_result(action, results)
 
@@ -133,12 +151,11 @@ class PublishContentAction:
         return configs
 
     @staticmethod
-    def __log_results(results: dict[str, PostResult]):
-        for platform, result in results.items():
-            steps_log = '\n'.join(result.steps_log)
-            logger.debug(f"*** {platform} ***\n{steps_log}\n{platform} => success: {result.success}, post url: {result.post_url}")
-            if not result.success:
-                logger.warning(f"message: {result.message}\nResponse from {platform}: {result.platform_response}")
+    def __log_result(platform: str, result: PostResult):
+        steps_log = '\n'.join(result.steps_log or [])
+        logger.debug(f"*** {platform} ***\n{steps_log}\n{platform} => success: {result.success}, post url: {result.post_url}")
+        if not result.success:
+            logger.warning(f"message: {result.message}\nResponse from {platform}: {result.platform_response}")
 
     @staticmethod
     def __to_action_result(action: Action, results: dict[str, PostResult]) -> ActionResult:
@@ -196,16 +213,14 @@ class TranslateAction:
         for target_dir in action.get_output_dirs(self.get_dir_name()):
             _copy_to_dir(filepath_in, target_dir)
 
-        result = []
+        output_language_codes = [e for e in output_language_codes if e]
 
-        for to_lang in output_language_codes:
+        # Languages are translated concurrently, as are the chunks of each language.
+        # Requests in flight are limited by the translator's client.
+        translated: list[list[str]] = self.__translator.map(
+            lambda to_lang: self.translate(action, from_lang, to_lang), output_language_codes)
 
-            if not to_lang:
-                continue
-
-            output_filepaths = self.translate(action, from_lang, to_lang)
-            if output_filepaths:
-                result.append(output_filepaths[0])
+        result = [output_filepaths[0] for output_filepaths in translated if output_filepaths]
 
         return ActionResult.success(action, result)
 
@@ -273,23 +288,40 @@ class TranslateSubtitlesAction(TranslateAction):
 
     def _translate(self, filepath_in: str, filepaths_out: list[str],
                    input_language_code: str, output_language_code: str):
+        """
+        Captions are read, grouped, translated and written a batch at a time, so that memory
+        use does not grow with the length of the subtitles. After a failure, translation resumes
+        from the last caption written.
+        """
+        writer = CaptionsWriter(filepaths_out[0])
+        try:
+            written: int = writer.resume(group_captions(read_captions(filepath_in)))
+
+            groups = itertools.islice(group_captions(read_captions(filepath_in)), written, None)
+            while True:
+                batch: list[webvtt.Caption] = list(itertools.islice(groups, SUBTITLES_BATCH_SIZE))
+                if not batch:
+                    break
 
-        subtitles_list = subtitle_read(filepath_in)
-        grouped_list = grouping_subtitle(subtitles_list)
+                self.__print_subtitles_if_verbose(batch)
 
-        self.__print_subtitles_if_verbose(grouped_list)
+                translated_result = self.get_translator().translate(
+                    [c.text for c in batch], input_language_code, output_language_code)
 
-        q = (c.text for c in grouped_list)
+                for group_capt, translated_row in zip(batch, translated_result):
+                    group_capt.text = translated_row
 
-        translated_result = self.get_translator().translate(q, input_language_code, output_language_code)
+                self.__print_subtitles_if_verbose(batch)
 
-        for group_capt, translated_row in zip(grouped_list, translated_result):
-            group_capt.text = translated_row
+                writer.write(batch)
 
-        self.__print_subtitles_if_verbose(grouped_list)
+            writer.complete()
+        finally:
+            writer.close()
 
+        for filepath_out in filepaths_out[1:]:
+            shutil.copyfile(filepaths_out[0], filepath_out)
         for filepath_out in filepaths_out:
-            subtitle_save(filepath_out, grouped_list)
             logger.debug(f'{output_language_code} subtitles saved to: '
                          f'{filepath_out}, from: {filepath_in}')
 
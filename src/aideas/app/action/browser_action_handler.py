@@ -4,7 +4,7 @@ import logging
 import os.path
 from enum import unique
 from selenium.webdriver.common.by import By
-from typing import TypeVar, Union
+from typing import TypeVar, Union, Callable
 
 from selenium.common import TimeoutException, NoAlertPresentException
 from selenium.webdriver import ActionChains
@@ -20,6 +20,7 @@ from ..config import RunArg
 from ..env import get_cookies_file, get_cached_results_file
 from ..run_context import RunContext
 from ..web.element_selector import ElementSelector
+from ..web.page_waiter import PageWaiter, Quiescence, DEFAULT_QUIET_SECONDS
 from ..web.webdriver_creator import WEB_DRIVER
 
 logger = logging.getLogger(__name__)
@@ -41,9 +42,35 @@ class BrowserActionId(BaseActionId):
     REFRESH = ('refresh', False)
     SAVE_SCREENSHOT = ('save_screenshot', True)
     SAVE_WEBPAGE = ('save_webpage', True)
+    WAIT_FOR_DOM_MUTATION_QUIET = ('wait_for_dom_mutation_quiet', False)
+    WAIT_FOR_NETWORK_IDLE = ('wait_for_network_idle', False)
+    WAIT_UNTIL_STABLE = ('wait_until_stable', False)
 
 
 class BrowserActionHandler(ActionHandler):
+    # Dispatch table, from action name to the function which handles the action.
+    __HANDLERS: dict[str, Callable[['BrowserActionHandler', RunContext, Action], ActionResult]] = {
+        BrowserActionId.ACCEPT_ALERT.value: lambda handler, _, action: handler.__handle_alert(action),
+        BrowserActionId.ASK_FOR_HELP.value:
+            lambda handler, run_context, action: handler.__ask_for_help(run_context, action),
+        BrowserActionId.BROWSE_TO.value: lambda handler, _, action: handler.__browse_to(action),
+        BrowserActionId.DELETE_COOKIES.value: lambda handler, _, action: handler.__delete_cookies(action),
+        BrowserActionId.DISABLE_CURSOR.value: lambda handler, _, action: handler.__disable_cursor(action),
+        BrowserActionId.DISMISS_ALERT.value: lambda handler, _, action: handler.__handle_alert(action),
+        BrowserActionId.ENABLE_CURSOR.value: lambda handler, _, action: handler.__enable_cursor(action),
+        BrowserActionId.EXECUTE_SCRIPT.value: lambda handler, _, action: handler.__execute_script(action),
+        BrowserActionId.MOVE_BY_OFFSET.value: lambda handler, _, action: handler.__move_by_offset(action),
+        BrowserActionId.REFRESH.value: lambda handler, _, action: handler.__refresh(action),
+        BrowserActionId.SAVE_SCREENSHOT.value: lambda handler, _, action: handler.__save_screenshot(action),
+        BrowserActionId.SAVE_WEBPAGE.value: lambda handler, _, action: handler.__save_webpage(action),
+        BrowserActionId.WAIT_FOR_DOM_MUTATION_QUIET.value:
+            lambda handler, _, action: handler.__wait_for_quiet(action, Quiescence.DOM),
+        BrowserActionId.WAIT_FOR_NETWORK_IDLE.value:
+            lambda handler, _, action: handler.__wait_for_quiet(action, Quiescence.NETWORK),
+        BrowserActionId.WAIT_UNTIL_STABLE.value:
+            lambda handler, _, action: handler.__wait_for_quiet(action, Quiescence.STABLE),
+    }
+
     @staticmethod
     def to_action_id(action: str) -> BaseActionId:
         try:
@@ -87,36 +114,38 @@ class BrowserActionHandler(ActionHandler):
             return ActionResult.success(action)
 
     def _execute_by_key(self, run_context: RunContext, action: Action, key: str) -> ActionResult:
-        if key.endswith('alert'):  # accept_alert|dismiss_alert
-            result = self.__handle_alert(action)
-        elif key == BrowserActionId.ASK_FOR_HELP.value:
-            if run_context.get_arg(RunArg.BROWSER_MODE, None) is None:
-                result = super().ask_for_help(action)
-            else:    
-                result = self.ask_for_help(action)
-        elif key == BrowserActionId.BROWSE_TO.value:
-            result = self.__browse_to(action)
-        elif key == BrowserActionId.DELETE_COOKIES.value:
-            result = self.__delete_cookies(action)
-        elif key == BrowserActionId.DISABLE_CURSOR.value:
-            result = self.__disable_cursor(action)
-        elif key == BrowserActionId.ENABLE_CURSOR.value:
-            result = self.__enable_cursor(action)
-        elif key == BrowserActionId.EXECUTE_SCRIPT.value:
-            result = self.__execute_script(action)
-        elif key == BrowserActionId.MOVE_BY_OFFSET.value:
-            result = self.__move_by_offset(action)
-        elif key == BrowserActionId.REFRESH.value:
-            result = self.__refresh(action)
-        elif key == BrowserActionId.SAVE_SCREENSHOT.value:
-            result = self.__save_screenshot(action)
-        elif key == BrowserActionId.SAVE_WEBPAGE.value:
-            result = self.__save_webpage(action)
-        else:
+        if key == ActionId.WAIT.value and BrowserActionHandler.__is_adaptive_wait(run_context):
+            # wait N becomes: wait up to N seconds, for the page to settle
+            return self.__wait_for_quiet(action, Quiescence.STABLE)
+        handle = BrowserActionHandler.__HANDLERS.get(key, None)
+        if handle is None:
             return super()._execute_by_key(run_context, action, key)
+        result = handle(self, run_context, action)
         logger.debug(f'{result}')
         return result
 
+    def __ask_for_help(self, run_context: RunContext, action: Action) -> ActionResult:
+        if run_context.get_arg(RunArg.BROWSER_MODE, None) is None:
+            return super().ask_for_help(action)
+        return self.ask_for_help(action)
+
+    @staticmethod
+    def __is_adaptive_wait(run_context: RunContext) -> bool:
+        return str(run_context.get_arg(RunArg.ADAPTIVE_WAIT, False)).lower() == 'true'
+
+    def __wait_for_quiet(self, action: Action, quiescence: Quiescence) -> ActionResult:
+        """
+        Args: [timeout seconds, default: the wait timeout] [quiet seconds, default: 0.5]
+        Succeeds whether the page settled or the timeout was reached, as a fixed wait would.
+        """
+        args: list[str] = action.get_args_as_str_list()
+        timeout: float = float(args[0]) if args else self.__wait_timeout_seconds
+        quiet_seconds: float = float(args[1]) if len(args) > 1 else DEFAULT_QUIET_SECONDS
+        if timeout == 0:
+            return ActionResult(action, True)
+        settled: bool = PageWaiter(self.get_web_driver()).wait_for(quiescence, timeout, quiet_seconds)
+        return ActionResult(action, True, settled)
+
     def __handle_alert(self, action: Action) -> ActionResult:
         how: str = action.get_name().split("_")[0]  # accept|dismiss
         value: str = action.get_first_arg_as_str()
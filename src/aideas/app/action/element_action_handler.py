@@ -1,7 +1,7 @@
 import logging
 import time
 from enum import unique
-from typing import Tuple, Union
+from typing import Tuple, Union, Callable, Any
 
 from selenium.common import StaleElementReferenceException, ElementClickInterceptedException, \
     ElementNotInteractableException, WebDriverException
@@ -37,6 +37,30 @@ class ElementActionId(BaseActionId):
 
 
 class ElementActionHandler(BrowserActionHandler):
+    # Dispatch table, from action name to the function which handles the action.
+    # Each function is passed: handler, driver, action, element, reloaded
+    __HANDLERS: dict[str, Callable[..., Any]] = {
+        ElementActionId.CLEAR_TEXT.value: lambda h, d, a, e, r: h.__clear_text(e),
+        ElementActionId.CLICK.value: lambda h, d, a, e, r: h.__click_action(d, a, e),
+        ElementActionId.CLICK_AND_HOLD.value:
+            lambda h, d, a, e, r: ActionChains(d).click_and_hold(e).perform(),
+        ElementActionId.CLICK_AND_HOLD_CURRENT_POSITION.value:
+            lambda h, d, a, e, r: ActionChains(d).click_and_hold(None).perform(),
+        ElementActionId.ENTER.value: lambda h, d, a, e, r: e.send_keys(Keys.ENTER),
+        ElementActionId.ENTER_TEXT.value: lambda h, d, a, e, r: h.__enter_text(a, e),
+        ElementActionId.EXECUTE_SCRIPT_ON.value:
+            lambda h, d, a, e, r: d.execute_script(a.get_arg_str(), e),
+        ElementActionId.GET_ATTRIBUTE.value: lambda h, d, a, e, r: e.get_attribute(a.get_arg_str()),
+        ElementActionId.GET_TEXT.value: lambda h, d, a, e, r: h.__get_text(e),
+        ElementActionId.IS_DISPLAYED.value: lambda h, d, a, e, r: h.__is_displayed(a, e, r),
+        ElementActionId.MOVE_TO_ELEMENT.value:
+            lambda h, d, a, e, r: ActionChains(d).move_to_element(e).perform(),
+        ElementActionId.MOVE_TO_ELEMENT_OFFSET.value:
+            lambda h, d, a, e, r: h.__move_to_element_offset(d, a, e),
+        ElementActionId.RELEASE.value: lambda h, d, a, e, r: h.__release(d, a, e),
+        ElementActionId.SEND_KEYS.value: lambda h, d, a, e, r: h.__send_keys(a, e),
+    }
+
     @staticmethod
     def to_action_id(action: str) -> BaseActionId:
         try:
@@ -93,59 +117,59 @@ class ElementActionHandler(BrowserActionHandler):
                         key: str,
                         element: Union[WebElement, None],
                         reloaded: bool = False) -> ActionResult:
-        driver = self.get_web_driver()
-        result: Union[any, None] = None
-        if key == ElementActionId.CLEAR_TEXT.value:
-            element.send_keys(Keys.CONTROL, 'a')
-            element.send_keys(Keys.DELETE)
-            element.clear()  # May not work under certain conditions, so we try the following
-        elif key == ElementActionId.CLICK.value:
-            click_on_element: bool = action.get_first_arg_as_bool(True)
-            target: WebElement = element if click_on_element is True else None
-            self.__click(driver, target)
-        elif key == ElementActionId.CLICK_AND_HOLD.value:
-            ActionChains(driver).click_and_hold(element).perform()
-        elif key == ElementActionId.CLICK_AND_HOLD_CURRENT_POSITION.value:
-            ActionChains(driver).click_and_hold(None).perform()
-        elif key == ElementActionId.ENTER.value:
-            element.send_keys(Keys.ENTER)
-        elif key == ElementActionId.ENTER_TEXT.value:
-            element.send_keys(action.get_arg_str())
-            result = action.get_arg_str()
-        elif key == ElementActionId.EXECUTE_SCRIPT_ON.value:
-            result = driver.execute_script(action.get_arg_str(), element)
-        elif key == ElementActionId.GET_ATTRIBUTE.value:
-            result = element.get_attribute(action.get_arg_str())
-        elif key == ElementActionId.GET_TEXT.value:
-            text = element.text
-            result = text if not text else text.strip()
-        elif key == ElementActionId.IS_DISPLAYED.value:
-            try:
-                success = False if element is None else element.is_displayed()
-            except StaleElementReferenceException as ex:
-                if reloaded:
-                    success = False
-                else:
-                    raise ex
-            result = ActionResult(action, success, success)
-        elif key == ElementActionId.MOVE_TO_ELEMENT.value:
-            ActionChains(driver).move_to_element(element).perform()
-        elif key == ElementActionId.MOVE_TO_ELEMENT_OFFSET.value:
-            self.__move_to_element_offset(self.get_web_driver(), action, element)
-        elif key == ElementActionId.RELEASE.value:
-            on_element: bool = action.get_first_arg_as_bool(True)
-            ActionChains(driver).release(element if on_element is True else None).perform()
-        elif key == ElementActionId.SEND_KEYS.value:
-            for char in action.get_arg_str():
-                element.send_keys(char)
-                time.sleep(0.5)
-            result = action.get_arg_str()
-        else:
+        handle = ElementActionHandler.__HANDLERS.get(key, None)
+        if handle is None:
             return super()._execute_by_key(run_context, action, key)  # Success state has already been printed
+        result = handle(self, self.get_web_driver(), action, element, reloaded)
         result = result if isinstance(result, ActionResult) else ActionResult.success(action, result)
         logger.debug(f'{result}')
         return result
 
+    @staticmethod
+    def __clear_text(element: WebElement):
+        element.send_keys(Keys.CONTROL, 'a')
+        element.send_keys(Keys.DELETE)
+        element.clear()  # May not work under certain conditions, so we try the following
+
+    @staticmethod
+    def __click_action(driver: WEB_DRIVER, action: Action, element: WebElement):
+        click_on_element: bool = action.get_first_arg_as_bool(True)
+        target: WebElement = element if click_on_element is True else None
+        ElementActionHandler.__click(driver, target)
+
+    @staticmethod
+    def __enter_text(action: Action, element: WebElement) -> str:
+        element.send_keys(action.get_arg_str())
+        return action.get_arg_str()
+
+    @staticmethod
+    def __get_text(element: WebElement) -> str:
+        text = element.text
+        return text if not text else text.strip()
+
+    @staticmethod
+    def __is_displayed(action: Action, element: WebElement, reloaded: bool) -> ActionResult:
+        try:
+            success = False if element is None else element.is_displayed()
+        except StaleElementReferenceException as ex:
+            if reloaded:
+                success = False
+            else:
+                raise ex
+        return ActionResult(action, success, success)
+
+    @staticmethod
+    def __release(driver: WEB_DRIVER, action: Action, element: WebElement):
+        on_element: bool = action.get_first_arg_as_bool(True)
+        ActionChains(driver).release(element if on_element is True else None).perform()
+
+    @staticmethod
+    def __send_keys(action: Action, element: WebElement) -> str:
+        for char in action.get_arg_str():
+            element.send_keys(char)
+            time.sleep(0.5)
+        return action.get_arg_str()
+
     @staticmethod
     def __click(webdriver: WEB_DRIVER, element: WebElement = None):
         try:
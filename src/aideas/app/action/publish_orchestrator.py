@@ -0,0 +1,144 @@
+import logging
+import random
+import socket
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, Union
+
+import requests
+from content_publisher.app.content_publisher import PostResult
+
+logger = logging.getLogger(__name__)
+
+# Errors raised before anything reached the platform, so that a retry cannot post twice.
+PRE_POST_ERRORS: tuple[type[Exception], ...] = (
+    ConnectionRefusedError, socket.gaierror, requests.exceptions.ConnectTimeout)
+
+
+class PublishOrchestrator:
+    """
+    Publishes to each platform on a worker of its own, so that the time to publish to many
+    platforms is that of the slowest platform, rather than the sum of all of them.
+
+    Each platform is retried, and timed out, on its own. Only errors raised before anything
+    reached the platform are retried, as a failure reported after that may be of a post which
+    went live, e.g. when its response could not be parsed.
+
+    A platform which times out is reported as failed without waiting for its worker, as a worker
+    cannot be stopped. The worker makes no further attempts, but the attempt in progress may
+    still post; if it does, a warning is logged.
+    """
+    def __init__(self,
+                 publish: Callable[[str], PostResult],
+                 timeout_seconds: float = 1800,
+                 max_retries: int = 0,
+                 backoff_seconds: float = 5,
+                 timeouts: Union[dict[str, float], None] = None,
+                 retry_on: tuple[type[Exception], ...] = PRE_POST_ERRORS):
+        """
+        :param publish: Publishes to the named platform, and returns the result.
+        :param timeout_seconds: The time allowed each platform, including retries.
+        :param max_retries: The number of times to retry a platform which failed with retry_on.
+        :param backoff_seconds: The initial delay before a retry, doubled after each retry.
+        :param timeouts: The time allowed each named platform, overriding timeout_seconds.
+        :param retry_on: The errors to retry, which must be raised before anything is posted.
+        """
+        if timeout_seconds <= 0:
+            raise ValueError(f'timeout_seconds must be more than 0, found: {timeout_seconds}')
+        if max_retries < 0:
+            raise ValueError(f'max_retries must be at least 0, found: {max_retries}')
+        self.__publish = publish
+        self.__timeout_seconds = timeout_seconds
+        self.__max_retries = max_retries
+        self.__backoff_seconds = backoff_seconds
+        self.__timeouts = dict(timeouts) if timeouts else {}
+        self.__retry_on = retry_on
+
+    def publish(self,
+                platforms: list[str],
+                on_result: Union[Callable[[str, PostResult], None], None] = None) -> dict[str, PostResult]:
+        """
+        Publish to the platforms at the same time.
+        :param platforms: The platforms to publish to.
+        :param on_result: Called with each platform's result, as soon as the platform is done.
+        :return: The result of each platform, keyed by platform, in the order given.
+        """
+        platforms = list(dict.fromkeys(platforms))
+        if not platforms:
+            return {}
+        results: dict[str, PostResult] = {}
+
+        def complete(platform: str, result: PostResult):
+            results[platform] = result
+            if on_result:
+                on_result(platform, result)
+
+        start = time.monotonic()
+        deadlines = {p: start + self.get_timeout(p) for p in platforms}
+        timed_out = {p: threading.Event() for p in platforms}
+        executor = ThreadPoolExecutor(max_workers=len(platforms), thread_name_prefix='publisher')
+        try:
+            running: dict[Future, str] = {
+                executor.submit(self.__publish_with_retries, p, deadlines[p], timed_out[p]): p
+                for p in platforms
+            }
+            while running:
+                timeout = max(0.0, min(deadlines[p] for p in running.values()) - time.monotonic())
+                completed, _ = wait(running.keys(), timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in completed:
+                    platform = running.pop(future)
+                    try:
+                        complete(platform, future.result())
+                    except Exception as ex:
+                        logger.warning(f"Failed to publish to {platform}, {ex}")
+                        complete(platform, PostResult(success=False, message=str(ex)))
+                now = time.monotonic()
+                for future, platform in list(running.items()):
+                    if deadlines[platform] <= now:
+                        running.pop(future)
+                        timed_out[platform].set()
+                        if not future.cancel():
+                            future.add_done_callback(
+                                lambda f, p=platform: PublishOrchestrator.__log_late_result(p, f))
+                        message = f"Timed out after {self.get_timeout(platform)} seconds"
+                        logger.warning(f"Failed to publish to {platform}, {message}")
+                        complete(platform, PostResult(success=False, message=message))
+        finally:
+            # Do not wait for workers which timed out, they make no further attempts.
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        logger.debug(f"Published to {len(platforms)} platforms in {time.monotonic() - start:.3f} seconds")
+        return {p: results[p] for p in platforms}
+
+    def __publish_with_retries(self,
+                               platform: str,
+                               deadline: float,
+                               timed_out: threading.Event) -> PostResult:
+        attempt = 0
+        while True:
+            try:
+                return self.__publish(platform)
+            except self.__retry_on as ex:
+                delay = self.__backoff_seconds * (2 ** attempt) * (0.5 + random.random() / 2)
+                if attempt >= self.__max_retries or time.monotonic() + delay >= deadline:
+                    raise
+                attempt += 1
+                logger.debug(f"Retry {attempt} of {self.__max_retries} in {delay:.2f} seconds, "
+                             f"publishing to {platform}, {ex}")
+                if timed_out.wait(delay):
+                    raise
+
+    def get_timeout(self, platform: str) -> float:
+        return self.__timeouts.get(platform, self.__timeout_seconds)
+
+    @staticmethod
+    def __log_late_result(platform: str, future: Future):
+        try:
+            result = future.result()
+        except Exception as ex:
+            logger.debug(f"Publishing to {platform} failed after timing out, {ex}")
+            return
+        if result.success:
+            logger.warning(f"Published to {platform} after timing out, "
+                           f"though reported as failed: {result.post_url}")
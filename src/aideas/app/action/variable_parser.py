@@ -65,14 +65,26 @@ def replace_all_variables(
     return replace_all(target, source, check_variables_replaced, NODES_TO_SKIP)
 
 
-def get_run_arg_replacement(curr_path: list[str], arg: str, run_context: 'RunContext' = None) -> Any:
+def get_run_arg_replacement(curr_path: list[str],
+                            arg: str,
+                            run_context: 'RunContext' = None,
+                            template: 'TextTemplate' = None) -> Any:
+    """
+    :param curr_path: The path of the action: agent, stage, stage-item.
+    :param arg: The action argument, whose variables are to be replaced.
+    :param run_context: The context of the run, from which the variables are resolved.
+    :param template: The compiled arg, if available. Saves scanning the arg for variables.
+    :return: The arg with its variables replaced.
+    """
     if len(curr_path) != 3:
         raise ValueError(f'Expected 3 elements, found: {curr_path}')
 
     def replace(name: str) -> Any:
         return __get_run_arg_replacement(curr_path, name, run_context, None)
 
-    replacement = replace_variables(arg, replace)
+    replacement = None if template is None else template.render(replace)
+    if replacement is None:
+        replacement = replace_variables(arg, replace)
 
     if replacement is None:
         raise ValueError(f'Unsupported variable: {arg}, @ {".".join(curr_path)}')
@@ -0,0 +1,281 @@
+import copy
+import functools
+import os
+import re
+from typing import Union, Callable, Any
+
+from pyu.io.variable_parser import SELF_KEY, contains_variable, replace_variables, \
+    replace_all_variables as replace_all
+
+from .variable_parser import CONTEXT_KEY, RESULTS_KEY, NODES_TO_SKIP, contains_action_variable
+
+"""
+Variable substitution, compiled once per config and rendered many times.
+
+Compiling a config finds the string leaves which contain variables, and splits each of them
+into literal and variable segments. Rendering then only visits those leaves, joining their
+segments with the values of the variables, in a single pass.
+
+The variable grammar is that of pyu, as we use pyu to find the variables while compiling.
+"""
+
+# Marks the position of a variable in a string, while compiling.
+_MARKER = '\x00'
+
+_INDEX_PATTERN = re.compile(r'\[(\d+)]')
+
+
+class TextTemplate:
+    """
+    A string split into literal and variable segments: literal, variable, literal, ... literal
+    """
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def of(text: str) -> 'TextTemplate':
+        names: list[str] = []
+
+        def mark(name: str) -> str:
+            names.append(name)
+            return _MARKER
+
+        literals = [text]
+        if _MARKER not in text and contains_variable(text):
+            replaced = replace_variables(text, mark)
+            literals = replaced.split(_MARKER) if isinstance(replaced, str) else []
+            if len(literals) != len(names) + 1:
+                # Not a grammar we understand, so we leave it to pyu
+                return TextTemplate(text, [], [], False)
+        return TextTemplate(text, literals, names)
+
+    def __init__(self, text: str, literals: list[str], names: list[str], compiled: bool = True):
+        self.__text = text
+        self.__literals = tuple(literals)
+        self.__names = tuple(names)
+        self.__compiled = compiled
+        self.__action_only = len(names) > 0 and all(
+            TextTemplate.__is_action_variable(e) for e in names)
+
+    def render(self, resolve: Callable[[str], Any]) -> Union[Any, None]:
+        """
+        Replace the variables in the text, with the values returned by ``resolve``.
+        :param resolve: Returns the value of the named variable, or None if not available.
+        :return: The text with its variables replaced, or None, if any variable was not resolved.
+        A text consisting of a single variable is replaced by the value of the variable as is.
+        """
+        if not self.__compiled:
+            return None
+        if not self.__names:
+            return self.__text
+        values = []
+        for name in self.__names:
+            value = resolve(name)
+            if value is None:
+                return None
+            values.append(value)
+        if len(values) == 1 and not self.__literals[0] and not self.__literals[1]:
+            return values[0]
+        parts = [self.__literals[0]]
+        for i, value in enumerate(values):
+            parts.append(str(value))
+            parts.append(self.__literals[i + 1])
+        return ''.join(parts)
+
+    def get_text(self) -> str:
+        return self.__text
+
+    def get_names(self) -> tuple[str, ...]:
+        return self.__names
+
+    def has_variables(self) -> bool:
+        return not self.__compiled or len(self.__names) > 0
+
+    def has_only_action_variables(self) -> bool:
+        """
+        Action variables, i.e. ``${context.*}`` and ``${results.*}``, are only available while
+        the actions are being run.
+        """
+        return self.__action_only
+
+    @staticmethod
+    def __is_action_variable(name: str) -> bool:
+        return (name.startswith(f'{CONTEXT_KEY}.') or name.startswith(f'{RESULTS_KEY}.')
+                or name == CONTEXT_KEY or name == RESULTS_KEY)
+
+
+_IMMUTABLE_TYPES = (str, int, float, bool, type(None))
+
+
+def _copy_tree(value: Any) -> Any:
+    # Faster than copy.deepcopy, for the dicts, lists and scalars which make up a config.
+    value_type = type(value)
+    if value_type is dict:
+        return {k: _copy_tree(v) for k, v in value.items()}
+    if value_type is list:
+        return [_copy_tree(e) for e in value]
+    if isinstance(value, _IMMUTABLE_TYPES):
+        return value
+    if isinstance(value, dict):
+        return value_type((k, _copy_tree(v)) for k, v in value.items())
+    return copy.deepcopy(value)
+
+
+class _Leaf:
+    def __init__(self, path: tuple, template: TextTemplate):
+        self.path = path
+        self.template = template
+
+
+class _UnresolvedSelfVariable(Exception):
+    pass
+
+
+_NOT_FOUND = object()
+
+
+class VariableTemplate:
+    """
+    A config, compiled for the repeated replacement of its variables.
+
+    The compiled config is not modified. Each call to ``render`` returns a new config.
+    """
+    @staticmethod
+    def compile(config: dict[str, Any]) -> 'VariableTemplate':
+        leaves: list[_Leaf] = []
+
+        def visit(value: Any, path: tuple):
+            if isinstance(value, dict):
+                for k, v in value.items():
+                    visit(v, path + (k,))
+            elif isinstance(value, list):
+                for i, e in enumerate(value):
+                    visit(e, path + (i,))
+            elif isinstance(value, str):
+                template = TextTemplate.of(value)
+                if template.has_variables():
+                    leaves.append(_Leaf(path, template))
+
+        visit(config, ())
+        return VariableTemplate(config, leaves)
+
+    def __init__(self, config: dict[str, Any], leaves: list[_Leaf]):
+        self.__config = config
+        self.__leaves = leaves
+        self.__action_variable_paths = [
+            list(e.path) for e in leaves if contains_action_variable(e.template.get_text())]
+
+    def render(self,
+               source: Union[dict[str, Any], None] = None,
+               check_replaced: bool = True) -> dict[str, Any]:
+        """
+        Return a copy of the config, with its variables replaced by the values in the source.
+
+        Equivalent to ``variable_parser.replace_all_variables``, which is used whenever a
+        ``$self`` variable could not be resolved from the rendered config.
+        :param source: The values of the variables. Defaults to the environment variables.
+        :param check_replaced: If True, raise a ValueError for variables which are not replaced,
+        other than action variables.
+        :return: The config, with its variables replaced.
+        """
+        if not source:
+            source = dict(os.environ)
+        result = _copy_tree(self.__config)
+        if not self.__leaves:
+            return result
+
+        self_prefix = f'{SELF_KEY}.'
+
+        def resolver(path: tuple) -> Callable[[str], Any]:
+            def resolve(name: str) -> Any:
+                if name.startswith(self_prefix):
+                    return VariableTemplate.__get_self_value(result, path, name[len(self_prefix):])
+                return source.get(name, None)
+            return resolve
+
+        try:
+            for leaf in self.__leaves:
+                if leaf.template.has_only_action_variables():
+                    continue
+                resolve = resolver(leaf.path)
+                value = leaf.template.render(resolve)
+                if value is None:
+                    value = replace_variables(leaf.template.get_text(), resolve)
+                if check_replaced and isinstance(value, str):
+                    VariableTemplate.__check_replaced(value)
+                VariableTemplate.__set_value(result, leaf.path, value)
+        except _UnresolvedSelfVariable:
+            return VariableTemplate.__render_via_pyu(self.__config, source, check_replaced)
+        return result
+
+    def get_action_variable_paths(self) -> list[list]:
+        """
+        :return: The path of each string in the config which contains action variables, i.e.
+        ``${context.*}`` and ``${results.*}``, which are only available while the actions are run.
+        """
+        return [list(e) for e in self.__action_variable_paths]
+
+    def get_variable_count(self) -> int:
+        return sum(len(e.template.get_names()) for e in self.__leaves)
+
+    @staticmethod
+    def __get_self_value(config: dict[str, Any], path: tuple, name: str) -> Any:
+        """
+        Resolve the name as pyu does: from the innermost scope of the path, outwards to the root.
+        The stages and stage-items nodes are not scopes, as their keys are names, not attributes.
+        """
+        for scope in VariableTemplate.__get_scopes(config, path):
+            value = VariableTemplate.__get_value(scope, name)
+            if value is _NOT_FOUND:
+                continue
+            if value is None or (isinstance(value, str) and contains_variable(value)):
+                # Not (yet) replaced, we leave it to pyu
+                raise _UnresolvedSelfVariable(name)
+            return value
+        raise _UnresolvedSelfVariable(name)
+
+    @staticmethod
+    def __get_scopes(config: dict[str, Any], path: tuple) -> list[dict[str, Any]]:
+        scopes = [config]
+        node: Any = config
+        for key in path[:-1]:
+            node = node[key]
+            if isinstance(node, dict) and key not in NODES_TO_SKIP:
+                scopes.append(node)
+        return scopes[::-1]
+
+    @staticmethod
+    def __get_value(scope: dict[str, Any], name: str) -> Any:
+        value: Any = scope
+        for part in name.split('.'):
+            index_at = part.find('[')
+            key = part if index_at == -1 else part[:index_at]
+            indices = [] if index_at == -1 else _INDEX_PATTERN.findall(part[index_at:])
+            try:
+                value = value[key]
+                for index in indices:
+                    value = value[int(index)]
+            except (KeyError, IndexError, TypeError):
+                return _NOT_FOUND
+        return value
+
+    @staticmethod
+    def __set_value(config: dict[str, Any], path: tuple, value: Any):
+        target: Any = config
+        for key in path[:-1]:
+            target = target[key]
+        target[path[-1]] = value
+
+    @staticmethod
+    def __check_replaced(text: str):
+        if contains_variable(text) and not contains_action_variable(text):
+            raise ValueError(f'Failed to replace variables in: {text}')
+
+    @staticmethod
+    def __render_via_pyu(config: dict[str, Any],
+                         source: dict[str, Any],
+                         check_replaced: bool) -> dict[str, Any]:
+        def check_variables_replaced(text: str) -> str:
+            if check_replaced:
+                VariableTemplate.__check_replaced(text)
+            return text
+
+        return replace_all(copy.deepcopy(config), source, check_variables_replaced, NODES_TO_SKIP)
@@ -1,4 +1,4 @@
-from typing import Any
+from typing import Any, Union
 
 from abc import ABC, abstractmethod
 
@@ -10,8 +10,11 @@ from collections import OrderedDict
 
 from ..action.action_handler import ActionError, ActionHandler
 from ..agent.event_handler import EventHandler
-from ..config import AgentConfig, ConfigPath, Name, ON_START
-from ..env import get_agent_output_dir, get_agent_results_dir
+from ..agent.stage_cache import find_output_files, get_stage_cache, stage_cache_key
+from ..agent.stage_checkpoint import CompletedStage, StageCheckpoint, config_hash, \
+    get_stage_checkpoints, picklable_values
+from ..config import AgentConfig, ConfigPath, Name, ON_START, RunArg
+from ..env import get_agent_output_dir, get_agent_results_dir, get_content_dir
 from ..result.result_set import ElementResultSet, StageResultSet
 from ..run_context import RunContext
 
@@ -20,6 +23,11 @@ logger = logging.getLogger(__name__)
 
 INTERVAL_KEY = 'interval-seconds'
 
+# Run args which do not change the results of a stage, so are not part of the key of its checkpoint,
+# or of its entry in the stage cache
+_NON_INPUT_RUN_ARGS = [RunArg.ADAPTIVE_WAIT, RunArg.AGENTS, RunArg.BROWSER_MODE,
+                       RunArg.CONTINUE_ON_ERROR, RunArg.RESUME, RunArg.SAVE_SCREENS]
+
 
 class ExecutionError(Exception):
     pass
@@ -97,7 +105,10 @@ class Agent(ABC):
             self.__config = AgentConfig(
                 run_context.replace_variables(self.__name, self.__config.to_dict()))
 
-            if self.__config.is_clear_output_dir():
+            checkpoint = self.__load_checkpoint(run_context)
+
+            # The outputs of completed stages are kept, when resuming after them.
+            if self.__config.is_clear_output_dir() and checkpoint.is_empty():
                 self.__clear_dirs()
 
             self.__make_dirs()
@@ -105,7 +116,10 @@ class Agent(ABC):
             stages: list[Name] = self.__config.get_stage_names()
 
             # We only close the result for the agent after all stages have been run.
-            return self._run_stages(run_context, stages).close()
+            result = self._run_stages(run_context, stages, checkpoint).close()
+            if result.is_successful():
+                get_stage_checkpoints().remove(self.__name, checkpoint.hash_value)
+            return result
         finally:
             try:
                 self.close()
@@ -124,8 +138,17 @@ class Agent(ABC):
 
             agent._run_stages(run_context, stage_names)
 
-    def _run_stages(self, run_context: RunContext, stages: list[Name]) -> StageResultSet:
-        """Run specified stages of the agent and return True if successful, False otherwise."""
+    def _run_stages(self,
+                    run_context: RunContext,
+                    stages: list[Name],
+                    checkpoint: Union[StageCheckpoint, None] = None) -> StageResultSet:
+        """
+        Run specified stages of the agent and return True if successful, False otherwise.
+        :param run_context: The context of the run.
+        :param stages: The stages to run.
+        :param checkpoint: If given, stages completed in it are skipped, and each stage
+        completed successfully is added to it, and saved.
+        """
 
         config: AgentConfig = self.get_config()
 
@@ -144,6 +167,11 @@ class Agent(ABC):
                 #    With iteration: stage_id, stage_id1, stage_id2, ...stage_idN
                 if index > 0:
                     stage = Name.of(stage.value, f'{stage.id}{index}')
+                completed = None if checkpoint is None else checkpoint.get(stage.id)
+                if completed is not None:
+                    self.__restore_stage(run_context, completed)
+                    continue
+                values_before = run_context.get_values()
                 try:
                     run_context.set(index_var_key, index)
                     run_context.set('stage-name', stage.value)
@@ -154,6 +182,8 @@ class Agent(ABC):
                     run_context.remove('stage-name')
                     run_context.remove('stage-id')
                 logger.debug(f"Stage: {stage}, result: {result}")
+                if checkpoint is not None:
+                    self.__save_stage(run_context, checkpoint, stage, index, values_before)
                 # We raise an exception if we want to stop the process
                 # so no need to do this here.
                 # if not result.is_successful():
@@ -164,6 +194,52 @@ class Agent(ABC):
         # The closing is done at the run() method level
         return run_context.get_stage_results(self.__name)
 
+    def __load_checkpoint(self, run_context: RunContext) -> StageCheckpoint:
+        hash_value = config_hash({'config': self.__config.to_dict(),
+                                  'run-args': self.__input_run_args(run_context)})
+        if str(run_context.get_arg(RunArg.RESUME, False)).lower() == 'true':
+            checkpoint = get_stage_checkpoints().get(self.__name, hash_value)
+            if checkpoint is not None:
+                logger.info(f"Agent: {self.__name}, will resume after stages: "
+                            f"{[e.stage_id for e in checkpoint.stages()]}")
+                return checkpoint
+        return StageCheckpoint(self.__name, hash_value)
+
+    def __save_stage(self,
+                     run_context: RunContext,
+                     checkpoint: StageCheckpoint,
+                     stage: Name,
+                     index: int,
+                     values_before: dict[str, Any]):
+        """
+        :param values_before: The values of the run context before the stage, so that only the
+        values set by the stage are checkpointed, rather than those of other agents.
+        """
+        result = run_context.get_element_results(self.__name, stage.id, None)
+        if result is None or not result.is_successful():
+            # To be run again, when resuming
+            return
+        values = {k: v for k, v in run_context.get_values().items()
+                  if k not in values_before or values_before[k] is not v}
+        checkpoint.add(CompletedStage(stage.value, stage.id, index, result,
+                                      picklable_values(values)))
+        try:
+            get_stage_checkpoints().save(checkpoint)
+        except Exception as ex:
+            # E.g. a result which cannot be pickled. The stage will be run again, when resuming.
+            logger.warning(f"Failed to checkpoint stage: {stage.id} of agent: {self.__name}. {ex}")
+            checkpoint.remove(stage.id)
+
+    @staticmethod
+    def __restore_stage(run_context: RunContext, stage: CompletedStage):
+        logger.debug(f"Skipping completed stage: {stage.stage_id}")
+        # So that ${results.*} variables, of the stage, resolve as they did
+        for results in stage.result.values():
+            for result in results:
+                run_context.add_action_result(result)
+        for key, value in stage.values.items():
+            run_context.set(key, value)
+
     def run_stage(self,
                   run_context: RunContext,
                   stage: Name) -> ElementResultSet:
@@ -198,11 +274,23 @@ class Agent(ABC):
             if not to_proceed:
                 return result
 
-            self.__event_handler.handle_event(
-                self.get_name(), config, config_path,
-                ON_START, run_context, self._run_stages_without_events)
+            cache_key = self.__stage_cache_key(config, stage, run_context)
+            cached = None if cache_key is None else \
+                self.__restore_cached_stage(run_context, stage, cache_key)
+
+            if cached is not None:
+                result = cached
+            else:
+                start_time = time.time()
+
+                self.__event_handler.handle_event(
+                    self.get_name(), config, config_path,
+                    ON_START, run_context, self._run_stages_without_events)
 
-            result: ElementResultSet = self._execute(config, stage, run_context)
+                result: ElementResultSet = self._execute(config, stage, run_context)
+
+                if cache_key is not None:
+                    self.__cache_stage(run_context, stage, cache_key, start_time)
 
         except (ActionError, ExecutionError) as ex:
             logger.debug(f"Error at {config_path}\n{str(ex)}")
@@ -214,6 +302,85 @@ class Agent(ABC):
 
         return ElementResultSet.none() if result is None else result
 
+    def __stage_cache_key(self,
+                          config: AgentConfig,
+                          stage: Name,
+                          run_context: RunContext) -> Union[str, None]:
+        """
+        :return: The key of the stage in the stage cache, or None if the stage is not cached.
+        """
+        if not config.is_stage_cached(stage):
+            return None
+        run_args = self.__input_run_args(run_context)
+        # Not the values of the context forked, which may be set by agents running at the same
+        # time, nor the configs of agents, of which that of this agent is the stage config.
+        agent_names = set(run_context.get_agent_names() + [self.__name])
+        values = {k: v for k, v in run_context.get_local_values().items() if k not in agent_names}
+        context = {'values': picklable_values(values),
+                   'results': run_context.get_stage_results(self.__name).pretty_str()}
+        try:
+            return stage_cache_key(self.__name, stage.id, config.stage(stage), run_args, context)
+        except Exception as ex:
+            logger.warning(f"Will not cache stage: {stage.id} of agent: {self.__name}. {ex}")
+            return None
+
+    @staticmethod
+    def __input_run_args(run_context: RunContext) -> dict[str, Any]:
+        return {e.value: run_context.get_arg(e) for e in RunArg if e not in _NON_INPUT_RUN_ARGS}
+
+    def __stage_cache_roots(self, stage: Name) -> dict[str, str]:
+        return {'results': os.path.join(self.get_results_dir(), stage.id),
+                'content': get_content_dir()}
+
+    @staticmethod
+    def __stage_output_files(roots: dict[str, str], start_time: float) -> dict[str, list[str]]:
+        """
+        :return: The files written by the stage, to its results dir, and their copies in the
+        content dir, as saved by ``Action.get_output_dirs``. Other files of the content dir are
+        not the stage's, e.g. those of agents running at the same time.
+        """
+        files = find_output_files({'results': roots['results']}, start_time)
+        content_files = []
+        for path in files.get('results', []):
+            # Saved to: <stage-item>/<path> of the results dir, and to: <path> of the content dir
+            parts = path.split(os.sep, 1)
+            content_file = None if len(parts) < 2 else os.path.join(roots['content'], parts[1])
+            if content_file and os.path.isfile(content_file) \
+                    and os.path.getmtime(content_file) >= start_time:
+                content_files.append(parts[1])
+        if content_files:
+            files['content'] = content_files
+        return files
+
+    def __restore_cached_stage(self,
+                               run_context: RunContext,
+                               stage: Name,
+                               cache_key: str) -> Union[ElementResultSet, None]:
+        cached = get_stage_cache().get(cache_key, self.__stage_cache_roots(stage))
+        if cached is None:
+            return None
+        logger.debug(f"Restored stage: {stage.id} of agent: {self.__name}, from cache")
+        for results in cached.values():
+            for result in results:
+                run_context.add_action_result(result)
+        return run_context.get_element_results(self.__name, stage.id)
+
+    def __cache_stage(self,
+                      run_context: RunContext,
+                      stage: Name,
+                      cache_key: str,
+                      start_time: float):
+        result = run_context.get_element_results(self.__name, stage.id, None)
+        if result is None or not result.is_successful():
+            return
+        roots = self.__stage_cache_roots(stage)
+        try:
+            get_stage_cache().put(cache_key, self.__name, stage.id, result,
+                                  roots, Agent.__stage_output_files(roots, start_time))
+        except Exception as ex:
+            # E.g. a result which cannot be pickled
+            logger.warning(f"Failed to cache stage: {stage.id} of agent: {self.__name}. {ex}")
+
     def _stage_may_proceed(self,
                            config: AgentConfig,
                            stage: Name,
@@ -0,0 +1,111 @@
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable
+
+from ..config import AgentConfig
+from ..text import list_from_object
+
+logger = logging.getLogger(__name__)
+
+POST_TAG = 'post'
+
+
+class AgentScheduler:
+    """
+    Runs the agents of a single run, in the order given, while allowing agents which do not
+    depend on each other to run at the same time.
+
+    An agent waits for every preceding agent it lists in its ``depends-on``. It also waits for
+    every preceding agent, unless both it and the preceding agent are tagged ``post``. Post
+    agents only consume content produced by the agents before them, so they may run side by side.
+
+    With ``max_workers`` of 1, agents are run one after another, in the order given.
+    """
+    @staticmethod
+    def of_configs(agent_configs: dict[str, AgentConfig], max_workers: int = 1) -> 'AgentScheduler':
+        """
+        :param agent_configs: The config of each agent, keyed by agent name, in the run order.
+        :param max_workers: The maximum number of agents to run at the same time.
+        :return: A scheduler for the agents.
+        """
+        agent_names: list[str] = list(agent_configs.keys())
+        dependencies: dict[str, set[str]] = {}
+        for index, agent_name in enumerate(agent_names):
+            config: AgentConfig = agent_configs[agent_name]
+            depends_on: list[str] = config.get_depends_on()
+            is_post: bool = AgentScheduler.__is_post(config)
+            dependencies[agent_name] = set()
+            # We only look backwards, so that the dependencies form a DAG
+            for preceding in agent_names[:index]:
+                if (preceding in depends_on or is_post is False
+                        or AgentScheduler.__is_post(agent_configs[preceding]) is False):
+                    dependencies[agent_name].add(preceding)
+        return AgentScheduler(agent_names, dependencies, max_workers)
+
+    @staticmethod
+    def __is_post(config: AgentConfig) -> bool:
+        tags = config.get_agent_tags()
+        # A string, e.g. `agent-tags: post`, is a list of tags, not a substring to match
+        return tags is not None and POST_TAG in [e.strip() for e in list_from_object(tags)]
+
+    def __init__(self,
+                 agent_names: list[str],
+                 dependencies: dict[str, set[str]],
+                 max_workers: int = 1):
+        if max_workers < 1:
+            raise ValueError(f'max_workers must be at least 1, found: {max_workers}')
+        self.__agent_names = list(agent_names)
+        self.__dependencies = {k: set(v) & set(agent_names) for k, v in dependencies.items()}
+        self.__max_workers = max_workers
+
+    def run(self,
+            run_agent: Callable[[str], None],
+            skip_agent: Callable[[str], None],
+            may_proceed: Callable[[], bool]):
+        """
+        Run the agents, each as soon as the agents it waits for are done.
+        :param run_agent: Runs the named agent. Should handle its own errors.
+        :param skip_agent: Called for each agent which will not be run.
+        :param may_proceed: Called before an agent is started. When it returns False,
+        the agents not yet started are skipped, while those already running are awaited.
+        :return: None
+        """
+        pending: list[str] = list(self.__agent_names)
+        done: set[str] = set()
+        running: dict[Future, str] = {}
+
+        with ThreadPoolExecutor(max_workers=self.__max_workers,
+                                thread_name_prefix='agent') as executor:
+            while pending or running:
+                if pending and not may_proceed():
+                    for agent_name in pending:
+                        skip_agent(agent_name)
+                    pending.clear()
+
+                for agent_name in self.__get_ready(pending, done):
+                    if len(running) >= self.__max_workers:
+                        break
+                    pending.remove(agent_name)
+                    logger.debug(f"Starting agent: {agent_name}, running: {list(running.values())}")
+                    running[executor.submit(run_agent, agent_name)] = agent_name
+
+                if not running:
+                    continue
+
+                completed, _ = wait(running.keys(), return_when=FIRST_COMPLETED)
+                for future in completed:
+                    done.add(running.pop(future))
+                    # Surface unexpected errors, run_agent is expected to handle the rest.
+                    future.result()
+
+    def __get_ready(self, pending: list[str], done: set[str]) -> list[str]:
+        return [e for e in pending if self.__dependencies.get(e, set()).issubset(done)]
+
+    def get_agent_names(self) -> list[str]:
+        return list(self.__agent_names)
+
+    def get_dependencies(self, agent_name: str) -> set[str]:
+        return set(self.__dependencies.get(agent_name, set()))
+
+    def get_max_workers(self) -> int:
+        return self.__max_workers
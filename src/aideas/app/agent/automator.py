@@ -6,7 +6,7 @@ from typing import Callable, Any
 
 from selenium.webdriver.remote.webelement import WebElement
 
-from ..action.action import Action
+from ..action.action_plan import ActionPlan
 from ..action.action_result import ActionResult
 from ..action.action_signatures import element_action_signatures, parse_agent_to_stages
 from ..action.action_handler import ActionError, ActionHandler, TARGET
@@ -376,19 +376,21 @@ class Automator:
         target_id: str = config_path.name().id
         action_handler = self.__action_handler.with_timeout(wait_timeout_secs)
 
+        plan: ActionPlan = ActionPlan.of(
+            self.__agent_name, stage_id, target_id, tuple(action_signatures))
+
         result_set: ElementResultSet = ElementResultSet()
-        for action_signature in action_signatures:
+        for planned_action in plan.get_actions():
 
-            if action_signature.startswith('run_stages'):
+            if planned_action.is_run_stages():
 
                 _, agent_to_stages = parse_agent_to_stages(
-                    action_signature, self.__agent_name, config_path.stage())
+                    planned_action.get_signature(), self.__agent_name, config_path.stage())
                 self.__run_stages(run_context, agent_to_stages)
 
                 continue
 
-            action = Action.of(
-                self.__agent_name, stage_id, target_id, action_signature, run_context)
+            action = planned_action.to_action(run_context)
 
             result: ActionResult = action_handler.execute_on(run_context, action, target)
 
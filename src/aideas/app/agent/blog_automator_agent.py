@@ -94,13 +94,16 @@ class BlogAutomatorAgent(AutomatorAgent):
         result = [self._convert_to_markdown(
             input_file, from_lang_code, cover_image_path, share_cover_image)]
 
-        for to_lang_code in to_lang_codes:
-            if to_lang_code == from_lang_code:
-                continue
+        def translate(to_lang_code: str) -> str:
             path_translated = self.__translator.translate_file_path(input_file, from_lang_code, to_lang_code)
             text_translated = self.__translator.translate(input_text, from_lang_code, to_lang_code)
             write_content(text_translated, path_translated)
+            return path_translated
 
+        to_lang_codes = [e for e in to_lang_codes if e != from_lang_code]
+        paths_translated = self.__translator.map(translate, to_lang_codes)
+
+        for to_lang_code, path_translated in zip(to_lang_codes, paths_translated):
             result.append(self._convert_to_markdown(path_translated, to_lang_code, cover_image_path, share_cover_image))
 
         return ActionResult(action, True, result) if result else ActionResult(action, False)
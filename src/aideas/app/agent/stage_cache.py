@@ -0,0 +1,217 @@
+import atexit
+import hashlib
+import json
+import logging
+import os
+import pickle
+import shutil
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Union
+
+from ..env import Env, get_env_value, get_output_dir
+from ..io.file import file_hash
+from ..result.result_set import ElementResultSet
+
+logger = logging.getLogger(__name__)
+
+_RESULT_FILE = 'result.pickle'
+
+_FILES_DIR = 'files'
+
+
+def stage_cache_key(agent_name: str,
+                    stage_id: str,
+                    stage_config: dict[str, Any],
+                    run_args: dict[str, Any],
+                    context: dict[str, Any]) -> str:
+    """
+    :param agent_name: The name of the agent.
+    :param stage_id: The id of the stage, qualified by the iteration index, if above 0.
+    :param stage_config: The config of the stage.
+    :param run_args: The run args which are inputs to the stage.
+    :param context: The values and results of the run, so far, which the stage may refer to.
+    :return: The sha256 of the inputs of the stage, including the content of each file referenced.
+    """
+    inputs = {'agent': agent_name, 'stage': stage_id, 'config': stage_config,
+              'run-args': run_args, 'context': context}
+    inputs['files'] = {path: file_hash(path) for path in sorted(_referenced_files(inputs))}
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def find_output_files(roots: dict[str, str], since: float) -> dict[str, list[str]]:
+    """
+    :param roots: Dirs by name, e.g. the results dir of a stage.
+    :param since: The time from which files were written.
+    :return: The paths, relative to each root, of files written under the root since the time.
+    """
+    result: dict[str, list[str]] = {}
+    for name, root in roots.items():
+        for dir_path, _, filenames in os.walk(root):
+            for filename in filenames:
+                path = os.path.join(dir_path, filename)
+                if os.path.getmtime(path) >= since:
+                    result.setdefault(name, []).append(os.path.relpath(path, root))
+    return result
+
+
+class StageCache:
+    """
+    The results and output files of stages, keyed by the hash of the inputs of each stage.
+
+    Each entry is a dir, holding the pickled results and a copy of the files output. Entries are
+    indexed in a SQLite database, by when last used, so that the least recently used are
+    evicted once the total size of the entries exceeds the maximum.
+    """
+    def __init__(self, dir_path: str, max_bytes: int):
+        self.__entries_dir = os.path.join(dir_path, 'entries')
+        os.makedirs(self.__entries_dir, exist_ok=True)
+        self.__max_bytes = max_bytes
+        self.__lock = threading.RLock()
+        self.__connection = sqlite3.connect(
+            os.path.join(dir_path, 'stage-cache.db'), timeout=30, check_same_thread=False)
+        with self.__lock:
+            self.__connection.execute("PRAGMA journal_mode=WAL")
+            self.__connection.execute(
+                "CREATE TABLE IF NOT EXISTS stage_cache ("
+                "cache_key TEXT PRIMARY KEY, agent TEXT NOT NULL, stage TEXT NOT NULL, "
+                "size INTEGER NOT NULL, created_at REAL NOT NULL, used_at REAL NOT NULL)")
+            self.__connection.execute(
+                "CREATE INDEX IF NOT EXISTS stage_cache_used_at ON stage_cache (used_at)")
+            self.__connection.commit()
+
+    def get(self, key: str, roots: dict[str, str]) -> Union[ElementResultSet, None]:
+        """
+        Restore the output files of the entry, into the dirs of the same names, and return its
+        results.
+        :param key: The key of the entry.
+        :param roots: Dirs by name, into which files are restored.
+        :return: The results of the entry, or None if there is no entry for the key.
+        """
+        entry_dir = os.path.join(self.__entries_dir, key)
+        with self.__lock:
+            row = self.__connection.execute(
+                "SELECT cache_key FROM stage_cache WHERE cache_key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            try:
+                with open(os.path.join(entry_dir, _RESULT_FILE), 'rb') as file:
+                    result: ElementResultSet = pickle.load(file)
+                files_dir = os.path.join(entry_dir, _FILES_DIR)
+                for name, paths in find_output_files(
+                        {name: os.path.join(files_dir, name) for name in roots}, 0).items():
+                    for path in paths:
+                        target = os.path.join(roots[name], path)
+                        os.makedirs(os.path.dirname(target), exist_ok=True)
+                        shutil.copy2(os.path.join(files_dir, name, path), target)
+            except Exception as ex:
+                logger.warning(f"Removing unreadable stage cache entry: {key}, {ex}")
+                self.__remove(key)
+                return None
+            with self.__connection:
+                self.__connection.execute(
+                    "UPDATE stage_cache SET used_at = ? WHERE cache_key = ?", (time.time(), key))
+        return result
+
+    def put(self,
+            key: str,
+            agent_name: str,
+            stage_id: str,
+            result: ElementResultSet,
+            roots: dict[str, str],
+            files: dict[str, list[str]]):
+        """
+        Add an entry, then evict the least recently used entries, while over the maximum size.
+        :param key: The key of the entry.
+        :param agent_name: The name of the agent.
+        :param stage_id: The id of the stage.
+        :param result: The results of the stage.
+        :param roots: Dirs by name, under which the files are.
+        :param files: The paths, relative to each root, of the files output by the stage.
+        """
+        # Written under a temporary name, so that an entry is never seen half written
+        temp_dir = os.path.join(self.__entries_dir, f'{key}.{uuid.uuid4().hex}.tmp')
+        try:
+            os.makedirs(temp_dir)
+            with open(os.path.join(temp_dir, _RESULT_FILE), 'wb') as file:
+                pickle.dump(result, file)
+            for name, paths in files.items():
+                for path in paths:
+                    target = os.path.join(temp_dir, _FILES_DIR, name, path)
+                    os.makedirs(os.path.dirname(target), exist_ok=True)
+                    shutil.copy2(os.path.join(roots[name], path), target)
+            size = StageCache.__size(temp_dir)
+            with self.__lock:
+                self.__remove(key)
+                os.replace(temp_dir, os.path.join(self.__entries_dir, key))
+                now = time.time()
+                with self.__connection:
+                    self.__connection.execute(
+                        "INSERT INTO stage_cache (cache_key, agent, stage, size, created_at, used_at) "
+                        "VALUES (?, ?, ?, ?, ?, ?)", (key, agent_name, stage_id, size, now, now))
+                self.__evict()
+            logger.debug(f"Cached agent: {agent_name}, stage: {stage_id}, {size} bytes, as: {key}")
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def get_size(self) -> int:
+        with self.__lock:
+            return self.__connection.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM stage_cache").fetchone()[0]
+
+    def close(self):
+        with self.__lock:
+            self.__connection.close()
+
+    def __evict(self):
+        total = self.get_size()
+        if total <= self.__max_bytes:
+            return
+        rows = self.__connection.execute(
+            "SELECT cache_key, size FROM stage_cache ORDER BY used_at").fetchall()
+        for key, size in rows:
+            if total <= self.__max_bytes:
+                break
+            logger.debug(f"Evicting stage cache entry: {key}, {size} bytes")
+            self.__remove(key)
+            total -= size
+
+    def __remove(self, key: str):
+        with self.__connection:
+            self.__connection.execute("DELETE FROM stage_cache WHERE cache_key = ?", (key,))
+        shutil.rmtree(os.path.join(self.__entries_dir, key), ignore_errors=True)
+
+    @staticmethod
+    def __size(dir_path: str) -> int:
+        return sum(os.path.getsize(os.path.join(path, filename))
+                   for path, _, filenames in os.walk(dir_path) for filename in filenames)
+
+
+def _referenced_files(value: Any) -> set[str]:
+    """
+    :return: The paths of existing files, found as values, or words of values, e.g. action args.
+    """
+    if isinstance(value, dict):
+        return set().union(*[_referenced_files(e) for e in value.values()])
+    if isinstance(value, (list, tuple)):
+        return set().union(*[_referenced_files(e) for e in value])
+    if not isinstance(value, str) or not value:
+        return set()
+    candidates = [value] + [word.strip('"\'') for word in value.split()]
+    return {candidate for candidate in candidates if candidate and os.path.isfile(candidate)}
+
+
+__stage_cache: Union[StageCache, None] = None
+__stage_cache_lock = threading.Lock()
+
+
+def get_stage_cache() -> StageCache:
+    global __stage_cache
+    with __stage_cache_lock:
+        if __stage_cache is None:
+            __stage_cache = StageCache(get_output_dir('stage-cache'),
+                                       int(get_env_value(Env.STAGE_CACHE_MAX_BYTES)))
+            atexit.register(__stage_cache.close)
+        return __stage_cache
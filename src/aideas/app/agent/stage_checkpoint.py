@@ -0,0 +1,130 @@
+import hashlib
+import json
+import logging
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from typing import Any, Union
+
+from ..env import get_output_dir
+from ..io.file import write_file_atomically
+from ..result.result_set import ElementResultSet
+
+logger = logging.getLogger(__name__)
+
+
+def config_hash(config: dict[str, Any]) -> str:
+    """
+    :return: The sha256 of the config, so that a checkpoint is only resumed by the same config,
+    e.g. of an agent and the run args it is run with.
+    """
+    return hashlib.sha256(json.dumps(config, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class CompletedStage:
+    def __init__(self,
+                 stage_name: str,
+                 stage_id: str,
+                 index: int,
+                 result: ElementResultSet,
+                 values: dict[str, Any]):
+        """
+        :param stage_name: The name of the stage.
+        :param stage_id: The id of the stage, qualified by the iteration index, if above 0.
+        :param index: The iteration index of the stage.
+        :param result: The results of the stage.
+        :param values: The values of the run context set by the stage.
+        """
+        self.stage_name = stage_name
+        self.stage_id = stage_id
+        self.index = index
+        self.result = result
+        self.values = values
+
+
+class StageCheckpoint:
+    """
+    The stages an agent completed, in the order completed, for one config of the agent, and one
+    set of run args.
+    """
+    def __init__(self, agent_name: str, hash_value: str):
+        self.agent_name = agent_name
+        self.hash_value = hash_value
+        self.__stages: OrderedDict[str, CompletedStage] = OrderedDict()
+
+    def add(self, stage: CompletedStage) -> 'StageCheckpoint':
+        self.__stages[stage.stage_id] = stage
+        return self
+
+    def remove(self, stage_id: str) -> 'StageCheckpoint':
+        self.__stages.pop(stage_id, None)
+        return self
+
+    def get(self, stage_id: str) -> Union[CompletedStage, None]:
+        return self.__stages.get(stage_id, None)
+
+    def stages(self) -> list[CompletedStage]:
+        return list(self.__stages.values())
+
+    def is_empty(self) -> bool:
+        return len(self.__stages) == 0
+
+
+class StageCheckpoints:
+    """
+    Stage checkpoints, one pickle file per agent and config hash, under a dir. Runs of the same
+    agent with other configs, or run args, do not overwrite each other's checkpoint.
+    """
+    def __init__(self, dir_path: str):
+        self.__dir_path = dir_path
+        self.__lock = threading.Lock()
+
+    def get(self, agent_name: str, hash_value: str) -> Union[StageCheckpoint, None]:
+        """
+        :return: The checkpoint of the agent, or None if there is none for the config hash.
+        """
+        path = self.__path(agent_name, hash_value)
+        with self.__lock:
+            if not os.path.exists(path):
+                return None
+            try:
+                with open(path, 'rb') as file:
+                    checkpoint: StageCheckpoint = pickle.load(file)
+            except Exception as ex:
+                logger.warning(f"Ignoring unreadable stage checkpoint: {path}, {ex}")
+                return None
+        return checkpoint
+
+    def save(self, checkpoint: StageCheckpoint):
+        path = self.__path(checkpoint.agent_name, checkpoint.hash_value)
+        with self.__lock:
+            write_file_atomically(path, pickle.dumps(checkpoint))
+
+    def remove(self, agent_name: str, hash_value: str):
+        path = self.__path(agent_name, hash_value)
+        with self.__lock:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def __path(self, agent_name: str, hash_value: str) -> str:
+        return os.path.join(self.__dir_path, f'{agent_name}.{hash_value}.pickle')
+
+
+def picklable_values(values: dict[str, Any]) -> dict[str, Any]:
+    """
+    :return: The values which can be pickled. Others, e.g. the current web element, are skipped.
+    """
+    result = {}
+    for key, value in values.items():
+        try:
+            pickle.dumps(value)
+            result[key] = value
+        except Exception as ex:
+            logger.debug(f"Will not checkpoint value of: {key}, {ex}")
+    return result
+
+
+def get_stage_checkpoints() -> StageCheckpoints:
+    # Not under the output dir of the agent, which is cleared when an agent is run afresh.
+    return StageCheckpoints(get_output_dir('checkpoints'))
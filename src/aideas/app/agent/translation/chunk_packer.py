@@ -0,0 +1,133 @@
+import logging
+import re
+from typing import Union
+from urllib.parse import quote_plus
+
+logger = logging.getLogger(__name__)
+
+_SENTENCE_END = re.compile(r'(?<=[.!?;:。！？；])\s+')
+
+
+def encoded_size(text: str) -> int:
+    """
+    :return: The size of the text, once encoded as the value of a query parameter.
+    """
+    return len(quote_plus(text))
+
+
+class Packing:
+    """
+    Lines packed into chunks. Lines too large for a chunk are split into pieces, each of which is
+    translated as a line of its own. The translated pieces are joined back into lines.
+    """
+    def __init__(self, chunks: list[list[str]], pieces_per_line: list[int]):
+        self.chunks = chunks
+        self.pieces_per_line = pieces_per_line
+
+    def join(self, translated_chunks: list[list[str]]) -> Union[list[str], None]:
+        """
+        :param translated_chunks: The translation of each chunk, in order.
+        :return: The translated lines, or None if a chunk's translation has more, or fewer
+        lines than the chunk, in which case the translated lines can not be told apart.
+        """
+        if len(translated_chunks) != len(self.chunks):
+            return None
+        pieces: list[str] = []
+        for chunk, translated in zip(self.chunks, translated_chunks):
+            if len(chunk) != len(translated):
+                return None
+            pieces.extend(translated)
+        result: list[str] = []
+        start = 0
+        for count in self.pieces_per_line:
+            result.append(' '.join(pieces[start:start + count]))
+            start += count
+        return result
+
+    def get_request_count(self) -> int:
+        return len(self.chunks)
+
+
+class ChunkPacker:
+    """
+    Packs lines into the fewest chunks, such that each chunk, with its lines joined by the
+    separator and encoded as a query parameter, fits the budget.
+
+    Lines keep their order, so that each is translated in the context of its neighbours. For
+    lines in a fixed order, filling each chunk before starting the next gives the fewest chunks.
+    Lines too large for the budget are split at sentence boundaries, failing that at word
+    boundaries, failing that anywhere.
+    """
+    def __init__(self, budget: int, separator: str):
+        self.__budget = budget
+        self.__separator = separator
+        self.__separator_size = encoded_size(separator)
+        if budget <= self.__separator_size:
+            raise ValueError(f'Budget must be more than {self.__separator_size}, found: {budget}')
+
+    def pack(self, lines: list[str]) -> Packing:
+        chunks: list[list[str]] = []
+        pieces_per_line: list[int] = []
+        chunk: list[str] = []
+        chunk_size = 0
+        for line in lines:
+            pieces = self.__split(line.strip())
+            pieces_per_line.append(len(pieces))
+            for piece, size in pieces:
+                added_size = size if not chunk else size + self.__separator_size
+                if chunk and chunk_size + added_size > self.__budget:
+                    chunks.append(chunk)
+                    chunk, chunk_size, added_size = [], 0, size
+                chunk.append(piece)
+                chunk_size += added_size
+        if chunk:
+            chunks.append(chunk)
+        return Packing(chunks, pieces_per_line)
+
+    def __split(self, line: str) -> list[tuple[str, int]]:
+        size = encoded_size(line)
+        if size <= self.__budget:
+            return [(line, size)]
+        logger.debug(f'Splitting line of encoded size: {size}, budget: {self.__budget}')
+        result: list[tuple[str, int]] = []
+        for sentence in _SENTENCE_END.split(line):
+            sentence_size = encoded_size(sentence)
+            if sentence_size <= self.__budget:
+                result.append((sentence, sentence_size))
+            else:
+                result.extend(self.__split_words(sentence))
+        return self.__merge(result)
+
+    def __split_words(self, text: str) -> list[tuple[str, int]]:
+        result: list[tuple[str, int]] = []
+        for word in text.split():
+            word_size = encoded_size(word)
+            if word_size <= self.__budget:
+                result.append((word, word_size))
+            else:
+                result.extend(self.__split_chars(word))
+        return self.__merge(result)
+
+    def __split_chars(self, text: str) -> list[tuple[str, int]]:
+        result: list[tuple[str, int]] = []
+        start, size = 0, 0
+        for i, char in enumerate(text):
+            char_size = encoded_size(char)
+            if size + char_size > self.__budget and i > start:
+                result.append((text[start:i], size))
+                start, size = i, 0
+            size += char_size
+        result.append((text[start:], size))
+        return result
+
+    def __merge(self, parts: list[tuple[str, int]]) -> list[tuple[str, int]]:
+        # Merge consecutive parts, joined by space, while they fit the budget.
+        space_size = encoded_size(' ')
+        result: list[tuple[str, int]] = []
+        for part, size in parts:
+            if result and result[-1][1] + space_size + size <= self.__budget:
+                text, text_size = result[-1]
+                result[-1] = (f'{text} {part}', text_size + space_size + size)
+            else:
+                result.append((part, size))
+        return result
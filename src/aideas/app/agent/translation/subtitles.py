@@ -1,5 +1,13 @@
+import logging
+import os
+from typing import Iterable, Iterator, Union
+
 import webvtt
 
+logger = logging.getLogger(__name__)
+
+_TIMING_SEPARATOR = '-->'
+
 
 def subtitle_save(filename: str, captions: list[webvtt.Caption]):
     my_webvtt = webvtt.WebVTT(filename, captions)
@@ -12,6 +20,102 @@ def subtitle_read(filename: str) -> list[webvtt.Caption]:
     return captions
 
 
+def read_captions(filename: str) -> Iterator[webvtt.Caption]:
+    """
+    Read the captions of a WebVTT file one at a time, rather than all at once.
+    """
+    for caption, _, _ in _read_cues(filename):
+        yield caption
+
+
+def _read_cues(filename: str) -> Iterator[tuple[webvtt.Caption, int, bool]]:
+    """
+    :return: For each cue: its caption, the offset of the byte after it, and whether it is
+    complete, i.e. followed by a blank line.
+    """
+    with open(filename, 'rb') as file:
+        offset = 0
+        block: list[str] = []
+        for raw_line in file:
+            offset += len(raw_line)
+            line = raw_line.decode('utf-8').rstrip('\r\n')
+            if line.strip():
+                block.append(line)
+                continue
+            caption = _to_caption(block)
+            block = []
+            if caption is not None:
+                yield caption, offset, True
+        caption = _to_caption(block)
+        if caption is not None:
+            yield caption, offset, False
+
+
+def _to_caption(block: list[str]) -> Union[webvtt.Caption, None]:
+    # Blocks without timings, e.g. the header, NOTE and STYLE blocks, are not captions.
+    for i, line in enumerate(block):
+        if _TIMING_SEPARATOR in line:
+            start, rest = line.split(_TIMING_SEPARATOR, 1)
+            end = rest.split()[0] if rest.split() else ''
+            identifier = block[i - 1] if i > 0 else None
+            return webvtt.Caption(start.strip(), end, '\n'.join(block[i + 1:]), identifier)
+    return None
+
+
+class CaptionsWriter:
+    """
+    Writes captions to a WebVTT file as they are translated, via a partial file which replaces
+    the file once complete.
+
+    When a partial file is left by an earlier failure, the complete cues written to it, which
+    match the captions being written, are kept, so that writing resumes after the last of them.
+    """
+    def __init__(self, filename: str):
+        self.__filename = filename
+        self.__part_filename = f'{filename}.part'
+        self.__file = None
+
+    def resume(self, captions: Iterable[webvtt.Caption]) -> int:
+        """
+        Open the partial file, keeping the cues already written to it.
+        :param captions: The captions to be written, by which the written cues are checked.
+        :return: The number of captions already written, which are not to be written again.
+        """
+        written, offset = 0, 0
+        if os.path.exists(self.__part_filename):
+            expected = iter(captions)
+            for caption, end_offset, complete in _read_cues(self.__part_filename):
+                other = next(expected, None)
+                if not complete or other is None or \
+                        (caption.start, caption.end) != (other.start, other.end):
+                    break
+                written, offset = written + 1, end_offset
+        if written == 0:
+            self.__file = open(self.__part_filename, 'w', encoding='utf-8')
+            self.__file.write('WEBVTT\n\n')
+        else:
+            logger.debug(f'Resuming after {written} captions: {self.__part_filename}')
+            with open(self.__part_filename, 'rb+') as file:
+                file.truncate(offset)
+            self.__file = open(self.__part_filename, 'a', encoding='utf-8')
+        self.__file.flush()
+        return written
+
+    def write(self, captions: Iterable[webvtt.Caption]):
+        self.__file.write(''.join(f'{c.start} {_TIMING_SEPARATOR} {c.end}\n{c.text}\n\n'
+                                  for c in captions))
+        self.__file.flush()
+
+    def complete(self):
+        self.close()
+        os.replace(self.__part_filename, self.__filename)
+
+    def close(self):
+        if self.__file is not None:
+            self.__file.close()
+            self.__file = None
+
+
 """
 00:00:00.020
 00:00:02.160
@@ -31,29 +135,31 @@ address, or IP address, is
 
 
 def grouping_subtitle(captions: list[webvtt.Caption]) -> list[webvtt.Caption]:
+    return list(group_captions(captions))
+
+
+def group_captions(captions: Iterable[webvtt.Caption]) -> Iterator[webvtt.Caption]:
+    """
+    Group consecutive captions into sentences, one group at a time. The text of each group is
+    joined once, rather than appended to caption by caption.
+    """
     stop_list = (".", "!", "?")
-    result = []
-    first = True
+    start, end, parts = None, None, []
     for caption in captions:
         caption.text = str(caption.text).replace("\n", " ")
-        if first:
-            first = False
-            row = webvtt.Caption(caption.start, caption.end, caption.text)
-            if str(caption.text).strip().endswith(stop_list):
-                result.append(row)
-                first = True
+        if not parts:
+            start = caption.start
+            parts.append(caption.text)
+        elif caption.text.strip().endswith(stop_list):
+            parts.append(caption.text)
         else:
-            if str(caption.text).strip().endswith(stop_list):
-                row.text += "" + caption.text
-                row.end = caption.end
-                result.append(row)
-                first = True
-            else:
-                row.text += caption.text + " "
-                row.end = caption.end
-    if not first:
-        result.append(row)
-    return result
+            parts.append(caption.text + " ")
+        end = caption.end
+        if caption.text.strip().endswith(stop_list):
+            yield webvtt.Caption(start, end, ''.join(parts))
+            parts = []
+    if parts:
+        yield webvtt.Caption(start, end, ''.join(parts))
 
 
 """
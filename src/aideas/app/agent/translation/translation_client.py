@@ -0,0 +1,100 @@
+import logging
+import threading
+from typing import Any, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from ...io.net import send_with_retries
+
+logger = logging.getLogger(__name__)
+
+
+class TranslationServiceError(Exception):
+    pass
+
+
+class TranslationClient:
+    """
+    Calls a translation service over pooled HTTP connections.
+
+    The number of requests in flight to each service URL is limited, across all clients of that
+    URL, by the max concurrency of the first client of the URL. Requests are retried as by
+    ``send_with_retries``.
+    """
+    __semaphores: dict[str, tuple[threading.BoundedSemaphore, int]] = {}
+    __semaphores_lock = threading.Lock()
+
+    def __init__(self,
+                 service_url: str,
+                 user_agent: str,
+                 max_concurrency: int = 4,
+                 max_retries: int = 3,
+                 backoff_seconds: float = 0.5,
+                 timeout_seconds: float = 30):
+        if max_concurrency < 1:
+            raise ValueError(f'max_concurrency must be at least 1, found: {max_concurrency}')
+        self.__service_url = service_url
+        self.__user_agent = user_agent
+        self.__max_retries = max_retries
+        self.__backoff_seconds = backoff_seconds
+        self.__timeout_seconds = timeout_seconds
+        self.__semaphore, self.__max_concurrency = \
+            TranslationClient.__get_semaphore(service_url, max_concurrency)
+        self.__session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.__max_concurrency)
+        self.__session.mount('http://', adapter)
+        self.__session.mount('https://', adapter)
+        self.__session.headers.update({"User-Agent": user_agent})
+
+    def get_json(self, params: dict[str, Any], headers: Union[dict[str, str], None] = None) -> Any:
+        """
+        :param params: The query parameters of the request.
+        :param headers: Headers in addition to those of the session.
+        :return: The response, parsed as json.
+        :raises TranslationServiceError: If the request still fails after all retries.
+        """
+        def send() -> requests.Response:
+            with self.__semaphore:
+                return self.__session.get(self.__service_url, params=params,
+                                          headers=headers, timeout=self.__timeout_seconds)
+
+        try:
+            response = send_with_retries(send, self.__max_retries, self.__backoff_seconds)
+        except requests.RequestException as ex:
+            raise TranslationServiceError(f"Failed to call: {self.__service_url}, "
+                                          f"after {self.__max_retries + 1} attempts") from ex
+        if response.status_code >= 400:
+            raise TranslationServiceError(
+                f"Status: {response.status_code} from: {self.__service_url}")
+        try:
+            return response.json()
+        except Exception as ex:
+            logger.warning(f"Parsing response json failed, params:\n{params}\n"
+                           f"response:\n{response}")
+            raise ex
+
+    def get_max_concurrency(self) -> int:
+        return self.__max_concurrency
+
+    def get_service_url(self) -> str:
+        return self.__service_url
+
+    def close(self):
+        self.__session.close()
+
+    @staticmethod
+    def __get_semaphore(service_url: str,
+                        max_concurrency: int) -> tuple[threading.BoundedSemaphore, int]:
+        """
+        :return: The semaphore limiting the requests in flight to the URL, and its limit.
+        """
+        with TranslationClient.__semaphores_lock:
+            if service_url not in TranslationClient.__semaphores:
+                TranslationClient.__semaphores[service_url] = \
+                    (threading.BoundedSemaphore(max_concurrency), max_concurrency)
+            semaphore, limit = TranslationClient.__semaphores[service_url]
+            if limit != max_concurrency:
+                logger.warning(f"Ignoring max concurrency: {max_concurrency} for: {service_url}, "
+                               f"which is already limited to: {limit}")
+            return semaphore, limit
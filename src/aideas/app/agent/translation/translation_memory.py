@@ -0,0 +1,130 @@
+import atexit
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Union
+
+from ...env import get_output_dir
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_segment(segment: str) -> str:
+    return ' '.join(segment.split())
+
+
+def segment_key(segment: str) -> str:
+    return hashlib.sha256(normalize_segment(segment).encode('utf-8')).hexdigest()
+
+
+class TranslationMemory:
+    """
+    Translations of segments (usually lines), keyed by: source language, target language and
+    the hash of the normalized segment. Stored in a SQLite database, which may be shared by
+    many processes.
+
+    Counts the hits and misses of this instance, and the bytes of text not sent for
+    translation because of hits.
+    """
+    def __init__(self, db_path: str):
+        if db_path != ':memory:':
+            db_dir = os.path.dirname(db_path)
+            if db_dir and not os.path.exists(db_dir):
+                os.makedirs(db_dir, exist_ok=True)
+        self.__db_path = db_path
+        self.__lock = threading.RLock()
+        self.__connection = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        self.__hits = 0
+        self.__misses = 0
+        self.__bytes_saved = 0
+        with self.__lock:
+            if db_path != ':memory:':
+                self.__connection.execute("PRAGMA journal_mode=WAL")
+            self.__connection.execute(
+                "CREATE TABLE IF NOT EXISTS translation_memory ("
+                "from_lang TEXT NOT NULL, to_lang TEXT NOT NULL, segment_hash TEXT NOT NULL, "
+                "translation TEXT NOT NULL, created_at REAL NOT NULL, "
+                "PRIMARY KEY (from_lang, to_lang, segment_hash))")
+            self.__connection.commit()
+
+    def get_all(self, segments: list[str], from_lang: str, to_lang: str) -> list[Union[str, None]]:
+        """
+        :param segments: The segments to look up.
+        :param from_lang: The language of the segments.
+        :param to_lang: The language of the translations.
+        :return: For each segment, its translation, or None if not found.
+        """
+        if not segments:
+            return []
+        keys = [segment_key(e) for e in segments]
+        found: dict[str, str] = {}
+        unique_keys = list(dict.fromkeys(keys))
+        with self.__lock:
+            # Keep within SQLite's limit on the number of parameters
+            for i in range(0, len(unique_keys), 500):
+                batch = unique_keys[i:i + 500]
+                placeholders = ', '.join('?' * len(batch))
+                rows = self.__connection.execute(
+                    "SELECT segment_hash, translation FROM translation_memory "
+                    f"WHERE from_lang = ? AND to_lang = ? AND segment_hash IN ({placeholders})",
+                    (from_lang, to_lang, *batch)).fetchall()
+                found.update(dict(rows))
+        result = [found.get(key) for key in keys]
+        with self.__lock:
+            for segment, translation in zip(segments, result):
+                if translation is None:
+                    self.__misses += 1
+                else:
+                    self.__hits += 1
+                    self.__bytes_saved += len(segment.encode('utf-8'))
+        return result
+
+    def put_all(self, segments: list[str], translations: list[str], from_lang: str, to_lang: str):
+        if len(segments) != len(translations):
+            raise ValueError(f'Expected {len(segments)} translations, found: {len(translations)}')
+        now = time.time()
+        rows = [(from_lang, to_lang, segment_key(s), t, now)
+                for s, t in zip(segments, translations) if t]
+        with self.__lock:
+            self.__connection.executemany(
+                "INSERT OR REPLACE INTO translation_memory "
+                "(from_lang, to_lang, segment_hash, translation, created_at) VALUES (?, ?, ?, ?, ?)",
+                rows)
+            self.__connection.commit()
+
+    def get_stats(self) -> dict[str, Union[int, float]]:
+        with self.__lock:
+            lookups = self.__hits + self.__misses
+            entries = self.__connection.execute(
+                "SELECT COUNT(*) FROM translation_memory").fetchone()[0]
+            return {
+                'entries': entries,
+                'hits': self.__hits,
+                'misses': self.__misses,
+                'hit-rate': 0 if lookups == 0 else self.__hits / lookups,
+                'bytes-saved': self.__bytes_saved
+            }
+
+    def close(self):
+        with self.__lock:
+            self.__connection.close()
+
+    def get_db_path(self) -> str:
+        return self.__db_path
+
+
+__translation_memory: Union[TranslationMemory, None] = None
+__translation_memory_lock = threading.Lock()
+
+
+def get_translation_memory() -> TranslationMemory:
+    global __translation_memory
+    with __translation_memory_lock:
+        if __translation_memory is None:
+            __translation_memory = TranslationMemory(
+                os.path.join(get_output_dir('translations'), 'translation-memory.db'))
+            atexit.register(__translation_memory.close)
+        return __translation_memory
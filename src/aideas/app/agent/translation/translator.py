@@ -1,13 +1,23 @@
 import logging
 import os
-from typing import Union, Any
-
-import requests
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Union, Any, Callable, TypeVar
+from urllib.parse import urlencode
 
+from .chunk_packer import ChunkPacker, Packing
+from .translation_client import TranslationClient
+from .translation_memory import TranslationMemory, get_translation_memory
 from ...env import Env, get_env_value
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+R = TypeVar("R")
+
+# As long as the longest language codes, e.g. mni-Mtei, so that requests in any language fit.
+_LONGEST_LANGUAGE_CODE = 'x' * 8
+
 class TextLines:
     def __init__(self, text: str):
         if not text:
@@ -67,38 +77,60 @@ class Translator:
         if not user_agent:
             user_agent = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36'
 
+        max_concurrency_str = config.get('max-concurrency')
+        if not max_concurrency_str:
+            max_concurrency_str = get_env_value(Env.TRANSLATION_MAX_CONCURRENCY)
+        max_concurrency = int(max_concurrency_str)
+
         logger.info(f"Chunk size: {chunk_size}, user agent: {user_agent}")
-        return cls(service_url, chunk_size, user_agent)
+        return cls(service_url, chunk_size, user_agent, max_concurrency, memory=get_translation_memory())
 
     __verbose = True
 
     def __init__(self,
                  service_url: str,
                  chunk_size: int = 10000,
-                 user_agent: str = "aideas/translator"):
+                 user_agent: str = "aideas/translator",
+                 max_concurrency: int = 4,
+                 client: Union[TranslationClient, None] = None,
+                 memory: Union[TranslationMemory, None] = None):
         self.__service_url = service_url
         self.__user_agent = user_agent
         self.__chunk_size = chunk_size
+        self.__client = client if client is not None \
+            else TranslationClient(service_url, user_agent, max_concurrency)
+        self.__memory = memory
         # Do not put letters here, they may be translated or cause other inconsistencies.
         self.__separator: str = "~~~"
+        request_overhead = Translator.get_request_overhead(service_url)
+        if chunk_size <= request_overhead:
+            raise ValueError(f"Chunk size must be more than: {request_overhead}, the size of a "
+                             f"request to: {service_url} without text, found: {chunk_size}")
+        # The chunk size is that of the whole request, of which the text is what remains.
+        self.__packer = ChunkPacker(chunk_size - request_overhead, f" {self.__separator} ")
+        self.__executor: Union[ThreadPoolExecutor, None] = None
+        self.__executor_lock = threading.Lock()
+        self.__local = threading.local()
         logger.info(f"Chunk size: {chunk_size}, user agent: {user_agent}, service URL: {service_url}")
 
     @staticmethod
-    def _chunkify(text_list: list[str], chunk_size: int) -> list[str]:
-        text_size = 0
-        result_list = []
-        chunk = []
-        for line in text_list:
-            line = line.strip()
-            if text_size + len(line) < chunk_size:
-                chunk.append(line)
-                text_size += len(line)
-            elif chunk and len(line) < chunk_size:
-                result_list.append(chunk)
-                chunk = [line]
-                text_size = len(line)
-        result_list.append(chunk)
-        return result_list
+    def get_request_overhead(service_url: str) -> int:
+        """
+        :return: The size of a request to the service URL, once encoded, other than of its text.
+        """
+        params = Translator.__params(_LONGEST_LANGUAGE_CODE, _LONGEST_LANGUAGE_CODE, '')
+        return len(service_url) + len('?') + len(urlencode(params))
+
+    @staticmethod
+    def __params(from_lang: str, to_lang: str, text: str) -> dict[str, str]:
+        return {"client": "gtx", "sl": from_lang, "tl": to_lang, "dt": "t", "q": text}
+
+    def _pack(self, text_list: list[str]) -> Packing:
+        """
+        Pack the lines into chunks, each of which fits in a request of at most chunk size,
+        once encoded.
+        """
+        return self.__packer.pack(text_list)
 
     def translate(self, text: Union[list[str], str], from_lang: str, to_lang: str) -> Union[list[str], str]:
         if isinstance(text, str):
@@ -108,17 +140,78 @@ class Translator:
             text_lines = None
             text_list = text
 
-        chunks = Translator._chunkify(text_list, self.__chunk_size)
+        result_big_list = None if self.__memory is None \
+            else self.__translate_via_memory(text_list, from_lang, to_lang)
 
-        result_big_list = []
-        for chunk in chunks:
-            if not chunk:
-                continue
-            result = self.__translate(chunk, from_lang, to_lang)
-            result_big_list.extend(result)
+        if result_big_list is None:
+            result_big_list = self.__translate_all(text_list, from_lang, to_lang)
 
         return text_lines.compose(result_big_list) if text_lines else result_big_list
 
+    def __translate_all(self, text_list: list[str], from_lang: str, to_lang: str) -> list[str]:
+        packing = self._pack(text_list)
+
+        # Chunks are translated concurrently, their results joined in order.
+        results = self.map(lambda chunk: self.__translate(chunk, from_lang, to_lang), packing.chunks)
+
+        lines = packing.join(results)
+        # The translated lines could not be told apart, so we return them as translated
+        return lines if lines is not None else [line for result in results for line in result]
+
+    def __translate_via_memory(self,
+                               text_list: list[str],
+                               from_lang: str,
+                               to_lang: str) -> Union[list[str], None]:
+        """
+        Translate only the lines not found in the translation memory, and add their
+        translations to it.
+        :return: The translated lines, or None if the translations of the lines sent could not be
+        told apart, e.g. because the service merged some of them.
+        """
+        lines = [e.strip() for e in text_list]
+        found: list[Union[str, None]] = self.__memory.get_all(lines, from_lang, to_lang)
+        missing = list(dict.fromkeys(e for e, t in zip(lines, found) if t is None and e))
+        if missing:
+            logger.debug(f"Translation memory found {len(lines) - len(missing)} of {len(lines)} lines")
+        packing = self._pack(missing)
+        results = self.map(lambda chunk: self.__translate(chunk, from_lang, to_lang), packing.chunks)
+        translated_lines = packing.join(results)
+        if translated_lines is None:
+            return None
+        self.__memory.put_all(missing, translated_lines, from_lang, to_lang)
+        translated: dict[str, str] = dict(zip(missing, translated_lines))
+        return [t if t is not None else translated.get(e, e) for e, t in zip(lines, found)]
+
+    def map(self, func: Callable[[T], R], items: list[T]) -> list[R]:
+        """
+        Apply the function to each item, concurrently, up to the max concurrency of the service.
+
+        All calls share one executor. Calls nested in a call, e.g. for the chunks of each
+        language translated concurrently, are run in the calling thread, as the executor's
+        threads are already taken by the enclosing call.
+        :return: The results, in the order of the items.
+        """
+        if len(items) < 2 or getattr(self.__local, 'in_executor', False):
+            return [func(e) for e in items]
+        return list(self.__get_executor().map(func, items))
+
+    def __get_executor(self) -> ThreadPoolExecutor:
+        with self.__executor_lock:
+            if self.__executor is None:
+                def mark_thread():
+                    self.__local.in_executor = True
+
+                self.__executor = ThreadPoolExecutor(
+                    max_workers=self.__client.get_max_concurrency(),
+                    thread_name_prefix='translator', initializer=mark_thread)
+            return self.__executor
+
+    def close(self):
+        with self.__executor_lock:
+            if self.__executor is not None:
+                self.__executor.shutdown(wait=False)
+                self.__executor = None
+
     def translate_file_path(self, filepath: str, from_lang: str, to_lang: str) -> str:
         name, ext = os.path.splitext(os.path.basename(filepath))
         name_translated: str = self.translate(name, from_lang, to_lang)
@@ -137,11 +230,8 @@ class Translator:
         if self.__verbose:
             logger.debug(f"Translate new chunk with {sum(len(i) for i in text_list)} chars")
         text = f" {self.__separator} ".join(text_list)
-        params = {"client": "gtx", "sl": from_lang, "tl": to_lang, "dt": "t", "q": text}
-        headers = {
-            "User-Agent": self.__user_agent
-        }
-        json_result = self.call_translation_service(params=params, headers=headers)
+        params = Translator.__params(from_lang, to_lang, text)
+        json_result = self.call_translation_service(params=params, headers={})
         return self._handle_result(json_result)
 
     def _handle_result(self, json_result) -> list[str]:
@@ -157,12 +247,13 @@ class Translator:
 
     def call_translation_service(self, params: dict, headers: dict) -> list[str]:
         logger.debug(f"Requesting translation from: {self.__service_url}")
-        r = requests.get(self.__service_url, params=params, headers=headers)
-        try:
-            return r.json()
-        except Exception as ex:
-            logger.warning(f"Parsing response json failed, headers:\n{headers}\nparams:\n{params}\nresponse:\n{r}")
-            raise ex
+        return self.__client.get_json(params, headers)
+
+    def get_memory(self) -> Union[TranslationMemory, None]:
+        return self.__memory
+
+    def get_max_concurrency(self) -> int:
+        return self.__client.get_max_concurrency()
 
     def get_separator(self) -> str:
         return self.__separator
\ No newline at end of file
@@ -9,7 +9,7 @@ import sys
 
 from .config_loader import ConfigLoader
 from .env import Env, is_production, get_env_value, get_output_dir, get_content_dir
-from .task import shutdown as shutdown_tasks, init_tasks_cleanup
+from .task import shutdown as shutdown_tasks, init_tasks_cleanup, init_task_store
 
 logger = logging.getLogger(__name__)
 
@@ -38,6 +38,8 @@ class App:
             os.makedirs(content_dir)
             logger.info(f"Created content directory: {content_dir}")
 
+        init_task_store()
+
         return ConfigLoader(config_path)
 
     @staticmethod
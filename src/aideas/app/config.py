@@ -97,6 +97,9 @@ class AppConfig:
     def get_title(self, default: Union[str, None] = None) -> str:
         return self.app().get('title', default)
 
+    def get_agent_max_parallel(self, default: int = 1) -> int:
+        return self.app().get('agent', {}).get('max-parallel', default)
+
 
 class RunConfig:
     def __init__(self, config: dict[str, Any]):
@@ -134,6 +137,15 @@ class BrowserConfig:
     def chrome_config(self) -> dict[str, str]:
         return self.__config.get('chrome', {})
 
+    def get_pool_max_idle(self, default: int = 0) -> int:
+        return self.pool_config().get('max-idle', default)
+
+    def get_pool_max_uses(self, default: int = 20) -> int:
+        return self.pool_config().get('max-uses', default)
+
+    def pool_config(self) -> dict[str, Any]:
+        return self.__config.get('pool', {})
+
 
 class Name:
     @staticmethod
@@ -235,6 +247,8 @@ class ConfigPath(tuple[Name]):
 class SearchBy(Enum):
     XPATH = 'x-paths'
     SHADOW_ATTRIBUTE = 'shadow-attributes'
+    # Like SHADOW_ATTRIBUTE, but searches the DOM and shadow roots within the browser.
+    SHADOW_ATTRIBUTE_IN_PAGE = 'shadow-attributes-in-page'
 
 
 class SearchConfig:
@@ -300,6 +314,14 @@ class SearchConfig:
         self.__updated = True
         return True
 
+    def order_queries(self, ordered_queries: list[str]) -> bool:
+        if ordered_queries == self.__queries or sorted(ordered_queries) != sorted(self.__queries):
+            return False
+        logger.debug(f"Ordered queries: {ordered_queries}")
+        self.__queries = list(ordered_queries)
+        self.__updated = True
+        return True
+
     def __str__(self):
         return (f"SearchConfig{{search_by={self.__search_by}, queries={self.__queries}, "
                 f"updated={self.__updated}}}")
@@ -501,6 +523,9 @@ class AgentConfig:
                          default: float = None) -> float:
         return self.get(path.join(TIMEOUT_KEY), default)
 
+    def is_stage_cached(self, stage: Union[str, Name]) -> bool:
+        return str(self.get_stage_value(stage, 'cache', False)).lower() == 'true'
+
     def get_stage_wait_timeout(self, stage: Union[str, Name], result_if_none: int = 0) -> int:
         return self.get_stage_value(stage, TIMEOUT_KEY, result_if_none)
 
@@ -635,6 +660,7 @@ class RunArg(str, Enum):
     def default_value(self) -> Any:
         return self.__default_value
 
+    ADAPTIVE_WAIT = ('adaptive-wait', 'aw', 'bool', True, False)
     AGENTS = ('agents', 'a', 'list')
     BROWSER_MODE = ('browser-mode', 'bm', 'str', True, False)
     CONTINUE_ON_ERROR = ('continue-on-error', 'coe', 'bool', True, False)
@@ -643,6 +669,7 @@ class RunArg(str, Enum):
     IMAGE_FILE_PORTRAIT = ('image-file-portrait', 'ifp', 'str', True, True)
     IMAGE_FILE_SQUARE = ('image-file-square', 'ifs', 'str', True, True)
     LANGUAGE_CODES = ('language-codes', 'lc', 'str', True, False, I18n.get_supported_language_codes())
+    RESUME = ('resume', 'r', 'bool', True, False)
     SAVE_SCREENS = ('save-screens', 'ss', 'str', True, False)
     SHARE_COVER_IMAGE = ('share-cover-image', 'sci', 'bool', True, False)
     SUBTITLES_FILE = ('subtitles-file', 'sf', 'str', True, True)
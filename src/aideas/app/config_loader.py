@@ -3,10 +3,12 @@ from typing import Callable, Union, Any
 
 import logging
 import os
+import threading
 
 from pyu.io.file import load_yaml
 from pyu.io.yaml_loader import YamlLoader
-from .action.variable_parser import replace_all_variables, get_variables
+from .action.variable_parser import get_variables
+from .action.variable_template import VariableTemplate
 from .config import RunArg, merge_configs, AgentConfig
 from .env import Env, is_production
 from .paths import Paths
@@ -22,6 +24,59 @@ def resolve_config_path(config_path: Union[str, Iterable, None]) -> str:
     return config_path if config_path else os.path.join(os.getcwd(), CONFIG_DIR)
 
 
+class _ParsedYamlCache:
+    """
+    A process-wide cache of parsed yaml files, with any `extends` chain already resolved,
+    compiled for the replacement of their variables.
+
+    Entries are keyed by path, and are invalidated when the modification time or size of the
+    file, or of any file it extends, changes. Rendering an entry returns a new config, so callers
+    may modify what they are given.
+    """
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__entries: dict[str, tuple[list[tuple[str, int, int]], VariableTemplate]] = {}
+
+    def get(self,
+            path: str,
+            parse: Callable[[str], tuple[dict[str, Any], list[str]]]) -> VariableTemplate:
+        """
+        :param path: The path of the yaml file.
+        :param parse: Parses the file at the path. Returns the parsed content, and the paths
+        of the files involved, i.e. the file at the path and the files it extends.
+        :return: The parsed content, compiled for the replacement of its variables.
+        """
+        path = os.path.abspath(path)
+        with self.__lock:
+            entry = self.__entries.get(path)
+        if entry is None or not _ParsedYamlCache.__is_valid(entry[0]):
+            loaded, paths = parse(path)
+            entry = ([(p, *_ParsedYamlCache.__stat(p)) for p in paths],
+                     VariableTemplate.compile(loaded))
+            with self.__lock:
+                self.__entries[path] = entry
+        return entry[1]
+
+    def clear(self):
+        with self.__lock:
+            self.__entries.clear()
+
+    @staticmethod
+    def __is_valid(dependencies: list[tuple[str, int, int]]) -> bool:
+        try:
+            return all(_ParsedYamlCache.__stat(e[0]) == (e[1], e[2]) for e in dependencies)
+        except FileNotFoundError:
+            return False
+
+    @staticmethod
+    def __stat(path: str) -> tuple[int, int]:
+        stat = os.stat(path)
+        return stat.st_mtime_ns, stat.st_size
+
+
+_parsed_yaml_cache = _ParsedYamlCache()
+
+
 class ConfigLoader(YamlLoader):
     def __init__(self,
                  config_path: Union[str, Iterable, None] = None,
@@ -37,7 +92,9 @@ class ConfigLoader(YamlLoader):
             # self.__variable_source.update(self.load_run_config()) # run properties
             self.__variable_source.update(RunArg.of_defaults()) # sys.argv and environment variable RUN_ARGs
         self.__external_config_dir = Paths.get_path(self.__variable_source.get(Env.EXTERNAL_CONFIG_DIR.value))
-        self.__agent_configs_with_un_replaced_variables = self.__load_agent_config_with_variables()
+        # Loaded on first use, as most loaders only ever need the configs of a few agents.
+        self.__agent_configs_with_un_replaced_variables: dict[str, dict[str, Any]] = {}
+        self.__all_agent_configs_loaded = False
 
     def get_agent_config_with_unreplaced_variables(self, agent_name: str) -> dict[str, Any]:
         """
@@ -45,13 +102,13 @@ class ConfigLoader(YamlLoader):
         :param agent_name: The name of the agent.
         :return: The agent config with variables not replaced.
         """
-        return self.__agent_configs_with_un_replaced_variables.get(agent_name, {})
+        return self.__get_agent_config_with_unreplaced_variables(agent_name)
 
     def with_added_variable_source(self, source: dict[str, Any]) -> 'ConfigLoader':
         return ConfigLoader(self.__config_path, {**self.__variable_source, **source})
 
     def get_agent_variable_names(self, agent_name: str) -> list[str]:
-        config = self.__agent_configs_with_un_replaced_variables[agent_name]
+        config = self.__get_agent_config_with_unreplaced_variables(agent_name)
         return get_variables(config, False)
 
     def get_agent_names(self, tag: Union[str , None] = None) -> list[str]:
@@ -73,7 +130,7 @@ class ConfigLoader(YamlLoader):
                                config_sort: Callable[[dict[str, Any]], int]) -> list[str]:
         keys = []
         values = []
-        for k, v in self.__agent_configs_with_un_replaced_variables.items():
+        for k, v in self.__load_agent_config_with_variables().items():
             if config_filter(v):
                 keys.append(k)
                 values.append(v)
@@ -118,6 +175,9 @@ class ConfigLoader(YamlLoader):
     def get_variable_source(self):
         return {**self.__variable_source}
 
+    def get_config_path(self) -> str:
+        return self.__config_path
+
     def _load_browser_config_for_type(self, browser_type: str, check_replaced: bool = True) -> dict[str, Any]:
         if browser_type == 'visible':
             config_name = 'browser-visible'
@@ -127,12 +187,22 @@ class ConfigLoader(YamlLoader):
             config_name = 'browser'
         return self.load_from_path(self.get_path(config_name), check_replaced)
 
+    def __get_agent_config_with_unreplaced_variables(self, agent_name: str) -> dict[str, Any]:
+        config = self.__agent_configs_with_un_replaced_variables.get(agent_name, None)
+        if config is None:
+            config = self.__load_from_path(self.get_agent_config_path(agent_name), {}, False)
+            self.__agent_configs_with_un_replaced_variables[agent_name] = config
+        return config
+
     def __load_agent_config_with_variables(self) -> dict[str, dict[str, Any]]:
-        configs = {}
-        for name in self.__get_all_agent_names():
-            configs[name] = self.__load_from_path(self.get_agent_config_path(name), {}, False)
-        # logger.debug(f"Config names: {configs.keys()}")
-        return configs
+        if not self.__all_agent_configs_loaded:
+            configs = {}
+            for name in self.__get_all_agent_names():
+                configs[name] = self.__get_agent_config_with_unreplaced_variables(name)
+            # logger.debug(f"Config names: {configs.keys()}")
+            self.__agent_configs_with_un_replaced_variables = configs
+            self.__all_agent_configs_loaded = True
+        return self.__agent_configs_with_un_replaced_variables
 
     def __get_all_agent_names(self) -> list[str]:
         agents = []
@@ -169,21 +239,28 @@ class ConfigLoader(YamlLoader):
             variables: Union[dict[str, Any], None] = None,
             check_replaced: bool = True, log: bool = True) -> dict[str, Any]:
         try:
-            return replace_all_variables(self.__load_from_yaml(path), variables, check_replaced)
+            return self.__load_from_yaml(path).render(variables, check_replaced)
         except FileNotFoundError:
             if log:
                 logger.warning(f'Could not find config file for: {path}')
             return {}
 
-    def __load_from_yaml(self, path: str) -> dict[str, Any]:
+    @staticmethod
+    def __load_from_yaml(path: str) -> VariableTemplate:
+        return _parsed_yaml_cache.get(path, ConfigLoader.__parse_yaml)
+
+    @staticmethod
+    def __parse_yaml(path: str) -> tuple[dict[str, Any], list[str]]:
         loaded = load_yaml(path)
+        paths = [path]
         parent_name = loaded.pop("extends", "")
         if parent_name:
             parent_path = f"{os.path.join(os.path.dirname(path), parent_name)}{_SUFFIX}.yaml"
-            parent = self.__load_from_yaml(parent_path)
+            parent, parent_paths = ConfigLoader.__parse_yaml(parent_path)
+            paths.extend(parent_paths)
             if parent:
                 loaded = merge_configs(loaded, parent, False, ConfigLoader.__get_keys_for_merging)
-        return loaded
+        return loaded, paths
 
     @staticmethod
     def __get_keys_for_merging(candidate: dict, parent: dict) -> Iterable:
@@ -38,16 +38,27 @@ class Env(str, Enum):
 
     WEB_APP = ('WEB_APP', True, False, 'true')
 
+    TASK_QUEUE_SIZE = ('TASK_QUEUE_SIZE', True, False, '50')
+    TASK_WORKERS = ('TASK_WORKERS', True, False, '10')
+    # thread|process
+    TASK_BACKEND = ('TASK_BACKEND', True, False, 'thread')
+    TASK_STORE_MAX_AGE_SECONDS = ('TASK_STORE_MAX_AGE_SECONDS', True, False, '604800')
+    TASK_STORE_MAX_COUNT = ('TASK_STORE_MAX_COUNT', True, False, '1000')
+
     # This is optional
     EXTERNAL_CONFIG_DIR = ('EXTERNAL_CONFIG_DIR', True, True, os.path.join('resources', 'config'))
     CONTENT_DIR = ('CONTENT_DIR', True, True, CONTENT_DIR)
     OUTPUT_DIR = ('OUTPUT_DIR', False, True, OUTPUT_DIR)
     CHROME_PROFILE_DIR = ('CHROME_PROFILE_DIR', True, True)
+    STAGE_CACHE_MAX_BYTES = ('STAGE_CACHE_MAX_BYTES', True, False, '1073741824')
 
     RUN_ARGS = ('RUN_ARGS', True, False)
 
     VIDEO_FILE_EXTENSION = ('VIDEO_FILE_EXTENSION', False, False, 'mp4')
 
+    PUBLISH_TIMEOUT_SECONDS = ('PUBLISH_TIMEOUT_SECONDS', True, False, '1800')
+    PUBLISH_MAX_RETRIES = ('PUBLISH_MAX_RETRIES', True, False, '0')
+
     PICTORY_USER_EMAIL = 'PICTORY_USER_EMAIL'
     PICTORY_USER_PASS = 'PICTORY_USER_PASS'
     PICTORY_BRAND_NAME = 'PICTORY_BRAND_NAME'
@@ -59,6 +70,7 @@ class Env(str, Enum):
                                     False, False, 'https://translate.googleapis.com/translate_a/single')
     TRANSLATION_OUTPUT_LANGUAGE_CODES = ('TRANSLATION_OUTPUT_LANGUAGE_CODES',
                                          False, False, 'ar,bn,de,es,fr,hi,it,ja,ko,ru,tr,uk,zh')
+    TRANSLATION_MAX_CONCURRENCY = ('TRANSLATION_MAX_CONCURRENCY', True, False, '4')
     SUBTITLES_FILE_EXTENSION = ('SUBTITLES_FILE_EXTENSION', False, False, 'vtt')
 
     YOUTUBE_USER_EMAIL = 'YOUTUBE_USER_EMAIL'
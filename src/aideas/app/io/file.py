@@ -0,0 +1,30 @@
+import hashlib
+import os
+import uuid
+from typing import Union
+
+
+def file_hash(filename: str, block_size: int = 1024 * 1024) -> str:
+    """
+    :return: The sha256 of the file's content, read a block at a time.
+    """
+    digest = hashlib.sha256()
+    with open(filename, 'rb') as file:
+        for block in iter(lambda: file.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def write_file_atomically(path: str, content: Union[str, bytes]):
+    """
+    Write the content to a temporary file, then replace the file with it, so that the file is
+    never seen half written. Creates the dir of the file, if missing.
+    :param path: The file to write.
+    :param content: The content, written as text if a str, or as binary if bytes.
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    # Unique, as the file may be written by other threads, or processes, at the same time
+    tmp_path = f'{path}.{uuid.uuid4().hex}.tmp'
+    with open(tmp_path, 'wb' if isinstance(content, bytes) else 'w') as file:
+        file.write(content)
+    os.replace(tmp_path, path)
@@ -1,8 +1,15 @@
 import logging
+import random
+import time
+from typing import Any, Callable, Union
+
 import requests
 
 logger = logging.getLogger(__name__)
 
+# Responses to these are retried, after a backoff.
+RETRY_STATUS_CODES = frozenset([429, 500, 502, 503, 504])
+
 
 def download_file(url: str, save_to: str) -> bool:
     try:
@@ -18,3 +25,48 @@ def download_file(url: str, save_to: str) -> bool:
     else:
         logger.debug('Request not successful!.')
         return False
+
+
+def send_with_retries(send: Callable[[], requests.Response],
+                      max_retries: int,
+                      backoff_seconds: float) -> requests.Response:
+    """
+    Send a request, retrying connection errors and ``RETRY_STATUS_CODES`` with exponential
+    backoff and jitter. The ``Retry-After`` header is honoured.
+    :param send: Sends the request, once per attempt.
+    :param max_retries: The number of times to retry.
+    :param backoff_seconds: The delay before the first retry, doubled after each retry.
+    :return: The response to the last attempt, which has one of ``RETRY_STATUS_CODES`` if all
+        attempts had.
+    :raises requests.RequestException: If the last attempt failed.
+    """
+    attempt = 0
+    while True:
+        try:
+            response = send()
+        except requests.RequestException as ex:
+            if attempt >= max_retries:
+                raise
+            _backoff(attempt, max_retries, backoff_seconds, None, ex)
+        else:
+            if response.status_code not in RETRY_STATUS_CODES or attempt >= max_retries:
+                return response
+            _backoff(attempt, max_retries, backoff_seconds,
+                     response.headers.get('Retry-After'), response.status_code)
+        attempt += 1
+
+
+def _backoff(attempt: int,
+             max_retries: int,
+             backoff_seconds: float,
+             retry_after: Union[str, None],
+             cause: Any):
+    seconds = backoff_seconds * (2 ** attempt)
+    seconds += random.uniform(0, seconds / 2)
+    if retry_after:
+        try:
+            seconds = max(seconds, float(retry_after))
+        except ValueError:
+            pass  # An HTTP date, which we don't bother with
+    logger.debug(f"Retry {attempt + 1} of {max_retries} in {seconds:.2f} seconds, cause: {cause}")
+    time.sleep(seconds)
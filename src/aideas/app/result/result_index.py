@@ -0,0 +1,197 @@
+import logging
+import math
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Any, Union
+
+logger = logging.getLogger(__name__)
+
+# Latencies are counted in buckets, each this many times as wide as the one before it.
+# A percentile is reported as the upper bound of its bucket, so is at most 20% over.
+LATENCY_BUCKET_BASE = 1.2
+
+# Latencies below this are counted in the bucket of this.
+MIN_LATENCY_SECONDS = 0.001
+
+LATENCY_PERCENTILES = (50, 90, 99)
+
+
+def to_day(timestamp: float) -> str:
+    """
+    :return: The local date of the timestamp, as YYYY-MM-DD, the format of SQLite's date().
+    """
+    return datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d')
+
+
+def latency_bucket(seconds: float) -> int:
+    return math.ceil(math.log(max(seconds, MIN_LATENCY_SECONDS), LATENCY_BUCKET_BASE))
+
+
+def latency_bucket_upper_bound(bucket: int) -> float:
+    return round(LATENCY_BUCKET_BASE ** bucket, 3)
+
+
+class StageItemOutcome:
+    def __init__(self, stage: str, stage_item: str, success: bool):
+        self.stage = stage
+        self.stage_item = stage_item
+        self.success = success
+
+
+class ResultIndex:
+    """
+    Counts of saved runs, by agent, stage and stage item, per day. Counts are added as each run
+    is saved, in the same transaction, so that stats over any range of days are read from at
+    most one row per day, rather than from the runs themselves.
+
+    A stage item of a run succeeds if all its actions succeed, and a stage if all its items do.
+    """
+    def __init__(self, connection: sqlite3.Connection, lock: threading.RLock):
+        self.__connection = connection
+        self.__lock = lock
+
+    def create_tables(self):
+        for statement in [
+            "CREATE TABLE IF NOT EXISTS index_agent_days ("
+            "agent TEXT NOT NULL, day TEXT NOT NULL, runs INTEGER NOT NULL, "
+            "successes INTEGER NOT NULL, PRIMARY KEY (agent, day))",
+            "CREATE TABLE IF NOT EXISTS index_latency_days ("
+            "agent TEXT NOT NULL, day TEXT NOT NULL, bucket INTEGER NOT NULL, "
+            "count INTEGER NOT NULL, PRIMARY KEY (agent, day, bucket))",
+            "CREATE TABLE IF NOT EXISTS index_stage_days ("
+            "agent TEXT NOT NULL, stage TEXT NOT NULL, day TEXT NOT NULL, "
+            "runs INTEGER NOT NULL, successes INTEGER NOT NULL, PRIMARY KEY (agent, stage, day))",
+            "CREATE TABLE IF NOT EXISTS index_stage_item_days ("
+            "agent TEXT NOT NULL, stage TEXT NOT NULL, stage_item TEXT NOT NULL, "
+            "day TEXT NOT NULL, runs INTEGER NOT NULL, failures INTEGER NOT NULL, "
+            "PRIMARY KEY (agent, stage, stage_item, day))",
+            "CREATE INDEX IF NOT EXISTS index_stage_item_days_day ON index_stage_item_days (day)"]:
+            self.__connection.execute(statement)
+
+    def add(self,
+            agent: str,
+            created_at: float,
+            success: bool,
+            duration_seconds: Union[float, None],
+            outcomes: list[StageItemOutcome]):
+        """
+        Add a run to the counts. To be called in the transaction which saves the run.
+        """
+        day = to_day(created_at)
+        execute = self.__connection.execute
+        execute("INSERT INTO index_agent_days (agent, day, runs, successes) VALUES (?, ?, 1, ?) "
+                "ON CONFLICT (agent, day) DO UPDATE SET runs = runs + 1, "
+                "successes = successes + excluded.successes",
+                (agent, day, 1 if success else 0))
+        if duration_seconds is not None:
+            execute("INSERT INTO index_latency_days (agent, day, bucket, count) VALUES (?, ?, ?, 1) "
+                    "ON CONFLICT (agent, day, bucket) DO UPDATE SET count = count + 1",
+                    (agent, day, latency_bucket(duration_seconds)))
+        stages: dict[str, bool] = {}
+        for outcome in outcomes:
+            stages[outcome.stage] = stages.get(outcome.stage, True) and outcome.success
+            execute("INSERT INTO index_stage_item_days (agent, stage, stage_item, day, runs, failures) "
+                    "VALUES (?, ?, ?, ?, 1, ?) "
+                    "ON CONFLICT (agent, stage, stage_item, day) DO UPDATE SET runs = runs + 1, "
+                    "failures = failures + excluded.failures",
+                    (agent, outcome.stage, outcome.stage_item, day, 0 if outcome.success else 1))
+        for stage, stage_success in stages.items():
+            execute("INSERT INTO index_stage_days (agent, stage, day, runs, successes) "
+                    "VALUES (?, ?, ?, 1, ?) "
+                    "ON CONFLICT (agent, stage, day) DO UPDATE SET runs = runs + 1, "
+                    "successes = successes + excluded.successes",
+                    (agent, stage, day, 1 if stage_success else 0))
+
+    def get_agent_stats(self,
+                        agent: Union[str, None] = None,
+                        since: Union[str, None] = None,
+                        until: Union[str, None] = None) -> list[dict[str, Any]]:
+        """
+        :param agent: The agent, or None for all agents.
+        :param since: The first day, as YYYY-MM-DD, or None for no limit.
+        :param until: The last day, as YYYY-MM-DD, or None for no limit.
+        :return: The runs, success rate and latency percentiles of each agent, by agent.
+        """
+        where, params = ResultIndex.__where(agent=agent, since=since, until=until)
+        with self.__lock:
+            rows = self.__connection.execute(
+                f"SELECT agent, SUM(runs), SUM(successes) FROM index_agent_days{where} "
+                f"GROUP BY agent ORDER BY agent", params).fetchall()
+            buckets = self.__connection.execute(
+                f"SELECT agent, bucket, SUM(count) FROM index_latency_days{where} "
+                f"GROUP BY agent, bucket ORDER BY agent, bucket", params).fetchall()
+        latencies: dict[str, list[tuple[int, int]]] = {}
+        for row_agent, bucket, count in buckets:
+            latencies.setdefault(row_agent, []).append((bucket, count))
+        return [{'agent': row_agent,
+                 'runs': runs,
+                 'successes': successes,
+                 'success-rate': ResultIndex.__rate(successes, runs),
+                 'latency-seconds': ResultIndex.__percentiles(latencies.get(row_agent, []))}
+                for row_agent, runs, successes in rows]
+
+    def get_stage_stats(self,
+                        agent: Union[str, None] = None,
+                        since: Union[str, None] = None,
+                        until: Union[str, None] = None) -> list[dict[str, Any]]:
+        """
+        :return: The runs and success rate of each stage, by agent and stage.
+        """
+        where, params = ResultIndex.__where(agent=agent, since=since, until=until)
+        with self.__lock:
+            rows = self.__connection.execute(
+                f"SELECT agent, stage, SUM(runs), SUM(successes) FROM index_stage_days{where} "
+                f"GROUP BY agent, stage ORDER BY agent, stage", params).fetchall()
+        return [{'agent': row_agent, 'stage': stage, 'runs': runs, 'successes': successes,
+                 'success-rate': ResultIndex.__rate(successes, runs)}
+                for row_agent, stage, runs, successes in rows]
+
+    def get_failure_hotspots(self,
+                             agent: Union[str, None] = None,
+                             since: Union[str, None] = None,
+                             until: Union[str, None] = None,
+                             limit: int = 20,
+                             offset: int = 0) -> list[dict[str, Any]]:
+        """
+        :return: The stage items which failed most often, most failures first.
+        """
+        where, params = ResultIndex.__where(agent=agent, since=since, until=until)
+        with self.__lock:
+            rows = self.__connection.execute(
+                f"SELECT agent, stage, stage_item, SUM(runs), SUM(failures) AS f "
+                f"FROM index_stage_item_days{where} GROUP BY agent, stage, stage_item "
+                f"HAVING f > 0 ORDER BY f DESC, agent, stage, stage_item LIMIT ? OFFSET ?",
+                params + [limit, offset]).fetchall()
+        return [{'agent': row_agent, 'stage': stage, 'stage-item': stage_item, 'runs': runs,
+                 'failures': failures, 'failure-rate': ResultIndex.__rate(failures, runs)}
+                for row_agent, stage, stage_item, runs, failures in rows]
+
+    @staticmethod
+    def __where(agent: Union[str, None], since: Union[str, None], until: Union[str, None]) \
+            -> tuple[str, list[Any]]:
+        clauses, params = [], []
+        for clause, value in [('agent = ?', agent), ('day >= ?', since), ('day <= ?', until)]:
+            if value is not None:
+                clauses.append(clause)
+                params.append(value)
+        return (f" WHERE {' AND '.join(clauses)}" if clauses else ''), params
+
+    @staticmethod
+    def __rate(count: int, total: int) -> float:
+        return 0.0 if not total else round(count / total, 4)
+
+    @staticmethod
+    def __percentiles(buckets: list[tuple[int, int]]) -> dict[str, Union[float, None]]:
+        total = sum(count for _, count in buckets)
+        result: dict[str, Union[float, None]] = {}
+        for percentile in LATENCY_PERCENTILES:
+            value = None
+            cumulative = 0
+            for bucket, count in buckets:
+                cumulative += count
+                if cumulative * 100 >= percentile * total:
+                    value = latency_bucket_upper_bound(bucket)
+                    break
+            result[f'p{percentile}'] = value
+        return result
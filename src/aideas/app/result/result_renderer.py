@@ -0,0 +1,105 @@
+import json
+import logging
+from collections.abc import Iterable
+from enum import Enum, unique
+from typing import Any, Callable, Iterator
+
+from .result_set import ResultSet
+from ..action.action import Action
+from ..action.action_result import ActionResult
+
+logger = logging.getLogger(__name__)
+
+_HTML_SUCCESS = '<span style="color:green">SUCCESS</span>'
+_HTML_FAILURE = '<span style="color:red">FAILURE</span>'
+
+# Shortens the results, other than action results, as displayed in html
+_HTML_REPLACEMENTS = [("ActionResult(", "("),
+                      (", Action(", ", ("),
+                      (", result: None)", ")"),
+                      (", result: ResultSet(success-rate=0/0))", ")"),
+                      ("(success=True,", f'({_HTML_SUCCESS},'),
+                      ("(success=False,", f'({_HTML_FAILURE},')]
+
+
+@unique
+class ResultFormat(str, Enum):
+    HTML = 'html'
+    JSON = 'json'
+    TEXT = 'text'
+
+
+def render(result_set: ResultSet,
+           result_format: ResultFormat,
+           redact: Callable[[str], str] = str) -> Iterator[str]:
+    """
+    Render the result set a fragment at a time, walking it once, so that the whole output is
+    never held in memory, e.g. when streamed as a response.
+    :param result_set: The result set to render.
+    :param result_format: The format to render in.
+    :param redact: Redacts secrets from each key and result, as it is rendered.
+    :return: The fragments of the output.
+    """
+    if result_format == ResultFormat.HTML:
+        return render_html(result_set, redact)
+    if result_format == ResultFormat.JSON:
+        return render_json(result_set, redact)
+    return result_set.pretty_fragments(to_str=lambda value: redact(str(value)))
+
+
+def render_html(result_set: ResultSet, redact: Callable[[str], str] = str) -> Iterator[str]:
+    def to_html(value: Any) -> str:
+        if isinstance(value, ActionResult):
+            text = _action_result_to_html(value)
+        else:
+            text = str(value)
+            for old, new in _HTML_REPLACEMENTS:
+                text = text.replace(old, new)
+        # Replace new-line only after masking secrets
+        return redact(text).replace("\n", "<br/>")
+
+    return result_set.pretty_fragments("<br/>", "&emsp;&emsp;", to_str=to_html)
+
+
+def render_json(result_set: ResultSet, redact: Callable[[str], str] = str) -> Iterator[str]:
+    """
+    :return: The fragments of a JSON object, of the results by key, with action results as
+    returned by ``action_result_to_dict``.
+    """
+    yield '{'
+    for index, (key, value) in enumerate(tuple(result_set.items())):
+        yield f'{"," if index else ""}{json.dumps(redact(str(key)))}:'
+        if isinstance(value, ResultSet):
+            yield from render_json(value, redact)
+        elif isinstance(value, Iterable) and not isinstance(value, (str, dict)):
+            yield '['
+            for i, e in enumerate(tuple(value)):
+                yield f'{"," if i else ""}{_to_json(e, redact)}'
+            yield ']'
+        else:
+            yield _to_json(value, redact)
+    yield '}'
+
+
+def action_result_to_dict(result: ActionResult, redact: Callable[[str], str] = str) \
+        -> dict[str, Any]:
+    action = result.get_action()
+    return {'agent': action.get_agent_name(),
+            'stage': action.get_stage_id(),
+            'stage-item': action.get_stage_item_id(),
+            'action': action.get_name(),
+            'args': [redact(str(arg)) for arg in action.get_args()],
+            'success': result.is_success(),
+            'result': None if result.get_result() is None else redact(str(result.get_result()))}
+
+
+def _action_result_to_html(result: ActionResult) -> str:
+    action = str(result.get_action()).removeprefix(f'{Action.__name__}(')
+    return f'({_HTML_SUCCESS if result.is_success() else _HTML_FAILURE}, ({action}, ' \
+           f'result={result.get_result()})'
+
+
+def _to_json(value: Any, redact: Callable[[str], str]) -> str:
+    if isinstance(value, ActionResult):
+        return json.dumps(action_result_to_dict(value, redact))
+    return json.dumps(redact(str(value)))
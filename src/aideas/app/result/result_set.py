@@ -2,7 +2,7 @@ from collections import OrderedDict
 from collections.abc import Iterable
 import copy
 import logging
-from typing import Union, TypeVar, Callable
+from typing import Union, TypeVar, Callable, Iterator
 
 from ..action.action_result import ActionResult
 
@@ -18,6 +18,14 @@ RESULT = TypeVar('RESULT', bound=any)
 
 
 class ResultSet:
+    """
+    Results by key. The keys of failed results are kept up to date as results are added, so that
+    the success and failure counts are read without testing every result.
+
+    A result set which is the result of another, its parent, tells the parent when its success
+    may have changed, so that the parent re-tests that one result. A result changed other than
+    via this class, or its subclasses, is only re-tested when ``refresh`` is called.
+    """
     def __init__(self,
                  success_test: Callable[[RESULT], bool],
                  results: Union[dict[str, RESULT], None] = None):
@@ -26,8 +34,13 @@ class ResultSet:
             raise ValueError('success_test cannot be None')
         self.__success_test = success_test
         self.__results: OrderedDict[str, RESULT] = OrderedDict()
+        self.__failed_keys: set[str] = set()
+        self.__parents: list[tuple['ResultSet', str]] = []
         if results is not None:
-            self.__results.update(copy.deepcopy(results))
+            for key, value in copy.deepcopy(results).items():
+                self.__results[key] = value
+                self.__link(key, value)
+            self.refresh()
 
     def add_action_result(self, result: ActionResult) -> 'ResultSet':
         raise NotImplementedError('Please implement me')
@@ -62,9 +75,53 @@ class ResultSet:
             raise ValueError(f'Already added: {result_id}')
 
         existing = self.__results.get(result_id, None)
+        was_successful = self.is_successful()
         self.__results[result_id] = value
+        self.__link(result_id, value)
+        if not self.__success_test(value):
+            self.__failed_keys.add(result_id)
+        self.__notify_parents(was_successful)
         return existing
 
+    def __link(self, result_id: str, value: RESULT):
+        if isinstance(value, ResultSet):
+            value.__parents.append((self, result_id))
+
+    def _is_key_successful(self, result_id: str) -> bool:
+        return result_id not in self.__failed_keys
+
+    def _set_key_successful(self, result_id: str, success: bool):
+        """
+        Record the success of the result, after it was changed in place.
+        :param result_id: The key of the result which changed.
+        :param success: Whether the result, as changed, is successful.
+        """
+        if success is self._is_key_successful(result_id):
+            return
+        was_successful = self.is_successful()
+        if success:
+            self.__failed_keys.discard(result_id)
+        else:
+            self.__failed_keys.add(result_id)
+        self.__notify_parents(was_successful)
+
+    def __notify_parents(self, was_successful: bool):
+        if was_successful is self.is_successful():
+            return
+        for parent, result_id in self.__parents:
+            parent._set_key_successful(result_id, parent.__success_test(self))
+
+    def refresh(self) -> 'ResultSet':
+        """
+        Re-test every result, e.g. after results were changed other than via this class.
+        :return: This result set.
+        """
+        was_successful = self.is_successful()
+        self.__failed_keys = {key for key, result in self.__results.items()
+                              if not self.__success_test(result)}
+        self.__notify_parents(was_successful)
+        return self
+
     def close(self) -> 'ResultSet':
         self.__closed = True
         for result in self.__results.values():
@@ -88,11 +145,7 @@ class ResultSet:
         return self.size() - self.failure_count()
 
     def failure_count(self) -> int:
-        failures: int = 0
-        for result in self.__results.values():
-            if not self.__success_test(result):
-                failures += 1
-        return failures
+        return len(self.__failed_keys)
 
     def items(self):
         return self.__results.items()
@@ -101,26 +154,56 @@ class ResultSet:
         return self.__results
 
     def pretty_str(self, separator: str = "\n", tab: str = "\t", offset: int = 0) -> str:
-        output: str = ''
-        for key in self.keys():
-            output = f'{output}{separator}{tab * offset}{key}'
-            value = self.get(key)
+        return ''.join(self.pretty_fragments(separator, tab, offset))
+
+    def pretty_fragments(self,
+                         separator: str = "\n",
+                         tab: str = "\t",
+                         offset: int = 0,
+                         to_str: Callable[[object], str] = str) -> Iterator[str]:
+        """
+        Yield the lines of ``pretty_str``, one at a time, walking the results once in the order
+        they were added. Results added while walking may or may not be yielded.
+        :param separator: Precedes each line.
+        :param tab: Indents each line, once per level.
+        :param offset: The level of this result set.
+        :param to_str: Converts each key and result to a string, e.g. to redact secrets. Each
+            entry of a dict is converted as ``key=value``, so it is redacted along with its key.
+        :return: The lines, each preceded by the separator.
+        """
+        for key, value in tuple(self.__results.items()):
+            yield f'{separator}{tab * offset}{to_str(key)}'
             if isinstance(value, ResultSet):
-                output = f'{output}{value.pretty_str(separator, tab, offset + 1)}'
+                yield from value.pretty_fragments(separator, tab, offset + 1, to_str)
             elif isinstance(value, dict):
-                for k, v in value.items():
-                    output = f'{output}{separator}{tab * (offset + 1)}{k}={v}'
+                for k, v in tuple(value.items()):
+                    yield f'{separator}{tab * (offset + 1)}{to_str(f"{k}={v}")}'
             elif isinstance(value, Iterable):
-                for e in value:
-                    output = f'{output}{separator}{tab * (offset + 1)}{e}'
+                for e in tuple(value):
+                    yield f'{separator}{tab * (offset + 1)}{to_str(e)}'
             else:
-                output = f'{output}{separator}{tab * (offset + 1)}{value}'
-        return output
+                yield f'{separator}{tab * (offset + 1)}{to_str(value)}'
 
     def __required_not_closed(self):
         if self.__closed:
             raise ValueError('Cannot update result set when closed')
 
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        # Each parent links its results back to itself, when it is restored.
+        state['_ResultSet__parents'] = []
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self.__parents = []
+        for key, value in self.__results.items():
+            self.__link(key, value)
+        if '_ResultSet__failed_keys' not in state:
+            # Serialized before the keys of failed results were kept
+            self.__failed_keys = set()
+            self.refresh()
+
     def __eq__(self, other) -> bool:
         return self.__closed == other.__closed and self.__results == other.__results
 
@@ -143,6 +226,9 @@ class ElementResultSet(ResultSet):
         # We only set if the list is newly created, otherwise an exception will be thrown
         if len(result_list) == 1:
             self.set(stage_item_id, result_list)
+        else:
+            self._set_key_successful(
+                stage_item_id, self._is_key_successful(stage_item_id) and result.is_success())
         return self
 
     def get_action_result(self,
@@ -0,0 +1,322 @@
+import atexit
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Union
+
+from ..action.action import Action
+from ..action.action_result import ActionResult
+from ..env import get_output_dir
+from ..io.file import write_file_atomically
+from .result_index import ResultIndex, StageItemOutcome
+from .result_set import ElementResultSet, StageResultSet
+
+logger = logging.getLogger(__name__)
+
+# Increment when the schema, or the encoding of payloads, changes.
+SCHEMA_VERSION = 1
+
+# Payloads larger than this, once encoded, are stored as blobs.
+DEFAULT_BLOB_THRESHOLD = 4096
+
+_KIND_NONE = 'none'
+_KIND_JSON = 'json'
+_KIND_BYTES = 'bytes'
+_KIND_TEXT = 'text'
+
+
+class RunRecord:
+    def __init__(self,
+                 run_id: int,
+                 agent: str,
+                 success: bool,
+                 created_at: float,
+                 config_blob: Union[str, None] = None,
+                 duration_seconds: Union[float, None] = None):
+        self.run_id = run_id
+        self.agent = agent
+        self.success = success
+        self.created_at = created_at
+        self.config_blob = config_blob
+        self.duration_seconds = duration_seconds
+
+    def __str__(self) -> str:
+        return f'RunRecord(id={self.run_id}, agent={self.agent}, success={self.success})'
+
+
+class ResultRecord:
+    def __init__(self,
+                 run_id: int,
+                 agent: str,
+                 stage: str,
+                 stage_item: str,
+                 action: str,
+                 args: list,
+                 success: bool,
+                 created_at: float,
+                 load_result: Callable[[], Any]):
+        self.run_id = run_id
+        self.agent = agent
+        self.stage = stage
+        self.stage_item = stage_item
+        self.action = action
+        self.args = args
+        self.success = success
+        self.created_at = created_at
+        self.__load_result = load_result
+
+    def get_result(self) -> Any:
+        """
+        :return: The result of the action. Results stored as blobs are read only when asked for.
+        """
+        return self.__load_result()
+
+    def to_action_result(self) -> ActionResult:
+        action = Action(self.agent, self.stage, self.stage_item, self.action, self.args)
+        return ActionResult(action, self.success, self.get_result())
+
+    def __str__(self) -> str:
+        return (f'ResultRecord(run={self.run_id}, {self.agent}.{self.stage}.{self.stage_item}'
+                f'.{self.action}, success={self.success})')
+
+
+class BlobStore:
+    """
+    Content-addressed blobs, each in a file named by the sha256 of its content.
+    Identical content is stored once.
+    """
+    def __init__(self, dir_path: str):
+        self.__dir_path = dir_path
+
+    def put(self, content: bytes) -> str:
+        key = hashlib.sha256(content).hexdigest()
+        path = self.__path(key)
+        if not os.path.exists(path):
+            write_file_atomically(path, content)
+        return key
+
+    def get(self, key: str) -> bytes:
+        with open(self.__path(key), 'rb') as file:
+            return file.read()
+
+    def __path(self, key: str) -> str:
+        return os.path.join(self.__dir_path, key[:2], key)
+
+
+class ResultStore:
+    """
+    Stores the results of agent runs in a SQLite database, a row per action result, indexed by
+    agent, stage, date and success. Rows are only ever appended. Payloads too large for a row
+    are stored as content-addressed blobs, and read only when asked for.
+
+    Each run saved is also added to a ResultIndex, for stats over many runs.
+    """
+    def __init__(self, db_path: str, blobs_dir: str, blob_threshold: int = DEFAULT_BLOB_THRESHOLD):
+        if db_path != ':memory:':
+            db_dir = os.path.dirname(db_path)
+            if db_dir and not os.path.exists(db_dir):
+                os.makedirs(db_dir)
+        self.__db_path = db_path
+        self.__blobs = BlobStore(blobs_dir)
+        self.__blob_threshold = blob_threshold
+        self.__lock = threading.RLock()
+        self.__connection = sqlite3.connect(db_path, check_same_thread=False)
+        self.__index = ResultIndex(self.__connection, self.__lock)
+        with self.__lock, self.__connection:
+            if db_path != ':memory:':
+                self.__connection.execute("PRAGMA journal_mode=WAL")
+            version = self.__connection.execute("PRAGMA user_version").fetchone()[0]
+            if version > SCHEMA_VERSION:
+                raise ValueError(f"Result store: {db_path} has version: {version}, "
+                                 f"which is newer than supported: {SCHEMA_VERSION}")
+            self.__connection.execute(
+                "CREATE TABLE IF NOT EXISTS runs ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, agent TEXT NOT NULL, "
+                "success INTEGER NOT NULL, created_at REAL NOT NULL, config_blob TEXT, "
+                "duration REAL)")
+            self.__connection.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, run_id INTEGER NOT NULL, "
+                "agent TEXT NOT NULL, stage TEXT NOT NULL, stage_item TEXT NOT NULL, "
+                "action TEXT NOT NULL, args TEXT NOT NULL, success INTEGER NOT NULL, "
+                "created_at REAL NOT NULL, kind TEXT NOT NULL, payload BLOB, blob TEXT)")
+            for statement in [
+                "CREATE INDEX IF NOT EXISTS runs_agent ON runs (agent, created_at)",
+                "CREATE INDEX IF NOT EXISTS runs_success ON runs (success, created_at)",
+                "CREATE INDEX IF NOT EXISTS results_run ON results (run_id)",
+                "CREATE INDEX IF NOT EXISTS results_agent ON results (agent, stage, created_at)",
+                "CREATE INDEX IF NOT EXISTS results_success ON results (success, created_at)"]:
+                self.__connection.execute(statement)
+            self.__index.create_tables()
+            self.__connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def save(self,
+             agent_name: str,
+             result_set: StageResultSet,
+             config: Union[str, None] = None,
+             duration_seconds: Union[float, None] = None) -> RunRecord:
+        """
+        Save the results of a run of an agent.
+        :param agent_name: The name of the agent which was run.
+        :param result_set: The results of the run.
+        :param config: The config of the agent, for the run.
+        :param duration_seconds: How long the run took.
+        :return: The run which was saved.
+        """
+        created_at = time.time()
+        config_blob = None if config is None else self.__blobs.put(config.encode('utf-8'))
+        rows = []
+        outcomes: list[StageItemOutcome] = []
+        for stage_id, element_result_set in result_set.items():
+            for stage_item_id, action_results in element_result_set.items():
+                outcomes.append(StageItemOutcome(
+                    stage_id, stage_item_id, ElementResultSet.is_result_successful(action_results)))
+                for action_result in action_results:
+                    action: Action = action_result.get_action()
+                    kind, payload = self.__encode(action_result.get_result())
+                    blob = None
+                    if payload is not None and len(payload) > self.__blob_threshold:
+                        blob, payload = self.__blobs.put(payload), None
+                    rows.append((action.get_agent_name(), action.get_stage_id(),
+                                 action.get_stage_item_id(), action.get_name(),
+                                 json.dumps([str(e) for e in action.get_args()]),
+                                 1 if action_result.is_success() else 0,
+                                 created_at, kind, payload, blob))
+        success = result_set.is_successful()
+        with self.__lock, self.__connection:
+            cursor = self.__connection.execute(
+                "INSERT INTO runs (agent, success, created_at, config_blob, duration) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (agent_name, 1 if success else 0, created_at, config_blob, duration_seconds))
+            run_id = cursor.lastrowid
+            self.__connection.executemany(
+                "INSERT INTO results (run_id, agent, stage, stage_item, action, args, success, "
+                "created_at, kind, payload, blob) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(run_id, *row) for row in rows])
+            self.__index.add(agent_name, created_at, success, duration_seconds, outcomes)
+        logger.debug(f"Agent: {agent_name}, saved {len(rows)} results of run: {run_id}")
+        return RunRecord(run_id, agent_name, success, created_at, config_blob, duration_seconds)
+
+    def find_runs(self,
+                  agent: Union[str, None] = None,
+                  success: Union[bool, None] = None,
+                  since: Union[float, None] = None,
+                  until: Union[float, None] = None,
+                  limit: Union[int, None] = None,
+                  offset: int = 0) -> list[RunRecord]:
+        """
+        :return: The runs matching all the given criteria, most recent first.
+        """
+        where, params = ResultStore.__where(agent=agent, success=success, since=since, until=until)
+        sql = f"SELECT id, agent, success, created_at, config_blob, duration FROM runs{where} " \
+              f"ORDER BY created_at DESC, id DESC"
+        if limit is not None or offset:
+            sql, params = f"{sql} LIMIT ? OFFSET ?", params + [-1 if limit is None else limit, offset]
+        with self.__lock:
+            rows = self.__connection.execute(sql, params).fetchall()
+        return [RunRecord(row[0], row[1], row[2] == 1, row[3], row[4], row[5]) for row in rows]
+
+    def find_results(self,
+                     run_id: Union[int, None] = None,
+                     agent: Union[str, None] = None,
+                     stage: Union[str, None] = None,
+                     success: Union[bool, None] = None,
+                     since: Union[float, None] = None,
+                     until: Union[float, None] = None,
+                     limit: Union[int, None] = None) -> list[ResultRecord]:
+        """
+        :return: The action results matching all the given criteria, in the order saved.
+        """
+        where, params = ResultStore.__where(run_id=run_id, agent=agent, stage=stage,
+                                            success=success, since=since, until=until)
+        sql = f"SELECT run_id, agent, stage, stage_item, action, args, success, created_at, " \
+              f"kind, payload, blob FROM results{where} ORDER BY id"
+        if limit is not None:
+            sql, params = f"{sql} LIMIT ?", params + [limit]
+        with self.__lock:
+            rows = self.__connection.execute(sql, params).fetchall()
+        return [self.__to_result_record(row) for row in rows]
+
+    def load(self, run_id: int) -> StageResultSet:
+        """
+        :return: The results of the run, as they were when saved, but for payloads which were
+        not json, and are returned as text.
+        """
+        result_set = StageResultSet()
+        for record in self.find_results(run_id=run_id):
+            result_set.add_action_result(record.to_action_result())
+        return result_set
+
+    def get_index(self) -> ResultIndex:
+        return self.__index
+
+    def get_config(self, run: RunRecord) -> Union[str, None]:
+        return None if run.config_blob is None else self.__blobs.get(run.config_blob).decode('utf-8')
+
+    def close(self):
+        with self.__lock:
+            self.__connection.close()
+
+    def get_db_path(self) -> str:
+        return self.__db_path
+
+    def __to_result_record(self, row: tuple) -> ResultRecord:
+        kind, payload, blob = row[8], row[9], row[10]
+
+        def load_result() -> Any:
+            return ResultStore.__decode(kind, self.__blobs.get(blob) if blob else payload)
+
+        return ResultRecord(row[0], row[1], row[2], row[3], row[4], json.loads(row[5]),
+                            row[6] == 1, row[7], load_result)
+
+    @staticmethod
+    def __where(**criteria: Any) -> tuple[str, list[Any]]:
+        columns = {'run_id': 'run_id = ?', 'agent': 'agent = ?', 'stage': 'stage = ?',
+                   'success': 'success = ?', 'since': 'created_at >= ?', 'until': 'created_at < ?'}
+        clauses, params = [], []
+        for name, value in criteria.items():
+            if value is None:
+                continue
+            clauses.append(columns[name])
+            params.append((1 if value else 0) if name == 'success' else value)
+        return (f" WHERE {' AND '.join(clauses)}" if clauses else ''), params
+
+    @staticmethod
+    def __encode(result: Any) -> tuple[str, Union[bytes, None]]:
+        if result is None:
+            return _KIND_NONE, None
+        if isinstance(result, (bytes, bytearray)):
+            return _KIND_BYTES, bytes(result)
+        try:
+            return _KIND_JSON, json.dumps(result, separators=(',', ':')).encode('utf-8')
+        except (TypeError, ValueError):
+            return _KIND_TEXT, str(result).encode('utf-8')
+
+    @staticmethod
+    def __decode(kind: str, payload: Union[bytes, None]) -> Any:
+        if kind == _KIND_NONE or payload is None:
+            return None
+        if kind == _KIND_BYTES:
+            return bytes(payload)
+        if kind == _KIND_JSON:
+            return json.loads(payload)
+        return bytes(payload).decode('utf-8')
+
+
+__result_store: Union[ResultStore, None] = None
+__result_store_lock = threading.Lock()
+
+
+def get_result_store() -> ResultStore:
+    global __result_store
+    with __result_store_lock:
+        if __result_store is None:
+            results_dir = get_output_dir('results')
+            __result_store = ResultStore(os.path.join(results_dir, 'results.db'),
+                                         os.path.join(results_dir, 'blobs'))
+            atexit.register(__result_store.close)
+        return __result_store
@@ -1,7 +1,10 @@
+import copy
 import logging
+import threading
 
+from collections import ChainMap
 from enum import Enum
-from typing import Union, Any
+from typing import Callable, Union, Any
 
 from .action.action_result import ActionResult
 from .action.variable_parser import replace_all_variables
@@ -45,8 +48,33 @@ class RunContext:
         for k, v in self.__args.items():
             self.__args_formatted[RunContext._format_key(k)] = v
         self.__result_set: AgentResultSet = AgentResultSet()
+        self.__result_set_lock = threading.RLock()
+        self.__result_listeners: list[Callable[[ActionResult], None]] = []
+        self.__event_listeners: list[Callable[[str, dict[str, Any]], None]] = []
         self.__values = {}
 
+    def fork(self) -> 'RunContext':
+        """
+        Returns a context for use by one of several agents running at the same time.
+
+        The fork shares the args and the result set of this context. Values set on the fork are
+        only visible to the fork, until they are added to this context via ``join``.
+        :return: The forked context.
+        """
+        fork: RunContext = copy.copy(self)
+        fork.__values = ChainMap({}, self.__values)
+        return fork
+
+    def join(self, fork: 'RunContext') -> 'RunContext':
+        """
+        Adds the values set on a context created via ``fork`` to this context.
+        :param fork: The forked context.
+        :return: This context.
+        """
+        if isinstance(fork.__values, ChainMap) and fork.__values.maps[1] is self.__values:
+            self.__values.update(fork.__values.maps[0])
+        return self
+
     # TODO - Make blog agent an action and then remove this
     def get_language_codes_str(self) -> str:
         str_or_array = self.get_arg(RunArg.LANGUAGE_CODES, None)
@@ -61,7 +89,49 @@ class RunContext:
         return config
 
     def add_action_result(self, result: ActionResult) -> 'RunContext':
-        self.__result_set.add_action_result(result)
+        with self.__result_set_lock:
+            self.__result_set.add_action_result(result)
+            # Notified within the lock, so that listeners receive results in the order added
+            for listener in self.__result_listeners:
+                try:
+                    listener(result)
+                except Exception as ex:
+                    logger.warning(f"Error notifying result listener: {ex}")
+        return self
+
+    def add_result_listener(self, listener: Callable[[ActionResult], None]) -> 'RunContext':
+        """
+        Add a listener to be notified of each action result added to this context, or to any
+        context forked from it.
+        :param listener: The listener to add.
+        :return: This context.
+        """
+        self.__result_listeners.append(listener)
+        return self
+
+    def add_event_listener(self, listener: Callable[[str, dict[str, Any]], None]) -> 'RunContext':
+        """
+        Add a listener to be notified of each event published to this context, or to any
+        context forked from it.
+        :param listener: Called with the name and data of each event.
+        :return: This context.
+        """
+        self.__event_listeners.append(listener)
+        return self
+
+    def publish_event(self, name: str, data: dict[str, Any]) -> 'RunContext':
+        """
+        Notify the event listeners of an event, e.g. of part of an action's result, as soon as it
+        is known, rather than when the action is done.
+        :param name: The name of the event.
+        :param data: The data of the event.
+        :return: This context.
+        """
+        for listener in self.__event_listeners:
+            try:
+                listener(name, data)
+            except Exception as ex:
+                logger.warning(f"Error notifying event listener: {ex}")
         return self
 
     def get_element_results(self,
@@ -117,6 +187,20 @@ class RunContext:
     def get_current_url(self, result_if_none: str = None) -> str:
         return self.get(CURRENT_URL, result_if_none)
 
+    def get_values(self) -> dict[str, Any]:
+        """
+        :return: A copy of the values of this context, including those of the context forked.
+        """
+        return dict(self.__values)
+
+    def get_local_values(self) -> dict[str, Any]:
+        """
+        :return: A copy of the values set on this context, excluding those of the context forked,
+        if this context was created via ``fork``.
+        """
+        values = self.__values
+        return dict(values.maps[0] if isinstance(values, ChainMap) else values)
+
     def set(self, key: str, value:  Any) -> Union[Any, None]:
         result = self.get(key)
         self.__values[key] = value
@@ -1,19 +1,28 @@
-import pickle
-import shutil
+import multiprocessing
+import os
 import logging
+import threading
 import time
-from concurrent.futures import Future, ThreadPoolExecutor
-from typing import Union, TypeVar, Callable, Any
+from concurrent.futures import ProcessPoolExecutor, wait
+from enum import Enum, unique
+from multiprocessing.managers import SyncManager
+from typing import Union, TypeVar, Callable, Any, Iterator
 
-from pyu.io.file import create_file
 from .action.action import Action
 from .action.action_result import ActionResult
 from .agent.agent_factory import AgentFactory
-from .env import get_cached_results_file
+from .agent.agent_scheduler import AgentScheduler
+from .config import AgentConfig
+from .env import Env, get_env_value, get_output_dir
 from .io.logging import SecretsMaskingLogFilter
+from .result.result_renderer import action_result_to_dict, render_html
 from .result.result_set import AgentResultSet, StageResultSet
+from .result.result_store import get_result_store
 from .config_loader import ConfigLoader
 from .run_context import RunContext
+from .task_events import TaskEvents
+from .task_queue import TaskPriority, TaskQueue, TaskQueueFullError
+from .task_store import TaskRecord, TaskStore
 
 logger = logging.getLogger(__name__)
 
@@ -30,9 +39,17 @@ _STATUS_SKIPPED = "SKIPPED"
 _STATUS_STOPPED = "STOPPED"
 
 
+@unique
+class TaskBackend(str, Enum):
+    THREAD = 'thread'
+    PROCESS = 'process'
+
+
 class Task:
     def __init__(self):
         self.__status = _STATUS_PENDING
+        self.__listeners: list[Callable[['Task'], None]] = []
+        self.__events = TaskEvents()
 
     def start(self) -> RESULT:
         try:
@@ -40,23 +57,62 @@ class Task:
                 logger.error(
                     "Task already running" if self.is_running() else "Task already completed")
                 return None
-            self.__status = _STATUS_RUNNING
+            self._set_status(_STATUS_RUNNING)
             result = self._start()
-            self.__status = _STATUS_SUCCESS
+            self._set_status(_STATUS_SUCCESS)
             return result
         except Exception as ex:
-            self.__status = _STATUS_FAILURE
+            self._set_status(_STATUS_FAILURE)
             logger.exception("Task error", ex)
+        finally:
+            if self.is_completed():
+                self.__events.close()
+
+    def add_listener(self, listener: Callable[['Task'], None]) -> 'Task':
+        """
+        Add a listener to be notified whenever the status or progress of this task changes.
+        :param listener: The listener to add.
+        :return: This task.
+        """
+        self.__listeners.append(listener)
+        return self
+
+    def _notify_listeners(self):
+        for listener in self.__listeners:
+            try:
+                listener(self)
+            except Exception as ex:
+                logger.warning(f"Error notifying task listener: {ex}")
+
+    def get_events(self) -> TaskEvents:
+        """
+        :return: The events of this task, e.g. status changes, to be watched as they happen.
+        """
+        return self.__events
+
+    def _set_status(self, status: str):
+        self.__status = status
+        self.__events.publish('status', {'status': status})
+        self._notify_listeners()
 
     def _start(self) -> RESULT:
         raise NotImplementedError()
 
     def to_html(self) -> str:
+        return ''.join(self.iter_html())
+
+    def iter_html(self) -> Iterator[str]:
+        """
+        :return: The fragments of the html of this task, which ``to_html`` joins.
+        """
         raise NotImplementedError()
 
+    def get_result_set(self) -> AgentResultSet:
+        return AgentResultSet()
+
     def stop(self) -> 'Task':
         if self.is_started():
-            self.__status = _STATUS_STOPPED
+            self._set_status(_STATUS_STOPPED)
         return self
 
     def is_started(self) -> bool:
@@ -74,6 +130,12 @@ class Task:
     def get_status(self) -> str:
         return self.__status
 
+    def get_agent_names(self) -> list[str]:
+        return []
+
+    def get_progress(self) -> dict[str, str]:
+        return {}
+
 
 class AgentTask(Task):
     secrets_masking_log_filter = SecretsMaskingLogFilter()
@@ -98,14 +160,25 @@ class AgentTask(Task):
         self.__agent_states = {}
         for name in run_context.get_agent_names():
             self.__agent_states[name] = _STATUS_PENDING
-        self.__current_agent = None
+        self.__running_agents: list[str] = []
+        self.__lock = threading.RLock()
+        run_context.add_result_listener(
+            lambda result: self.get_events().publish(
+                'result', action_result_to_dict(result, AgentTask.secrets_masking_log_filter.redact)))
+        run_context.add_event_listener(
+            lambda name, data: self.get_events().publish(name, AgentTask.__redact(data)))
+
+    @staticmethod
+    def __redact(data: dict[str, Any]) -> dict[str, Any]:
+        redact = AgentTask.secrets_masking_log_filter.redact
+        return {k: redact(v) if isinstance(v, str) else v for k, v in data.items()}
 
     def stop(self) -> 'AgentTask':
         super().stop()
         if self.is_started():
             return self
-        if self.__current_agent is not None:
-            self.__add_agent_state(self.__current_agent, _STATUS_STOPPED)
+        for agent_name in list(self.__running_agents):
+            self.__add_agent_state(agent_name, _STATUS_STOPPED)
         logger.debug("Since stop has been requested, will close result set while task is running, "
                      "though this may lead to an error.")
         self.__run_context.get_result_set().close()
@@ -114,26 +187,22 @@ class AgentTask(Task):
     def get_run_context(self) -> RunContext:
         return self.__run_context
 
-    def get_progress(self):
-        return {**self.__agent_states}
+    def get_agent_factory(self) -> AgentFactory:
+        return self.__agent_factory
 
-    def to_html(self) -> str:
-        state_str = "<table><thead><tr><th>Agent</th><th>State</th></tr></thead><tbody>"
-        for agent_name, state in self.__agent_states.items():
-            state_str += f"<tr><td>{agent_name}</td><td>{state}</td></tr>"
-        state_str += "</tbody></table>"
-        result_str = (self.__run_context.get_result_set().pretty_str("\n", "&emsp;&emsp;")
-                      .replace("ActionResult(", "(")
-                      .replace(", Action(", ", (")
-                      .replace(", result: None)", ")")
-                      .replace(", result: ResultSet(success-rate=0/0))", ")")
-                      .replace("(success=True,", '(<span style="color:green">SUCCESS</span>,')
-                      .replace("(success=False,", '(<span style="color:red">FAILURE</span>,'))
-
-        result_str = AgentTask.secrets_masking_log_filter.redact(result_str)
-
-        # Replace new-line only after masking secrets
-        return state_str + result_str.replace("\n", "<br/>")
+    def get_agent_names(self) -> list[str]:
+        return self.__run_context.get_agent_names()
+
+    def get_progress(self) -> dict[str, str]:
+        with self.__lock:
+            return {**self.__agent_states}
+
+    def get_result_set(self) -> AgentResultSet:
+        return self.__run_context.get_result_set()
+
+    def iter_html(self) -> Iterator[str]:
+        yield _progress_to_html(self.get_progress())
+        yield from render_html(self.get_result_set(), AgentTask.secrets_masking_log_filter.redact)
 
     def _start(self) -> AgentResultSet:
 
@@ -142,135 +211,464 @@ class AgentTask(Task):
         failed = False
         continue_on_error = self.__run_context.get_run_config().is_continue_on_error()
 
-        try:
-            for agent_name in self.__run_context.get_agent_names():
+        def may_proceed() -> bool:
+            return self.is_stopped() is False and (failed is False or continue_on_error is True)
 
-                if self.is_stopped() is True or (failed is True and continue_on_error is False):
-                    self.__add_agent_state(agent_name, _STATUS_SKIPPED)
-                    continue
+        def skip_agent(agent_name: str):
+            self.__add_agent_state(agent_name, _STATUS_SKIPPED)
 
-                try:
+        def run_agent(agent_name: str):
+            nonlocal failed
+            if self.__run_agent(agent_name, continue_on_error) is False:
+                failed = True
 
-                    self.__current_agent = agent_name
+        try:
+            self.__create_scheduler().run(run_agent, skip_agent, may_proceed)
+            return self.__run_context.get_result_set()
+        finally:
+            self.__run_context.get_result_set().close()
 
-                    self.__add_agent_state(agent_name, _STATUS_LOADING)
+    def __create_scheduler(self) -> AgentScheduler:
+        config_loader: ConfigLoader = self.__agent_factory.get_config_loader()
+        agent_configs: dict[str, AgentConfig] = {}
+        for agent_name in self.__run_context.get_agent_names():
+            agent_configs[agent_name] = AgentConfig(
+                config_loader.get_agent_config_with_unreplaced_variables(agent_name))
+        max_workers = self.__run_context.get_app_config().get_agent_max_parallel()
+        return AgentScheduler.of_configs(agent_configs, max_workers)
+
+    def __run_agent(self, agent_name: str, continue_on_error: bool) -> bool:
+        """
+        Run the agent on a fork of the run context.
+        :param agent_name: The name of the agent to run.
+        :param continue_on_error: Whether to continue with other agents after an error.
+        :return: True if the agent ran without errors, otherwise False.
+        """
+        run_context: RunContext = self.__run_context.fork()
+        try:
 
-                    agent = self.__agent_factory.get_agent(agent_name)
+            with self.__lock:
+                self.__running_agents.append(agent_name)
 
-                    self.__add_agent_state(agent_name, _STATUS_RUNNING)
+            self.__add_agent_state(agent_name, _STATUS_LOADING)
 
-                    stage_result_set = agent.run(self.__run_context)
+            agent = self.__agent_factory.get_agent(agent_name)
 
-                    agent_state = _STATUS_SUCCESS if stage_result_set.is_successful() \
-                        else _STATUS_PARTIAL
+            self.__add_agent_state(agent_name, _STATUS_RUNNING)
 
-                    self.__add_agent_state(agent_name, agent_state)
+            start_time = time.time()
+            stage_result_set = agent.run(run_context)
+            duration_seconds = time.time() - start_time
 
-                    self.__save_agent_results(agent_name, stage_result_set)
+            agent_state = _STATUS_SUCCESS if stage_result_set.is_successful() \
+                else _STATUS_PARTIAL
 
-                except Exception as ex:
+            self.__add_agent_state(agent_name, agent_state)
 
-                    failed = True
+            self.__save_agent_results(agent_name, stage_result_set, duration_seconds)
 
-                    self.__add_agent_state(agent_name, _STATUS_FAILURE)
+            return True
 
-                    logger.exception(ex)
+        except Exception as ex:
 
-                    if continue_on_error:
-                        result = self.__run_context.get_stage_results(agent_name)
-                        if not result or result.is_empty():
-                            action = Action.of(agent_name, "*", "*", "*", self.__run_context)
-                            self.__run_context.add_action_result(
-                                ActionResult.failure(action, "Error"))
-            return self.__run_context.get_result_set()
+            self.__add_agent_state(agent_name, _STATUS_FAILURE)
+
+            logger.exception(ex)
+
+            if continue_on_error:
+                result = self.__run_context.get_stage_results(agent_name)
+                if not result or result.is_empty():
+                    action = Action.of(agent_name, "*", "*", "*", self.__run_context)
+                    self.__run_context.add_action_result(
+                        ActionResult.failure(action, "Error"))
+            return False
         finally:
-            self.__run_context.get_result_set().close()
+            self.__run_context.join(run_context)
+            with self.__lock:
+                self.__running_agents.remove(agent_name)
 
     def __add_agent_state(self, agent_name: str, state: str):
-        self.__agent_states[agent_name] = self.__agent_states[agent_name] + ' >> ' + state
+        with self.__lock:
+            self.__agent_states[agent_name] = self.__agent_states[agent_name] + ' >> ' + state
+            self.get_events().publish(
+                'progress', {'agent': agent_name, 'progress': self.__agent_states[agent_name]})
+        self._notify_listeners()
 
-    def __save_agent_results(self, agent_name, result_set: StageResultSet):
+    def __save_agent_results(self, agent_name, result_set: StageResultSet, duration_seconds: float):
         """
-        Save the result to a file. (e.g. twitter/2021/01/01_12-34-56-uuid.pkl)
-        Save a success file if the result is successful. (e.g. 01_12-34-56-uuid.pkl.success)
+        Save the result, along with the config of the agent, to the result store.
         :param agent_name: The name of the agent whose result is to be saved.
         :param result_set: The result to be saved.
+        :param duration_seconds: How long the agent took to run.
         :return: None
         """
-        name: str = "result-set"
-        object_path: str = get_cached_results_file(agent_name, f'{name}.pkl')
+        config_loader: ConfigLoader = self.__agent_factory.get_config_loader()
+        config_path = config_loader.get_agent_config_path(agent_name)
+        with open(config_path) as file:
+            config = file.read()
+        run = get_result_store().save(agent_name, result_set, config, duration_seconds)
+        logger.debug(f"Agent: {agent_name}, result saved as run: {run.run_id}")
 
-        create_file(object_path)
-        with open(object_path, 'wb') as file:
-            pickle.dump(result_set, file)
 
-        if result_set.is_successful():
-            success_path = f'{object_path}.success'
-            create_file(success_path)
-        logger.debug(f"Agent: {agent_name}, result saved to: {object_path}")
+class StoredTask(Task):
+    """
+    A task loaded from the task store, e.g. after a restart. It can only be viewed.
+    """
+    def __init__(self, record: TaskRecord):
+        super().__init__()
+        self.__record = record
+        # Tasks which were not completed before the restart, will never be.
+        status = record.status if record.status in _COMPLETED_STATUSES else _STATUS_STOPPED
+        self._set_status(status)
+        self.get_events().close()
 
-        config_loader: ConfigLoader = self.__agent_factory.get_config_loader()
-        config_path = config_loader.get_agent_config_path(agent_name)
-        shutil.copy2(config_path, f'{object_path[:object_path.index(name)]}config.yaml')
+    def _start(self) -> RESULT:
+        raise ValueError(f"A stored task cannot be started: {self.__record.task_id}")
+
+    def get_agent_names(self) -> list[str]:
+        return list(self.__record.agents)
+
+    def get_progress(self) -> dict[str, str]:
+        return {**self.__record.progress}
+
+    def iter_html(self) -> Iterator[str]:
+        yield _progress_to_html(self.get_progress())
+
+
+class ProcessTask(Task):
+    """
+    Runs an AgentTask in a worker process, so that concurrent tasks do not contend for the GIL.
+
+    Progress and stop requests are exchanged with the worker process via a multiprocessing
+    manager. Progress is polled, and published as it changes. The AgentResultSet is returned,
+    pickled, when the worker process is done.
+    """
+    @staticmethod
+    def of(task: AgentTask) -> 'ProcessTask':
+        config_loader: ConfigLoader = task.get_agent_factory().get_config_loader()
+        run_context: RunContext = task.get_run_context()
+        return ProcessTask(config_loader.get_config_path(),
+                           config_loader.get_variable_source(),
+                           run_context.get_app_config().to_dict(),
+                           run_context.get_run_config().to_dict(),
+                           task.get_progress())
+
+    def __init__(self,
+                 config_path: str,
+                 variable_source: dict[str, Any],
+                 app_config: dict[str, Any],
+                 run_config: dict[str, Any],
+                 progress: dict[str, str]):
+        super().__init__()
+        self.__args = (config_path, _to_builtin(variable_source),
+                       _to_builtin(app_config), _to_builtin(run_config))
+        manager = _get_process_manager()
+        self.__progress = manager.dict(progress)
+        self.__stop_event = manager.Event()
+        self.__result_set = AgentResultSet()
+
+    def stop(self) -> 'ProcessTask':
+        super().stop()
+        self.__stop_event.set()
+        return self
+
+    def get_agent_names(self) -> list[str]:
+        return list(self.get_progress().keys())
+
+    def get_progress(self) -> dict[str, str]:
+        try:
+            return dict(self.__progress)
+        except Exception as ex:
+            # The manager is gone, e.g. during shutdown
+            logger.debug(f"Failed to read task progress. {ex}")
+            return {}
+
+    def get_result_set(self) -> AgentResultSet:
+        return self.__result_set
+
+    def iter_html(self) -> Iterator[str]:
+        yield _progress_to_html(self.get_progress())
+        yield from render_html(self.__result_set, AgentTask.secrets_masking_log_filter.redact)
+
+    def _start(self) -> AgentResultSet:
+        future = _get_process_executor().submit(
+            _run_agent_task_in_process, *self.__args, self.__progress, self.__stop_event)
+        # The worker process updates the shared progress as it goes, which we poll, to publish
+        published: dict[str, str] = {}
+        while not wait([future], timeout=_PROGRESS_POLL_SECONDS).done:
+            published = self.__publish_progress(published)
+        self.__result_set = future.result()
+        self.__publish_progress(published)
+        return self.__result_set
+
+    def __publish_progress(self, published: dict[str, str]) -> dict[str, str]:
+        """
+        Publish the progress of each agent, which changed since last published.
+        :param published: The progress last published.
+        :return: The progress published.
+        """
+        progress = self.get_progress()
+        changed = {k: v for k, v in progress.items() if published.get(k) != v}
+        for agent_name, agent_progress in changed.items():
+            self.get_events().publish('progress', {'agent': agent_name, 'progress': agent_progress})
+        if changed:
+            self._notify_listeners()
+        return progress
+
+
+def _run_agent_task_in_process(config_path: str,
+                               variable_source: dict[str, Any],
+                               app_config: dict[str, Any],
+                               run_config: dict[str, Any],
+                               progress: dict[str, str],
+                               stop_event: threading.Event) -> AgentResultSet:
+    """Runs in the worker process. Arguments and return value are exchanged via pickling."""
+    agent_factory = AgentFactory(ConfigLoader(config_path, variable_source), app_config)
+    task = AgentTask(agent_factory, RunContext(app_config, run_config))
+    task.add_listener(lambda t: progress.update(t.get_progress()))
+
+    done = threading.Event()
+
+    def stop_when_requested():
+        # Polled, so that this thread ends with the task, rather than outlive it in the worker
+        while not done.is_set():
+            if stop_event.wait(_STOP_POLL_SECONDS):
+                task.stop()
+                return
+
+    threading.Thread(target=stop_when_requested, name='task-stop', daemon=True).start()
+
+    try:
+        result = task.start()
+    finally:
+        done.set()
+    progress.update(task.get_progress())
+    return result if result is not None else task.get_run_context().get_result_set()
+
+
+def _to_builtin(value: Any) -> Any:
+    """Convert e.g. yaml mappings and sequences to dicts and lists, for pickling."""
+    if isinstance(value, dict):
+        return {k: _to_builtin(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_builtin(e) for e in value]
+    return value
+
+
+_COMPLETED_STATUSES = [_STATUS_SUCCESS, _STATUS_FAILURE, _STATUS_STOPPED]
+
+_PROGRESS_POLL_SECONDS = 0.5
+_STOP_POLL_SECONDS = 0.5
+
+
+def _progress_to_html(progress: dict[str, str]) -> str:
+    state_str = "<table><thead><tr><th>Agent</th><th>State</th></tr></thead><tbody>"
+    for agent_name, state in progress.items():
+        state_str += f"<tr><td>{agent_name}</td><td>{state}</td></tr>"
+    state_str += "</tbody></table>"
+    return state_str
 
 
 __tasks: dict[str, Task] = {}
-__futures: dict[str, Future] = {}
-__executor = ThreadPoolExecutor(max_workers=10)
+__tasks_lock = threading.RLock()
+__task_store: Union[TaskStore, None] = None
+__task_queue: Union[TaskQueue, None] = None
+__process_manager: Union[SyncManager, None] = None
+__process_executor: Union[ProcessPoolExecutor, None] = None
+
+
+def init_task_store(db_path: Union[str, None] = None) -> TaskStore:
+    """
+    Open the task store, and load the tasks stored before the last shutdown.
+    :param db_path: The path to the SQLite database. Defaults to tasks.db in the output dir.
+    :return: The task store.
+    """
+    global __task_store
+    if db_path is None:
+        db_path = os.path.join(get_output_dir('tasks'), 'tasks.db')
+    with __tasks_lock:
+        if __task_store is not None:
+            __task_store.close()
+        __task_store = TaskStore(db_path)
+        for record in __task_store.load_all():
+            task = StoredTask(record)
+            if task.get_status() != record.status:
+                __task_store.update(record.task_id, task.get_status(), record.progress)
+            __tasks[record.task_id] = task
+        logger.debug(f"Loaded {len(__tasks)} tasks from: {db_path}")
+    return __task_store
 
 
 def init_tasks_cleanup(should_stop: Callable[[], bool], interval_seconds: int):
     def cleanup():
-        if should_stop():
-            logger.debug("Stopping tasks cleanup")
-            return
-        remove_completed_tasks()
-        time.sleep(interval_seconds)
-        __executor.submit(cleanup)
+        while not should_stop():
+            remove_completed_tasks()
+            time.sleep(interval_seconds)
+        logger.debug("Stopping tasks cleanup")
 
-    __executor.submit(cleanup)
+    threading.Thread(target=cleanup, name='tasks-cleanup', daemon=True).start()
 
 
-def add_task(task_id: str, task: Task):
-    __tasks[task_id] = task
+def add_task(task_id: str, task: Task, priority: TaskPriority = TaskPriority.INTERACTIVE):
+    with __tasks_lock:
+        __tasks[task_id] = task
+        if __task_store is not None:
+            __task_store.save(TaskRecord(task_id, task.get_agent_names(), task.get_status(),
+                                         task.get_progress(), int(priority)))
+            task.add_listener(lambda t: __update_stored_task(task_id, t))
     return task
 
 
-def submit_task(task_id: str, task: Task) -> Future:
-    add_task(task_id, task)
-    return __executor.submit(task.start)
+def submit_task(task_id: str,
+                task: Task,
+                priority: TaskPriority = TaskPriority.INTERACTIVE,
+                backend: Union[TaskBackend, None] = None) -> Task:
+    """
+    Add the task, and queue it to be run.
+    :param task_id: The id of the task.
+    :param task: The task to run.
+    :param priority: The priority of the task. Interactive tasks are run ahead of batch tasks.
+    :param backend: Where to run the task. Defaults to environment variable TASK_BACKEND.
+    :return: The task that was added. For the process backend, this is a ProcessTask.
+    :raises TaskQueueFullError: If the task queue is saturated.
+    """
+    if backend is None:
+        backend = TaskBackend(get_env_value(Env.TASK_BACKEND))
+    if backend == TaskBackend.PROCESS and isinstance(task, AgentTask):
+        task = ProcessTask.of(task)
+    task_queue = __get_task_queue()
+    if task_queue.is_full(priority):
+        raise TaskQueueFullError(
+            f"Too many tasks queued ({task_queue.size()}), please try again later")
+    add_task(task_id, task, priority)
+    try:
+        task_queue.submit(task_id, priority)
+    except TaskQueueFullError as ex:
+        __remove_task(task_id)
+        # The task was rejected, so there is no state of it to keep
+        if __task_store is not None:
+            __task_store.remove(task_id)
+        raise ex
+    return task
 
 
 def get_task(task_id: str, result_if_none: Union[Task, None] = None) -> Union[Task, None]:
-    return __tasks.get(task_id, result_if_none)
+    task = __tasks.get(task_id)
+    if task is not None:
+        return task
+    # Completed tasks are evicted from memory, but kept in the store, for a while
+    store = __task_store
+    record = None if store is None else store.load(task_id)
+    return result_if_none if record is None else StoredTask(record)
 
 
 def require_task(task_id: str) -> Task:
-    return __tasks[task_id]
+    task = get_task(task_id)
+    if task is None:
+        raise KeyError(task_id)
+    return task
 
 
 def get_task_ids() -> list[str]:
-    return list(__tasks.keys())
+    with __tasks_lock:
+        return list(__tasks.keys())
 
 
 def shutdown():
+    global __task_queue, __task_store, __process_executor, __process_manager
     try:
         tasks = {**__tasks}
         logger.debug(f"Shutting down {len(tasks)} tasks")
-        for task_id in get_task_ids():
-            stop_task(task_id)
-        __executor.shutdown(wait=False, cancel_futures=True)
+        # We stop the tasks but keep them, so that they are available after a restart.
+        for task in tasks.values():
+            task.stop()
+        if __task_queue is not None:
+            __task_queue.shutdown()
+            __task_queue = None
+        if __process_executor is not None:
+            __process_executor.shutdown(wait=False, cancel_futures=True)
+            __process_executor = None
+        if __process_manager is not None:
+            __process_manager.shutdown()
+            __process_manager = None
+        if __task_store is not None:
+            __task_store.close()
+            __task_store = None
         logger.debug(f"Done shutting down {len(tasks)} tasks")
     except Exception as ex:
         logger.exception(ex)
 
 
 def stop_task(task_id: str) -> Task:
-    return __tasks.pop(task_id).stop()
+    task = __remove_task(task_id).stop()
+    store = __task_store
+    if not task.is_started() and store is not None:
+        # Stopped while queued, so it will never be run, and its status never updated
+        store.update(task_id, _STATUS_STOPPED, task.get_progress())
+    return task
 
 
 def remove_completed_tasks():
+    """
+    Evict completed tasks from memory. Their state and progress are kept in the task store,
+    which is pruned of tasks older than TASK_STORE_MAX_AGE_SECONDS, or beyond TASK_STORE_MAX_COUNT,
+    other than those still queued or running.
+    """
     logger.debug("Removing completed tasks")
-    for task_id, task in __tasks.items():
+    for task_id, task in list(__tasks.items()):
         if task.is_completed():
-            __tasks.pop(task_id)
+            __remove_task(task_id)
+    store = __task_store
+    if store is not None:
+        removed = store.prune(float(get_env_value(Env.TASK_STORE_MAX_AGE_SECONDS)),
+                              int(get_env_value(Env.TASK_STORE_MAX_COUNT)),
+                              get_task_ids())
+        logger.debug(f"Pruned {removed} tasks from the task store")
+
+
+def __remove_task(task_id: str) -> Task:
+    with __tasks_lock:
+        return __tasks.pop(task_id)
+
+
+def __update_stored_task(task_id: str, task: Task):
+    store = __task_store
+    if store is not None:
+        store.update(task_id, task.get_status(), task.get_progress())
+
+
+def __run_task(task_id: str):
+    task = get_task(task_id)
+    if task is None or task.is_started():
+        # The task was stopped or removed while queued
+        logger.debug(f"Will not run task: {task_id}, it is no longer queued.")
+        return
+    task.start()
+
+
+def __get_task_queue() -> TaskQueue:
+    global __task_queue
+    with __tasks_lock:
+        if __task_queue is None:
+            __task_queue = TaskQueue(__run_task,
+                                     int(get_env_value(Env.TASK_QUEUE_SIZE)),
+                                     int(get_env_value(Env.TASK_WORKERS)))
+        return __task_queue
+
+
+def _get_process_manager() -> SyncManager:
+    global __process_manager
+    with __tasks_lock:
+        if __process_manager is None:
+            __process_manager = multiprocessing.get_context('spawn').Manager()
+        return __process_manager
+
+
+def _get_process_executor() -> ProcessPoolExecutor:
+    global __process_executor
+    with __tasks_lock:
+        if __process_executor is None:
+            __process_executor = ProcessPoolExecutor(
+                max_workers=int(get_env_value(Env.TASK_WORKERS)),
+                mp_context=multiprocessing.get_context('spawn'))
+        return __process_executor
@@ -0,0 +1,110 @@
+import itertools
+import json
+import logging
+import threading
+from collections import deque
+from typing import Any, Iterator, Union
+
+logger = logging.getLogger(__name__)
+
+# The most recent events kept per task, for watchers which fall behind or reconnect.
+MAX_EVENTS = 1000
+
+# How long a watcher waits for an event, before it is sent a heartbeat.
+HEARTBEAT_SECONDS = 15
+
+
+class TaskEvent:
+    def __init__(self, event_id: int, name: str, data: dict[str, Any]):
+        self.event_id = event_id
+        self.name = name
+        self.data = data
+
+    def to_sse(self) -> str:
+        """
+        :return: This event, formatted as a server-sent event.
+        """
+        return f"id: {self.event_id}\nevent: {self.name}\ndata: {json.dumps(self.data, default=str)}\n\n"
+
+    def __str__(self) -> str:
+        return f'{self.__class__.__name__}(id={self.event_id}, name={self.name}, data={self.data})'
+
+
+class TaskEvents:
+    """
+    The events of a task, e.g. status changes and action results, in one bounded log.
+
+    All watchers of a task read the same log, each from its own position, so publishing an
+    event is the same work however many watchers there are. Event ids increase by one, so a
+    watcher which reconnects resumes after the last event id it received.
+    """
+    def __init__(self, max_events: int = MAX_EVENTS):
+        self.__events: deque[TaskEvent] = deque(maxlen=max_events)
+        self.__last_event_id = 0
+        self.__closed = False
+        self.__condition = threading.Condition()
+
+    def publish(self, name: str, data: dict[str, Any]) -> Union[TaskEvent, None]:
+        """
+        Add an event, and wake all watchers.
+        :param name: The name of the event, e.g. status.
+        :param data: The data of the event. Must be JSON serializable.
+        :return: The event added, or None if no more events are accepted.
+        """
+        with self.__condition:
+            if self.__closed:
+                logger.debug(f"Events closed, will not publish: {name}")
+                return None
+            self.__last_event_id += 1
+            event = TaskEvent(self.__last_event_id, name, data)
+            self.__events.append(event)
+            self.__condition.notify_all()
+            return event
+
+    def close(self):
+        """
+        Accept no more events. Watchers stop, once they have received the events published.
+        """
+        with self.__condition:
+            self.__closed = True
+            self.__condition.notify_all()
+
+    def is_closed(self) -> bool:
+        return self.__closed
+
+    def get_last_event_id(self) -> int:
+        return self.__last_event_id
+
+    def get_events(self, after_id: int = 0) -> list[TaskEvent]:
+        """
+        :param after_id: The id of the last event already received, or 0 for none.
+        :return: The events after the given id, which are still kept.
+        """
+        with self.__condition:
+            if not self.__events or after_id >= self.__last_event_id:
+                return []
+            first_id = self.__events[0].event_id
+            return list(itertools.islice(self.__events, max(0, after_id + 1 - first_id), None))
+
+    def watch(self, after_id: int = 0, heartbeat_seconds: float = HEARTBEAT_SECONDS) \
+            -> Iterator[Union[TaskEvent, None]]:
+        """
+        Yield events as they are published, until closed.
+        :param after_id: The id of the last event already received, or 0 for none.
+        :param heartbeat_seconds: How long to wait for an event, before yielding None.
+        :return: The events, with None whenever none was published within the heartbeat.
+        """
+        while True:
+            with self.__condition:
+                self.__condition.wait_for(
+                    lambda: self.__closed or self.__last_event_id > after_id, heartbeat_seconds)
+                events = self.get_events(after_id)
+                closed = self.__closed
+            if not events and closed:
+                return
+            if not events:
+                yield None
+                continue
+            for event in events:
+                yield event
+            after_id = events[-1].event_id
@@ -0,0 +1,103 @@
+import itertools
+import logging
+import queue
+import threading
+from enum import IntEnum, unique
+from typing import Callable, Union
+
+logger = logging.getLogger(__name__)
+
+
+@unique
+class TaskPriority(IntEnum):
+    """Tasks of a lower value are run before those of a higher value."""
+    INTERACTIVE = 0
+    BATCH = 1
+
+
+class TaskQueueFullError(Exception):
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.message = args[0]
+
+
+class TaskQueue:
+    """
+    A bounded queue of task ids, consumed by a fixed number of worker threads.
+
+    Interactive tasks are run ahead of batch tasks. Batch tasks are only admitted while the
+    queue is less than 3/4 full, so that interactive tasks may still be submitted under a
+    burst of batch tasks.
+    """
+    def __init__(self,
+                 run_task: Callable[[str], None],
+                 max_size: int = 50,
+                 workers: int = 10):
+        if max_size < 1:
+            raise ValueError(f'max_size must be at least 1, found: {max_size}')
+        if workers < 1:
+            raise ValueError(f'workers must be at least 1, found: {workers}')
+        self.__run_task = run_task
+        self.__max_size = max_size
+        self.__max_batch_size = max(1, max_size - max(1, max_size // 4))
+        self.__queue = queue.PriorityQueue()
+        self.__lock = threading.Lock()
+        self.__sequence = itertools.count()
+        self.__queued = 0
+        self.__shutdown = False
+        self.__workers = [threading.Thread(
+            target=self.__work, name=f'task-worker-{i}', daemon=True) for i in range(workers)]
+        for worker in self.__workers:
+            worker.start()
+
+    def submit(self, task_id: str, priority: TaskPriority = TaskPriority.INTERACTIVE):
+        """
+        Add the task id to the queue.
+        :param task_id: The id of the task to run.
+        :param priority: The priority of the task.
+        :return: None
+        :raises TaskQueueFullError: If the queue has no room for tasks of the priority.
+        """
+        with self.__lock:
+            if self.__shutdown:
+                raise TaskQueueFullError("Task queue is shut down")
+            limit = self.__max_size if priority == TaskPriority.INTERACTIVE \
+                else self.__max_batch_size
+            if self.__queued >= limit:
+                raise TaskQueueFullError(
+                    f"Too many tasks queued ({self.__queued}), please try again later")
+            self.__queued += 1
+            self.__queue.put((int(priority), next(self.__sequence), task_id))
+
+    def size(self) -> int:
+        return self.__queued
+
+    def is_full(self, priority: TaskPriority = TaskPriority.INTERACTIVE) -> bool:
+        limit = self.__max_size if priority == TaskPriority.INTERACTIVE else self.__max_batch_size
+        return self.__queued >= limit
+
+    def shutdown(self, wait: bool = False, timeout: Union[float, None] = None):
+        with self.__lock:
+            if self.__shutdown:
+                return
+            self.__shutdown = True
+        for _ in self.__workers:
+            # Sorts after all tasks
+            self.__queue.put((len(TaskPriority), next(self.__sequence), None))
+        if wait:
+            for worker in self.__workers:
+                worker.join(timeout)
+
+    def __work(self):
+        while True:
+            _, _, task_id = self.__queue.get()
+            if task_id is None:
+                return
+            with self.__lock:
+                self.__queued -= 1
+                if self.__shutdown:
+                    continue
+            try:
+                self.__run_task(task_id)
+            except Exception:
+                logger.exception(f"Error running task: {task_id}")
@@ -0,0 +1,129 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Union, Any
+
+logger = logging.getLogger(__name__)
+
+
+class TaskRecord:
+    def __init__(self,
+                 task_id: str,
+                 agents: list[str],
+                 status: str,
+                 progress: dict[str, Any],
+                 priority: int = 0,
+                 created_at: float = None,
+                 updated_at: float = None):
+        self.task_id = task_id
+        self.agents = agents
+        self.status = status
+        self.progress = progress
+        self.priority = priority
+        self.created_at = time.time() if created_at is None else created_at
+        self.updated_at = self.created_at if updated_at is None else updated_at
+
+    def __str__(self) -> str:
+        return f'TaskRecord(id={self.task_id}, status={self.status}, agents={self.agents})'
+
+
+class TaskStore:
+    """
+    Stores the state and progress of tasks in a SQLite database, so that they survive a restart.
+    """
+    def __init__(self, db_path: str):
+        if db_path != ':memory:':
+            db_dir = os.path.dirname(db_path)
+            if db_dir and not os.path.exists(db_dir):
+                os.makedirs(db_dir)
+        self.__db_path = db_path
+        self.__lock = threading.RLock()
+        self.__connection = sqlite3.connect(db_path, check_same_thread=False)
+        with self.__lock, self.__connection:
+            self.__connection.execute(
+                "CREATE TABLE IF NOT EXISTS tasks ("
+                "id TEXT PRIMARY KEY, agents TEXT NOT NULL, status TEXT NOT NULL, "
+                "progress TEXT NOT NULL, priority INTEGER NOT NULL, "
+                "created_at REAL NOT NULL, updated_at REAL NOT NULL)")
+
+    def save(self, record: TaskRecord) -> TaskRecord:
+        with self.__lock, self.__connection:
+            self.__connection.execute(
+                "INSERT OR REPLACE INTO tasks "
+                "(id, agents, status, progress, priority, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (record.task_id, json.dumps(record.agents), record.status,
+                 json.dumps(record.progress), record.priority,
+                 record.created_at, record.updated_at))
+        return record
+
+    def update(self, task_id: str, status: str, progress: dict[str, Any]) -> bool:
+        """
+        Update the status and progress of a task, if the task is stored.
+        :param task_id: The id of the task to update.
+        :param status: The new status of the task.
+        :param progress: The new progress of the task.
+        :return: True if the task was stored and hence updated, otherwise False.
+        """
+        with self.__lock, self.__connection:
+            cursor = self.__connection.execute(
+                "UPDATE tasks SET status = ?, progress = ?, updated_at = ? WHERE id = ?",
+                (status, json.dumps(progress), time.time(), task_id))
+            return cursor.rowcount > 0
+
+    def load(self, task_id: str, result_if_none: Union[TaskRecord, None] = None) \
+            -> Union[TaskRecord, None]:
+        with self.__lock:
+            row = self.__connection.execute(
+                "SELECT id, agents, status, progress, priority, created_at, updated_at "
+                "FROM tasks WHERE id = ?", (task_id,)).fetchone()
+        return result_if_none if row is None else TaskStore.__to_record(row)
+
+    def load_all(self) -> list[TaskRecord]:
+        with self.__lock:
+            rows = self.__connection.execute(
+                "SELECT id, agents, status, progress, priority, created_at, updated_at "
+                "FROM tasks ORDER BY created_at").fetchall()
+        return [TaskStore.__to_record(row) for row in rows]
+
+    def remove(self, task_id: str) -> bool:
+        with self.__lock, self.__connection:
+            cursor = self.__connection.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+            return cursor.rowcount > 0
+
+    def prune(self, max_age_seconds: float, max_count: int, keep_task_ids: list[str]) -> int:
+        """
+        Remove the tasks, other than those to keep, which were last updated longer ago than the
+        maximum age, or are not among the most recently updated, up to the maximum count.
+        Tasks of any status are removed, e.g. those left pending, or running, by a restart.
+        :param max_age_seconds: The maximum age of a task.
+        :param max_count: The maximum number of tasks to keep, other than those to keep.
+        :param keep_task_ids: The tasks which are never removed, e.g. those queued or running.
+        :return: The number of tasks removed.
+        """
+        placeholders = ', '.join('?' * len(keep_task_ids))
+        with self.__lock, self.__connection:
+            removed = self.__connection.execute(
+                f"DELETE FROM tasks WHERE id NOT IN ({placeholders}) AND updated_at < ?",
+                (*keep_task_ids, time.time() - max_age_seconds)).rowcount
+            removed += self.__connection.execute(
+                f"DELETE FROM tasks WHERE id NOT IN ({placeholders}) AND id NOT IN ("
+                f"SELECT id FROM tasks WHERE id NOT IN ({placeholders}) "
+                f"ORDER BY updated_at DESC LIMIT ?)",
+                (*keep_task_ids, *keep_task_ids, max_count)).rowcount
+        return removed
+
+    def close(self):
+        with self.__lock:
+            self.__connection.close()
+
+    def get_db_path(self) -> str:
+        return self.__db_path
+
+    @staticmethod
+    def __to_record(row: tuple) -> TaskRecord:
+        return TaskRecord(row[0], json.loads(row[1]), row[2], json.loads(row[3]),
+                          row[4], row[5], row[6])
@@ -1,6 +1,5 @@
-import uuid
 import re
-from re import Match
+from functools import lru_cache
 
 
 def list_from_object(value: object) -> list[str]:
@@ -82,64 +81,60 @@ def split_preserving_quotes(text: str, separator: str = ' ', remove_quotes: bool
     """
     if not text:
         return ['']
+    # Copied, as callers may modify the list
+    return list(_split_preserving_quotes(text, separator, remove_quotes))
 
-    replacements = {}
 
-    text = _replace_all_list_format_strings(text, replacements)
+# A list format string, e.g. ['a', "b c"], is not split, and quotes within it are not checked.
+_LIST_FORMAT_STRING = r'\[[^]]*]'
 
-    result_list = []
-    current = ""
-    in_single_quotes = False
-    in_double_quotes = False
-    i = 0
-
-    while i < len(text):
-        char = text[i]
-
-        # Handle quote escaping
-        if char == '"' and not in_single_quotes:
-            in_double_quotes = not in_double_quotes
-            current += char
-        elif char == "'" and not in_double_quotes:
-            in_single_quotes = not in_single_quotes
-            current += char
-        elif char == separator and not in_single_quotes and not in_double_quotes:
-            # We found a separator outside of quotes
-            result_list.append(current)
-            current = ""
-            # Skip consecutive separators
-            while i + 1 < len(text) and text[i + 1] == separator:
-                i += 1
-        else:
-            current += char
-
-        i += 1
-
-    # Add the last part
-    result_list.append(current)
-
-    result_list = __handle_special_case_of_only_separators(text, result_list, separator)
+_QUOTES = frozenset(['"', "'"])
 
-    result_list = __check_and_remove_quotes(result_list, remove_quotes)
 
-    return _return_all_list_format_strings(result_list, replacements)
+@lru_cache(maxsize=1024)
+def _get_split_patterns(separator: str) -> tuple[re.Pattern, re.Pattern, re.Pattern]:
+    """
+    :return: The patterns of what ends a scan outside of quotes, in double quotes and in single quotes.
+    """
+    # Only a separator of one char is split on, and a quote which is also the separator is a quote.
+    if len(separator) == 1 and separator not in _QUOTES:
+        outside = re.compile(f'{_LIST_FORMAT_STRING}|["\']|{re.escape(separator)}+')
+    else:
+        outside = re.compile(f'{_LIST_FORMAT_STRING}|["\']')
+    return outside, re.compile(f'{_LIST_FORMAT_STRING}|"'), re.compile(f"{_LIST_FORMAT_STRING}|'")
 
 
-def _replace_all_list_format_strings(text: str, replacements: dict[str, str]) -> str:
-    def get_replacement(match: Match) -> str:
-        replacement = str(uuid.uuid4().hex)
-        replacements[replacement] = match.group()
-        return replacement
+@lru_cache(maxsize=256)
+def _split_preserving_quotes(text: str, separator: str, remove_quotes: bool) -> tuple[str, ...]:
+    # Scan from one quote, separator or list format string to the next, rather than by char,
+    # and within quotes straight to the closing quote.
+    outside, in_double_quotes, in_single_quotes = _get_split_patterns(separator)
+    pattern = outside
+    result_list = []
+    start = 0
+    match = pattern.search(text)
+    while match:
+        matched = match.group()
+        char = matched[0]
+        if char == '[' and matched.endswith(']'):
+            # A list format string is a part of the current token
+            pass
+        elif char == '"':
+            pattern = in_double_quotes if pattern is outside else outside
+        elif char == "'":
+            pattern = in_single_quotes if pattern is outside else outside
+        else:
+            # We found one or more separators outside of quotes
+            result_list.append(text[start:match.start()])
+            start = match.end()
+        match = pattern.search(text, match.end())
 
-    # both r'\[.*?]' and r'\[[^]]*]' work; compiler prefers later
-    return re.sub(r'\[[^]]*]', get_replacement, text)
+    # Add the last part
+    result_list.append(text[start:])
 
+    result_list = __handle_special_case_of_only_separators(text, result_list, separator)
 
-def _return_all_list_format_strings(target: list, replacements: dict[str, str]) -> list:
-    for replacement, original in replacements.items():
-        for idx, e in enumerate(target):
-            target[idx] = e.replace(replacement, original)
-    return target
+    return tuple(__check_and_remove_quotes(result_list, remove_quotes))
 
 
 def __handle_special_case_of_only_separators(text: str, result: list, separator: str) -> list:
@@ -163,7 +158,7 @@ def __check_and_remove_quote(part: str, quote: str, remove_quotes: bool = True)
             return part[1:-1] if remove_quotes else part
         else:
             if any(part.endswith(ending) for ending in endings_allowed_after_quote):
-                return part.replace(quote, "") if remove_quotes else part
+                return __remove_quote(part, quote) if remove_quotes else part
             else:
                 raise ValueError(f'Invalid value, missing closing quote for: {part}')
     else:
@@ -171,3 +166,11 @@ def __check_and_remove_quote(part: str, quote: str, remove_quotes: bool = True)
             raise ValueError(f'Invalid value, missing opening quote for: {part}')
         else:
             return part
+
+
+def __remove_quote(part: str, quote: str) -> str:
+    # Quotes within list format strings are left as they are
+    if '[' not in part:
+        return part.replace(quote, "")
+    return re.sub(f'{_LIST_FORMAT_STRING}|{quote}',
+                  lambda match: '' if match.group() == quote else match.group(), part)
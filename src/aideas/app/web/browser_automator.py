@@ -4,10 +4,12 @@ from enum import unique
 
 from typing import Callable, Union
 
+from pyu.io.variable_parser import contains_variable
 from selenium.webdriver.remote.webelement import WebElement
 
 from .element_selector import ElementSelector
-from .webdriver_creator import WEB_DRIVER, WebDriverCreator
+from .webdriver_creator import WEB_DRIVER
+from .webdriver_pool import get_webdriver_pool
 from ..action.action import Action
 from ..action.action_handler import ActionHandler
 from ..action.browser_action_handler import BrowserActionId, BrowserActionHandler
@@ -106,7 +108,8 @@ class BrowserAutomator(Automator):
            agent_config: dict[str, any] = None,
            run_stages: Callable[[RunContext, OrderedDict[str, [Name]]], None] = None) \
             -> 'BrowserAutomator':
-        web_driver = WebDriverCreator.create(agent_name, BrowserConfig(agent_config.get('browser', {})))
+        web_driver = get_webdriver_pool().lease(
+            agent_name, BrowserConfig(agent_config.get('browser', {})))
         timeout_seconds = BrowserAutomator.get_agent_timeout(app_config, agent_config)
         element_selector = ElementSelector.of(web_driver, agent_name, timeout_seconds)
         action_handler = ElementActionHandler(element_selector, timeout_seconds)
@@ -131,7 +134,7 @@ class BrowserAutomator(Automator):
 
     def quit(self):
         super().quit()
-        self.__webdriver.quit()
+        get_webdriver_pool().release(self.__webdriver)
 
     def with_element_selector(self, element_selector: ElementSelector) -> 'BrowserAutomator':
         clone: BrowserAutomator = self.clone()
@@ -150,6 +153,8 @@ class BrowserAutomator(Automator):
                         run_context: RunContext) -> ElementResultSet:
         self.__load_page(config, stage, run_context)
 
+        self.__locate_elements(config, stage, run_context)
+
         return super().act_on_elements(config, stage, run_context)
 
     def stage_may_proceed(self,
@@ -172,6 +177,61 @@ class BrowserAutomator(Automator):
 
         run_context.set_current_url(link)
 
+    def __locate_elements(self, config: AgentConfig, stage: Name, run_context: RunContext):
+        """
+        Locate the elements of the stage items in a single round trip to the browser, so that
+        each is subsequently selected using the query which located it.
+
+        Only stage items whose queries have no variables are located. Others may refer to values,
+        e.g. of the context, which are only available once the preceding items are acted on.
+        """
+        search_configs: list[SearchConfigs] = []
+        for stage_item in config.stage_item_names(stage):
+            target_config = config.get(ConfigPath.of(stage, stage_item))
+            if not isinstance(target_config, dict):
+                continue
+            item_search_configs = SearchConfigs.of(target_config)
+            if not BrowserAutomator.__is_locatable(item_search_configs):
+                continue
+            path = ConfigPath.of(stage, stage_item).agent_str_path_simplified(self.get_agent_name())
+            search_configs.append(self.__element_selector.rank_queries(
+                item_search_configs, BrowserAutomator.__get_stats_key(path)))
+        if not search_configs:
+            return
+        try:
+            self.__element_selector.locate_all(search_configs)
+        except Exception as ex:
+            # Each element is still selected, when its stage item is acted on
+            logger.warning(f"Failed to locate elements of stage: {stage}, {ex}")
+
+    @staticmethod
+    def __is_locatable(search_configs: SearchConfigs) -> bool:
+        if search_configs.search_for() is None:
+            return False
+        for search_config in (search_configs.search_for(), search_configs.search_from()):
+            if search_config is not None and any(
+                    contains_variable(query) for query in search_config.get_queries()):
+                return False
+        return True
+
+    def __get_search_configs(self,
+                             target_config: dict[str, any],
+                             config_path: ConfigPath,
+                             run_context: RunContext) -> SearchConfigs:
+        path: list[str] = config_path.agent_str_path_simplified(self.get_agent_name())
+
+        def transform(text: str) -> str:
+            return text if not path else str(get_run_arg_replacement(path, text, run_context))
+
+        search_configs = SearchConfigs.of(target_config).transform_queries(transform)
+        return self.__element_selector.rank_queries(
+            search_configs, BrowserAutomator.__get_stats_key(path))
+
+    @staticmethod
+    def __get_stats_key(path: Union[list[str], None]) -> Union[str, None]:
+        # agent/stage/stage-item
+        return None if not path else '/'.join(path)
+
     def _select_target(self,
                        target_config: dict[str, any],
                        config_path: ConfigPath,
@@ -180,15 +240,13 @@ class BrowserAutomator(Automator):
         if not timeout:
             timeout = self._get_timeout(target_config)
 
-        path: list[str] = config_path.agent_str_path_simplified(self.get_agent_name())
-
-        def transform(text: str) -> str:
-            return text if not path else str(get_run_arg_replacement(path, text, run_context))
-
-        search_configs: SearchConfigs = SearchConfigs.of(target_config).transform_queries(transform)
+        search_configs: SearchConfigs = self.__get_search_configs(
+            target_config, config_path, run_context)
 
         return None if not search_configs or not search_configs.search_for() \
-            else self.__element_selector.with_timeout(timeout).select_element(search_configs)
+            else self.__element_selector.with_timeout(timeout).select_element(
+                search_configs, BrowserAutomator.__get_stats_key(
+                    config_path.agent_str_path_simplified(self.get_agent_name())))
 
     def get_element_selector(self) -> ElementSelector:
         return self.__element_selector
@@ -13,6 +13,7 @@ from selenium.webdriver.support.wait import WebDriverWait, D
 
 from .browser_cookie_store import BrowserCookieStore
 from .reloadable_web_element import ReloadableWebElement
+from .selector_stats import SelectorStatsStore, get_selector_stats_store
 from ..config import parse_query, SearchBy, SearchConfig, SearchConfigs
 from ..env import get_cookies_file
 
@@ -20,6 +21,96 @@ logger = logging.getLogger(__name__)
 
 INTERVAL: int = 2
 
+POLL_INTERVAL: float = 0.5
+
+# Evaluates groups of XPath queries in the page, in a single round trip to the browser.
+# For each group, returns: [index of the first query matching a displayed and enabled element,
+# the element, true], or failing that: [index of the first query matching an element,
+# the element, false], or failing that: [-1, null, false]
+_LOCATE_BY_XPATHS_SCRIPT = """
+const groups = arguments[0];
+const root = arguments[1] || document;
+const withElements = arguments[2];
+function select(query) {
+  try {
+    const node = document.evaluate(query, root, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null)
+      .singleNodeValue;
+    return node && node.nodeType === Node.ELEMENT_NODE ? node : null;
+  } catch (e) {
+    return null;
+  }
+}
+function isClickable(element) {
+  const displayed = element.offsetWidth > 0 || element.offsetHeight > 0
+    || element.getClientRects().length > 0;
+  return displayed && !element.disabled;
+}
+return groups.map(function (queries) {
+  let present = -1;
+  let presentElement = null;
+  for (let i = 0; i < queries.length; i++) {
+    const element = select(queries[i]);
+    if (!element) {
+      continue;
+    }
+    if (isClickable(element)) {
+      return [i, withElements ? element : null, true];
+    }
+    if (present < 0) {
+      present = i;
+      presentElement = element;
+    }
+  }
+  return [present, withElements ? presentElement : null, false];
+});
+"""
+
+# Searches the DOM, and the shadow roots within it, for elements having the given attributes.
+# Attribute values match if they contain the given value. For each group of attribute queries,
+# returns: [index of the first query matching an element, the element, true],
+# or failing that: [-1, null, false]
+_LOCATE_BY_SHADOW_ATTRIBUTES_SCRIPT = """
+const groups = arguments[0];
+const root = arguments[1] || document;
+const withElements = arguments[2];
+function hasAttributes(element, attributes) {
+  for (const name in attributes) {
+    let value = element.getAttribute(name);
+    if (value === null && name in element) {
+      value = element[name];
+    }
+    if (value === null || value === undefined || String(value).indexOf(attributes[name]) < 0) {
+      return false;
+    }
+  }
+  return true;
+}
+function find(elements, attributes) {
+  for (const element of elements) {
+    if (hasAttributes(element, attributes)) {
+      return element;
+    }
+    if (element.shadowRoot) {
+      const found = find(element.shadowRoot.querySelectorAll('*'), attributes);
+      if (found) {
+        return found;
+      }
+    }
+  }
+  return null;
+}
+return groups.map(function (queries) {
+  const elements = root.querySelectorAll('*');
+  for (let i = 0; i < queries.length; i++) {
+    const element = find(elements, queries[i]);
+    if (element) {
+      return [i, withElements ? element : null, true];
+    }
+  }
+  return [-1, null, false];
+});
+"""
+
 
 class ElementNotFoundError(Exception):
     pass
@@ -29,22 +120,55 @@ class ElementSelector:
     @classmethod
     def of(cls, webdriver, domain: str, wait_timeout_seconds: float = 20) -> 'ElementSelector':
         cookie_store = BrowserCookieStore(webdriver, get_cookies_file(domain))
-        return cls(webdriver, wait_timeout_seconds, cookie_store)
+        return cls(webdriver, wait_timeout_seconds, cookie_store,
+                   selector_stats=get_selector_stats_store())
 
     def __init__(self,
                  webdriver: WebDriver,
                  wait_timeout_seconds: float,
-                 browser_cookie_store: BrowserCookieStore):
+                 browser_cookie_store: BrowserCookieStore,
+                 preferred_query_indices: Union[dict[tuple[str, ...], int], None] = None,
+                 selector_stats: Union[SelectorStatsStore, None] = None):
         self.__webdriver = webdriver
         self.__wait_timeout_seconds = wait_timeout_seconds
         self.__browser_cookie_store = browser_cookie_store
+        # The index of the query which last located an element, keyed by the queries.
+        self.__preferred_query_indices = {} if preferred_query_indices is None \
+            else preferred_query_indices
+        # Hits, misses and latency of each query, persisted across runs.
+        self.__selector_stats = selector_stats
 
     def with_timeout(self, timeout: float) -> 'ElementSelector':
         if timeout == self.__wait_timeout_seconds:
             return self
-        return self.__class__(self.__webdriver, timeout, self.__browser_cookie_store)
-
-    def select_element(self, search_configs: SearchConfigs) -> WebElement:
+        return self.__class__(self.__webdriver, timeout, self.__browser_cookie_store,
+                              self.__preferred_query_indices, self.__selector_stats)
+
+    def rank_queries(self, search_configs: SearchConfigs, stats_key: str) -> SearchConfigs:
+        """
+        Order the search-for queries, most successful first, as recorded across runs.
+        :param search_configs: The search configs whose search-for queries are to be ordered.
+        :param stats_key: The key of the recorded stats, e.g. agent/stage/stage-item.
+        :return: The search configs.
+        """
+        search_for = None if not search_configs else search_configs.search_for()
+        if self.__selector_stats is None or not stats_key or search_for is None:
+            return search_configs
+        try:
+            search_for.order_queries(self.__selector_stats.rank(stats_key, search_for.get_queries()))
+        except Exception as ex:
+            logger.debug(f'Failed to rank queries of: {stats_key}, {ex}')
+        return search_configs
+
+    def select_element(self,
+                       search_configs: SearchConfigs,
+                       stats_key: Union[str, None] = None) -> WebElement:
+        """
+        :param search_configs: The search configs of the element to select.
+        :param stats_key: If provided, the hits, misses and latency of the search-for queries
+        are recorded under this key, e.g. agent/stage/stage-item.
+        :return: The selected element.
+        """
         self.validate_search_inputs(search_configs)
 
         search_from = search_configs.search_from()
@@ -57,15 +181,49 @@ class ElementSelector:
             if root is None:
                 raise ValueError(f'search-from is not valid: {search_from}')
 
+        # XPaths are not evaluated in the page, relative to a root within a shadow DOM.
+        xpath_in_page: bool = not search_from or search_from.get_search_by() == SearchBy.XPATH
+
         def load_element(attempts: int = 0) -> WebElement:
             if attempts > 0:
                 sleep(INTERVAL)
-            return self.__select_first_element(root, search_configs.search_for())
+            return self.__select_first_element(
+                root, search_configs.search_for(), xpath_in_page, stats_key)
 
         element = load_element()
 
         return ReloadableWebElement(element, load_element, self.__wait_timeout_seconds)
 
+    def locate_all(self, search_configs: list[SearchConfigs]) -> list[int]:
+        """
+        Locate the elements of many search configs, e.g. those of a stage, in a single round
+        trip to the browser. The index of the query which located each element is preferred,
+        when the element is subsequently selected.
+
+        Only XPath queries, without a search-from, are located. Others are not.
+        :param search_configs: The search configs to locate.
+        :return: For each search config, the index of the first of its queries which located
+        an element, or -1 if no element was located.
+        """
+        groups: list[list[str]] = []
+        positions: list[int] = []
+        for i, search_config in enumerate(search_configs):
+            if ElementSelector.__is_locatable_in_page(search_config):
+                positions.append(i)
+                groups.append(list(search_config.search_for().get_queries()))
+
+        result = [-1] * len(search_configs)
+        if not groups:
+            return result
+
+        located = self.__webdriver.execute_script(_LOCATE_BY_XPATHS_SCRIPT, groups, None, False)
+        for position, queries, (index, _, _) in zip(positions, groups, located):
+            result[position] = index
+            if index > -1:
+                self.__preferred_query_indices[tuple(queries)] = index
+        logger.debug(f'Located: {result}')
+        return result
+
     def load_page(self, link: str) -> bool:
         self.validate_link(link)
 
@@ -96,7 +254,66 @@ class ElementSelector:
     def get_browser_cookie_store(self):
         return self.__browser_cookie_store
 
-    def __select_first_element(self, root: D, search_config: SearchConfig) -> WebElement:
+    def __select_first_element(self,
+                               root: D,
+                               search_config: SearchConfig,
+                               xpath_in_page: bool = True,
+                               stats_key: Union[str, None] = None) -> WebElement:
+        search_by = search_config.get_search_by()
+        if search_by == SearchBy.SHADOW_ATTRIBUTE_IN_PAGE or (
+                xpath_in_page and search_by == SearchBy.XPATH):
+            return self.__select_first_element_in_page(root, search_config, stats_key)
+        return self.__select_first_element_by_query(root, search_config, stats_key)
+
+    def __select_first_element_in_page(self,
+                                       root: D,
+                                       search_config: SearchConfig,
+                                       stats_key: Union[str, None] = None) -> WebElement:
+        """
+        Evaluate all the queries in the page, in a single round trip to the browser,
+        until one of them matches a clickable element, or we time out. On timing out, we
+        settle for the first query which matches any element.
+        """
+        search_by = search_config.get_search_by()
+        queries: list[str] = search_config.get_queries()
+        if len(queries) == 0:
+            raise ValueError(f'No queries found in: {search_config}')
+        key = tuple(queries)
+        preferred: int = self.__preferred_query_indices.get(key, 0)
+        if 0 < preferred < len(queries):
+            search_config.reorder_queries(preferred)
+            queries = search_config.get_queries()
+        if search_by == SearchBy.SHADOW_ATTRIBUTE_IN_PAGE:
+            script, args = _LOCATE_BY_SHADOW_ATTRIBUTES_SCRIPT, [parse_query(q) for q in queries]
+        else:
+            script, args = _LOCATE_BY_XPATHS_SCRIPT, queries
+        context = None if root is self.__webdriver else root
+        start_time = datetime.now()
+        while True:
+            index, element, clickable = self.__webdriver.execute_script(
+                script, [args], context, True)[0]
+            time_spent: float = (datetime.now() - start_time).total_seconds()
+            timed_out: bool = time_spent + POLL_INTERVAL > self.__wait_timeout_seconds
+            if index > -1 and (clickable or timed_out):
+                self.__preferred_query_indices[key] = key.index(queries[index])
+                self.__record(stats_key, [(queries[index], time_spent)], queries[:index])
+                search_config.reorder_queries(index)
+                logger.debug(f'Found element using: {search_by} = {queries[index]}')
+                return element
+            if timed_out:
+                break
+            sleep(POLL_INTERVAL)
+
+        self.__record(stats_key, [], queries)
+
+        error_msg: str = (f"Failed to select element using: {search_by} = {queries}, "
+                          f"current url: {self.current_url()}.")
+        raise ElementNotFoundError(error_msg)
+
+    def __select_first_element_by_query(self,
+                                        root: D,
+                                        search_config: SearchConfig,
+                                        stats_key: Union[str, None] = None) -> WebElement:
         search_by = search_config.get_search_by()
         queries = search_config.get_queries()
         if len(queries) == 0:
@@ -116,6 +333,8 @@ class ElementSelector:
                 selected = self.__select_element(root, search_by, query, time_left)
 
                 if selected is not None:
+                    latency: float = (datetime.now() - start_time).total_seconds()
+                    self.__record(stats_key, [(query, latency)], queries[:index])
                     search_config.reorder_queries(index)
                     logger.debug(f'Found element using: {search_by} = {query}')
                     return selected
@@ -124,10 +343,19 @@ class ElementSelector:
                 exception = ex
                 continue
 
+        self.__record(stats_key, [], queries)
         error_msg: str = (f"Failed to select element using: {search_by} = {queries}, "
                           f"current url: {self.current_url()}.")
         raise ElementNotFoundError(error_msg) from exception
 
+    def __record(self, stats_key: Union[str, None], hits: list[tuple[str, float]], misses: list[str]):
+        if self.__selector_stats is None or not stats_key:
+            return
+        try:
+            self.__selector_stats.record(stats_key, hits, list(misses))
+        except Exception as ex:
+            logger.debug(f'Failed to record selector stats of: {stats_key}, {ex}')
+
     def __select_page_bodies(self) -> List[WebElement]:
         body_elements: List[WebElement] = self.__webdriver.find_elements(By.TAG_NAME, 'body')
         if len(body_elements) == 0:
@@ -235,6 +463,15 @@ class ElementSelector:
                 logger.debug(f"Selecting element directly (despite staleness) using: {xpath}")
                 return root.find_element(search_by, xpath)
 
+    @staticmethod
+    def __is_locatable_in_page(search_configs: Union[SearchConfigs, None]) -> bool:
+        # Shadow DOM queries, and queries relative to a search-from, are located the usual way.
+        return (search_configs is not None
+                and search_configs.search_from() is None
+                and search_configs.search_for() is not None
+                and search_configs.search_for().get_search_by() == SearchBy.XPATH
+                and len(search_configs.search_for().get_queries()) > 0)
+
     @staticmethod
     def validate_search_inputs(search_configs: SearchConfigs):
         if search_configs is None:
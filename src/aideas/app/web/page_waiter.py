@@ -0,0 +1,131 @@
+import logging
+import time
+from enum import Enum, unique
+
+from selenium.common import WebDriverException
+
+logger = logging.getLogger(__name__)
+
+POLL_INTERVAL: float = 0.25
+
+# How long the page must be quiet, for it to be considered settled.
+DEFAULT_QUIET_SECONDS: float = 0.5
+
+# Installs (once per document) hooks which record the time of the last DOM mutation, and of
+# the last network activity, and count the fetch/XHR requests in flight. Then returns:
+# [milliseconds since the last DOM mutation, milliseconds since the last network activity,
+# requests in flight, whether the document has completed loading]
+_PROBE_SCRIPT = """
+const w = window;
+if (!w.__aideasWait) {
+  const state = {mutatedAt: performance.now(), networkAt: performance.now(), inFlight: 0};
+  w.__aideasWait = state;
+  try {
+    new MutationObserver(function () { state.mutatedAt = performance.now(); })
+      .observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+  } catch (e) {}
+  try {
+    new PerformanceObserver(function () { state.networkAt = performance.now(); })
+      .observe({type: 'resource', buffered: false});
+  } catch (e) {}
+  function started() { state.inFlight++; state.networkAt = performance.now(); }
+  function ended() {
+    state.inFlight = Math.max(0, state.inFlight - 1);
+    state.networkAt = performance.now();
+  }
+  if (w.fetch) {
+    const fetch = w.fetch;
+    w.fetch = function () {
+      started();
+      return fetch.apply(this, arguments).finally(ended);
+    };
+  }
+  if (w.XMLHttpRequest) {
+    const send = w.XMLHttpRequest.prototype.send;
+    w.XMLHttpRequest.prototype.send = function () {
+      started();
+      this.addEventListener('loadend', ended, {once: true});
+      return send.apply(this, arguments);
+    };
+  }
+}
+const state = w.__aideasWait;
+const now = performance.now();
+return [now - state.mutatedAt, now - state.networkAt, state.inFlight,
+  document.readyState === 'complete'];
+"""
+
+
+@unique
+class Quiescence(str, Enum):
+    DOM = 'dom'
+    NETWORK = 'network'
+    STABLE = 'stable'
+
+
+class PageWaiter:
+    """
+    Waits for the page to settle, rather than for a fixed time.
+
+    The page is probed in intervals of ``POLL_INTERVAL``, via hooks installed in the page:
+    a MutationObserver for the DOM, and a PerformanceObserver plus fetch/XHR wrappers for the
+    network. A wait ends as soon as the page has been quiet for ``quiet_seconds``, or after
+    ``timeout`` seconds, whichever comes first.
+    """
+    def __init__(self, webdriver, poll_interval: float = POLL_INTERVAL):
+        self.__webdriver = webdriver
+        self.__poll_interval = poll_interval
+
+    def wait_until_stable(self,
+                          timeout: float,
+                          quiet_seconds: float = DEFAULT_QUIET_SECONDS) -> bool:
+        """
+        Wait until the page has loaded, and both its DOM and network are quiet.
+        :param timeout: The maximum number of seconds to wait.
+        :param quiet_seconds: How long the page must be quiet.
+        :return: True if the page settled, False if we timed out.
+        """
+        return self.wait_for(Quiescence.STABLE, timeout, quiet_seconds)
+
+    def wait_for_network_idle(self,
+                              timeout: float,
+                              quiet_seconds: float = DEFAULT_QUIET_SECONDS) -> bool:
+        return self.wait_for(Quiescence.NETWORK, timeout, quiet_seconds)
+
+    def wait_for_dom_mutation_quiet(self,
+                                    timeout: float,
+                                    quiet_seconds: float = DEFAULT_QUIET_SECONDS) -> bool:
+        return self.wait_for(Quiescence.DOM, timeout, quiet_seconds)
+
+    def wait_for(self, quiescence: Quiescence, timeout: float, quiet_seconds: float) -> bool:
+        if timeout < 0:
+            raise ValueError(f'Invalid wait timeout: {timeout}')
+        quiet_millis: float = quiet_seconds * 1000
+        start_time = time.time()
+        while True:
+            if self.__is_quiet(quiescence, quiet_millis):
+                logger.debug(f'Page {quiescence.value} quiet after: '
+                             f'{time.time() - start_time:.2f} seconds')
+                return True
+            time_left: float = timeout - (time.time() - start_time)
+            if time_left <= 0:
+                logger.debug(f'Timed out after {timeout} seconds, waiting for page '
+                             f'{quiescence.value} quiet')
+                return False
+            time.sleep(min(self.__poll_interval, time_left))
+
+    def __is_quiet(self, quiescence: Quiescence, quiet_millis: float) -> bool:
+        try:
+            dom_millis, network_millis, in_flight, loaded = \
+                self.__webdriver.execute_script(_PROBE_SCRIPT)
+        except WebDriverException as ex:
+            # For example, while the page is navigating
+            logger.debug(f'Failed to probe page. {ex}')
+            return False
+        dom_quiet: bool = dom_millis >= quiet_millis
+        network_quiet: bool = in_flight == 0 and network_millis >= quiet_millis
+        if quiescence == Quiescence.DOM:
+            return dom_quiet
+        if quiescence == Quiescence.NETWORK:
+            return network_quiet
+        return loaded and dom_quiet and network_quiet
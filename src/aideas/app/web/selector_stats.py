@@ -0,0 +1,181 @@
+import atexit
+import logging
+import math
+import os
+import sqlite3
+import threading
+import time
+from typing import Union
+
+from ..env import get_output_dir
+
+logger = logging.getLogger(__name__)
+
+# After this long, past hits and misses count half as much as new ones.
+DEFAULT_HALF_LIFE_SECONDS: float = 7 * 24 * 60 * 60
+
+
+class SelectorStats:
+    def __init__(self,
+                 query: str,
+                 hits: float = 0,
+                 misses: float = 0,
+                 total_seconds: float = 0,
+                 lookups: int = 0,
+                 updated_at: float = None):
+        self.query = query
+        self.hits = hits
+        self.misses = misses
+        self.total_seconds = total_seconds
+        self.lookups = lookups
+        self.updated_at = time.time() if updated_at is None else updated_at
+
+    def decayed(self, now: float, half_life_seconds: float) -> 'SelectorStats':
+        factor = SelectorStats.decay_factor(now - self.updated_at, half_life_seconds)
+        return SelectorStats(self.query, self.hits * factor, self.misses * factor,
+                             self.total_seconds, self.lookups, now)
+
+    def success_rate(self) -> float:
+        # With no hits or misses, the rate is 0.5, so that new queries are neither
+        # preferred, nor avoided.
+        return (self.hits + 1) / (self.hits + self.misses + 2)
+
+    def mean_seconds(self) -> float:
+        return 0 if self.lookups == 0 else self.total_seconds / self.lookups
+
+    @staticmethod
+    def decay_factor(elapsed_seconds: float, half_life_seconds: float) -> float:
+        if elapsed_seconds <= 0 or half_life_seconds <= 0:
+            return 1
+        return math.pow(0.5, elapsed_seconds / half_life_seconds)
+
+    def __str__(self) -> str:
+        return (f'SelectorStats(query={self.query}, hits={self.hits:.2f}, '
+                f'misses={self.misses:.2f}, mean_seconds={self.mean_seconds():.3f})')
+
+
+class SelectorStatsStore:
+    """
+    Stores the hits, misses and lookup latency of each search query, keyed by
+    agent/stage/stage-item, in a SQLite database which may be shared by many processes.
+
+    Hits and misses decay over time, so that the preferred query is relearned after the
+    pages being automated change.
+    """
+    def __init__(self,
+                 db_path: str,
+                 half_life_seconds: float = DEFAULT_HALF_LIFE_SECONDS):
+        if db_path != ':memory:':
+            db_dir = os.path.dirname(db_path)
+            if db_dir and not os.path.exists(db_dir):
+                os.makedirs(db_dir, exist_ok=True)
+        self.__db_path = db_path
+        self.__half_life_seconds = half_life_seconds
+        self.__lock = threading.RLock()
+        # We manage transactions ourselves, so that read-modify-write is atomic across processes.
+        self.__connection = sqlite3.connect(
+            db_path, timeout=30, check_same_thread=False, isolation_level=None)
+        with self.__lock:
+            if db_path != ':memory:':
+                self.__connection.execute("PRAGMA journal_mode=WAL")
+            self.__connection.execute(
+                "CREATE TABLE IF NOT EXISTS selector_stats ("
+                "key TEXT NOT NULL, query TEXT NOT NULL, hits REAL NOT NULL, "
+                "misses REAL NOT NULL, total_seconds REAL NOT NULL, lookups INTEGER NOT NULL, "
+                "updated_at REAL NOT NULL, PRIMARY KEY (key, query))")
+
+    def record(self, key: str, hits: list[tuple[str, float]], misses: list[str] = None):
+        """
+        Record the outcome of a lookup.
+        :param key: The key of the lookup, e.g. agent/stage/stage-item.
+        :param hits: The queries which found an element, each with the seconds it took.
+        :param misses: The queries which did not find an element.
+        :return: None
+        """
+        outcomes: dict[str, tuple[bool, float]] = {q: (False, 0) for q in (misses or [])}
+        outcomes.update({q: (True, seconds) for q, seconds in hits})
+        if not outcomes:
+            return
+        now = time.time()
+        with self.__lock:
+            self.__connection.execute("BEGIN IMMEDIATE")
+            try:
+                existing = self.__load(key, list(outcomes.keys()))
+                for query, (hit, seconds) in outcomes.items():
+                    stats = existing.get(query, SelectorStats(query, updated_at=now))
+                    stats = stats.decayed(now, self.__half_life_seconds)
+                    if hit:
+                        stats.hits += 1
+                        stats.total_seconds += seconds
+                        stats.lookups += 1
+                    else:
+                        stats.misses += 1
+                    self.__connection.execute(
+                        "INSERT OR REPLACE INTO selector_stats "
+                        "(key, query, hits, misses, total_seconds, lookups, updated_at) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (key, query, stats.hits, stats.misses, stats.total_seconds,
+                         stats.lookups, stats.updated_at))
+                self.__connection.execute("COMMIT")
+            except Exception:
+                self.__connection.execute("ROLLBACK")
+                raise
+
+    def load(self, key: str, queries: list[str]) -> dict[str, SelectorStats]:
+        """
+        :return: The stats of each query having stats, decayed to the current time.
+        """
+        now = time.time()
+        with self.__lock:
+            loaded = self.__load(key, queries)
+        return {q: s.decayed(now, self.__half_life_seconds) for q, s in loaded.items()}
+
+    def rank(self, key: str, queries: list[str]) -> list[str]:
+        """
+        Order the queries by success rate, most successful first. Queries of equal success
+        rate, e.g. those without stats, keep their order.
+        :param key: The key of the lookup, e.g. agent/stage/stage-item.
+        :param queries: The queries to order.
+        :return: The queries, ordered.
+        """
+        if len(queries) < 2:
+            return list(queries)
+        stats = self.load(key, queries)
+        if not stats:
+            return list(queries)
+        default_rate = SelectorStats('').success_rate()
+
+        def rate(query: str) -> float:
+            return stats[query].success_rate() if query in stats else default_rate
+
+        return sorted(queries, key=lambda query: -rate(query))
+
+    def close(self):
+        with self.__lock:
+            self.__connection.close()
+
+    def get_db_path(self) -> str:
+        return self.__db_path
+
+    def __load(self, key: str, queries: list[str]) -> dict[str, SelectorStats]:
+        if not queries:
+            return {}
+        placeholders = ', '.join('?' * len(queries))
+        rows = self.__connection.execute(
+            "SELECT query, hits, misses, total_seconds, lookups, updated_at FROM selector_stats "
+            f"WHERE key = ? AND query IN ({placeholders})", (key, *queries)).fetchall()
+        return {row[0]: SelectorStats(*row) for row in rows}
+
+
+__selector_stats_store: Union[SelectorStatsStore, None] = None
+__selector_stats_store_lock = threading.Lock()
+
+
+def get_selector_stats_store() -> SelectorStatsStore:
+    global __selector_stats_store
+    with __selector_stats_store_lock:
+        if __selector_stats_store is None:
+            __selector_stats_store = SelectorStatsStore(
+                os.path.join(get_output_dir('selectors'), 'selector-stats.db'))
+            atexit.register(__selector_stats_store.close)
+        return __selector_stats_store
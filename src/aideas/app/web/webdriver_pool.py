@@ -0,0 +1,254 @@
+import atexit
+import json
+import logging
+import threading
+from typing import Callable, Union
+from urllib.parse import urlparse
+
+from ..config import BrowserConfig
+from ..env import get_agent_output_dir
+from ..paths import Paths
+from .webdriver_creator import WEB_DRIVER, WebDriverCreator
+
+logger = logging.getLogger(__name__)
+
+
+class _PooledWebDriver:
+    def __init__(self, key: str, agent_name: str, web_driver: WEB_DRIVER):
+        self.key = key
+        self.agent_name = agent_name
+        self.web_driver = web_driver
+        self.uses = 0
+
+
+class WebDriverPool:
+    """
+    Keeps web drivers warm, for reuse by agents with the same browser config.
+
+    Drivers are leased via ``lease`` and returned via ``release``. On return, a driver's state
+    (cookies, cache and storage of every site visited, tabs and download behaviour) is reset.
+    A driver is evicted, rather than kept, when it has crashed, when it could not be reset, when
+    it has been used ``max-uses`` times or when ``max-idle`` drivers are already kept for its
+    browser config.
+
+    Configured via the ``pool`` section of the browser config. The default ``max-idle`` of 0
+    disables pooling, i.e. drivers are created on lease and quit on release. Drivers with a
+    ``user-data-dir`` are never pooled, as resetting them would wipe the saved logins of the
+    profile, which only one browser may use at a time.
+    """
+    def __init__(self, create: Callable[[str, BrowserConfig], WEB_DRIVER] = WebDriverCreator.create):
+        self.__create = create
+        self.__lock = threading.RLock()
+        self.__idle: dict[str, list[_PooledWebDriver]] = {}
+        self.__leased: dict[int, _PooledWebDriver] = {}
+        self.__configs: dict[str, BrowserConfig] = {}
+        self.__shutdown = False
+
+    @staticmethod
+    def key_of(browser_config: BrowserConfig) -> str:
+        return json.dumps({
+            'executable_path': browser_config.get_executable_path(),
+            'undetected': browser_config.is_undetected(),
+            'options': browser_config.get_options(),
+            'prefs': browser_config.prefs(),
+            'download_dir': browser_config.get_download_dir()
+        }, sort_keys=True, default=str)
+
+    def lease(self, agent_name: str, browser_config: BrowserConfig) -> WEB_DRIVER:
+        """
+        Lease a warm web driver for the browser config, or create one if none is available.
+        :param agent_name: The name of the agent leasing the driver.
+        :param browser_config: The config of the browser to lease.
+        :return: The leased web driver.
+        """
+        key = WebDriverPool.key_of(browser_config)
+        pooled: Union[_PooledWebDriver, None] = None
+        while pooled is None:
+            with self.__lock:
+                idle = self.__idle.get(key, [])
+                candidate = idle.pop() if idle else None
+            if candidate is None:
+                pooled = _PooledWebDriver(key, agent_name, self.__create(agent_name, browser_config))
+            elif self.__is_alive(candidate.web_driver):
+                logger.debug(f"Reusing web driver for agent: {agent_name}")
+                pooled = candidate
+                self.__set_download_behavior(agent_name, browser_config, pooled.web_driver)
+            else:
+                self.__quit(candidate)
+        pooled.uses += 1
+        with self.__lock:
+            self.__leased[id(pooled.web_driver)] = pooled
+            self.__configs[key] = browser_config
+        return pooled.web_driver
+
+    def release(self, web_driver: WEB_DRIVER):
+        """
+        Return a leased web driver to the pool, or quit it if it is not to be kept.
+        Drivers not leased from this pool are simply quit.
+        :param web_driver: The web driver to return.
+        :return: None
+        """
+        with self.__lock:
+            pooled = self.__leased.pop(id(web_driver), None)
+            browser_config = None if pooled is None else self.__configs.get(pooled.key)
+        if pooled is None:
+            # Not created by this pool, so we do what its creator would have done.
+            WebDriverPool.__quit(_PooledWebDriver('', '', web_driver))
+            return
+        max_idle, max_uses = WebDriverPool.__get_limits(browser_config)
+        if self.__shutdown:
+            self.__quit(pooled)
+            return
+        if pooled.uses >= max_uses or not self.__reset(web_driver):
+            self.__quit(pooled)
+            if max_idle > 0:
+                # Replace the evicted driver, so that the next lease need not wait for one.
+                threading.Thread(target=self.warm, args=(pooled.agent_name, browser_config, 1),
+                                 name='webdriver-pool-warm', daemon=True).start()
+            return
+        with self.__lock:
+            idle = self.__idle.setdefault(pooled.key, [])
+            if len(idle) < max_idle:
+                idle.append(pooled)
+                return
+        self.__quit(pooled)
+
+    def warm(self, agent_name: str, browser_config: BrowserConfig, count: int = 1) -> int:
+        """
+        Create web drivers for the browser config, until ``count`` of them are idle.
+        :param agent_name: The name of the agent for which the drivers are created.
+        :param browser_config: The config of the browser to create.
+        :param count: The number of idle drivers to have. Limited to max-idle.
+        :return: The number of drivers created.
+        """
+        key = WebDriverPool.key_of(browser_config)
+        max_idle, _ = WebDriverPool.__get_limits(browser_config)
+        created = 0
+        while not self.__shutdown:
+            with self.__lock:
+                if len(self.__idle.get(key, [])) >= min(count, max_idle):
+                    break
+            try:
+                pooled = _PooledWebDriver(
+                    key, agent_name, self.__create(agent_name, browser_config))
+            except Exception as ex:
+                logger.warning(f"Failed to create web driver for agent: {agent_name}. {ex}")
+                break
+            with self.__lock:
+                self.__configs[key] = browser_config
+                self.__idle.setdefault(key, []).append(pooled)
+            created += 1
+        return created
+
+    def idle_count(self, browser_config: Union[BrowserConfig, None] = None) -> int:
+        with self.__lock:
+            if browser_config is None:
+                return sum(len(e) for e in self.__idle.values())
+            return len(self.__idle.get(WebDriverPool.key_of(browser_config), []))
+
+    def shutdown(self):
+        with self.__lock:
+            self.__shutdown = True
+            idle = [e for drivers in self.__idle.values() for e in drivers]
+            self.__idle.clear()
+        logger.debug(f"Quitting {len(idle)} idle web drivers")
+        for pooled in idle:
+            self.__quit(pooled)
+
+    @staticmethod
+    def __get_limits(browser_config: Union[BrowserConfig, None]) -> tuple[int, int]:
+        if browser_config is None or WebDriverPool.__has_user_data_dir(browser_config):
+            return 0, 0
+        return browser_config.get_pool_max_idle(), browser_config.get_pool_max_uses()
+
+    @staticmethod
+    def __has_user_data_dir(browser_config: BrowserConfig) -> bool:
+        return any(str(e).lstrip('-').startswith('user-data-dir')
+                   for e in browser_config.get_options())
+
+    @staticmethod
+    def __is_alive(web_driver: WEB_DRIVER) -> bool:
+        try:
+            return len(web_driver.window_handles) > 0
+        except Exception as ex:
+            logger.debug(f"Evicting crashed web driver. {ex}")
+            return False
+
+    @staticmethod
+    def __reset(web_driver: WEB_DRIVER) -> bool:
+        try:
+            handles = web_driver.window_handles
+            origins: set[str] = set()
+            for handle in reversed(handles):
+                web_driver.switch_to.window(handle)
+                origins.update(WebDriverPool.__get_visited_origins(web_driver))
+                if handle != handles[0]:
+                    web_driver.close()
+            web_driver.switch_to.window(handles[0])
+            web_driver.get('about:blank')
+            # delete_all_cookies() only deletes the cookies of the current page's domain, so we
+            # clear the whole browser, lest the next lease inherit the sessions of other sites.
+            origins.update(WebDriverPool.__get_cookie_origins(web_driver))
+            web_driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+            web_driver.execute_cdp_cmd('Network.clearBrowserCache', {})
+            for origin in sorted(origins):
+                web_driver.execute_cdp_cmd('Storage.clearDataForOrigin',
+                                           {'origin': origin, 'storageTypes': 'all'})
+            web_driver.execute_cdp_cmd('Page.setDownloadBehavior', {'behavior': 'default'})
+            return True
+        except Exception as ex:
+            logger.debug(f"Evicting web driver which could not be reset. {ex}")
+            return False
+
+    @staticmethod
+    def __get_visited_origins(web_driver: WEB_DRIVER) -> set[str]:
+        history = web_driver.execute_cdp_cmd('Page.getNavigationHistory', {})
+        origins = set()
+        for entry in history.get('entries', []):
+            url = urlparse(entry.get('url', ''))
+            if url.scheme in ('http', 'https') and url.netloc:
+                origins.add(f'{url.scheme}://{url.netloc}')
+        return origins
+
+    @staticmethod
+    def __get_cookie_origins(web_driver: WEB_DRIVER) -> set[str]:
+        cookies = web_driver.execute_cdp_cmd('Network.getAllCookies', {})
+        origins = set()
+        for cookie in cookies.get('cookies', []):
+            domain = cookie.get('domain', '').lstrip('.')
+            if domain:
+                origins.update({f'http://{domain}', f'https://{domain}'})
+        return origins
+
+    @staticmethod
+    def __set_download_behavior(
+            agent_name: str, browser_config: BrowserConfig, web_driver: WEB_DRIVER):
+        download_dir: str = browser_config.get_download_dir()
+        if not download_dir:
+            return
+        params = {
+            "behavior": "allow",
+            "downloadPath": Paths.get_path(
+                browser_config.get_download_dir(get_agent_output_dir(agent_name)))
+        }
+        web_driver.execute_cdp_cmd("Page.setDownloadBehavior", params)
+
+    @staticmethod
+    def __quit(pooled: _PooledWebDriver):
+        try:
+            pooled.web_driver.quit()
+        except Exception as ex:
+            logger.debug(f"Error quitting web driver. {ex}")
+
+
+__webdriver_pool: Union[WebDriverPool, None] = None
+__webdriver_pool_lock = threading.Lock()
+
+
+def get_webdriver_pool() -> WebDriverPool:
+    global __webdriver_pool
+    with __webdriver_pool_lock:
+        if __webdriver_pool is None:
+            __webdriver_pool = WebDriverPool()
+            atexit.register(__webdriver_pool.shutdown)
+        return __webdriver_pool
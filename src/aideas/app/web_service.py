@@ -1,15 +1,26 @@
 import logging
-from typing import Callable, Any
+from datetime import datetime, timedelta
+from typing import Callable, Any, Iterator, Union
 
 from .action.actions import PublishContentAction
+from .agent.translation.translation_memory import get_translation_memory
 from .config import AppConfig
 from .config_loader import ConfigLoader
 from .env import has_env_value
 from .i18n import I18n
+from .request_data import ValidationError
+from .result.result_renderer import ResultFormat, render
+from .result.result_store import ResultStore, RunRecord, get_result_store
 from .task import AgentTask, Task, add_task, get_task_ids, require_task, submit_task
+from .task_events import TaskEvent
+from .task_queue import TaskPriority
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_PAGE_SIZE = 50
+
+MAX_PAGE_SIZE = 500
+
 
 class HtmlFormat:
     @staticmethod
@@ -51,6 +62,100 @@ class WebService:
     def api_get_automation_agent_names(self, tag) -> dict[str, Any]:
         return {'tag': tag, 'agents': self.__config_loader.get_agent_names(tag)}
 
+    @staticmethod
+    def api_get_translation_memory_stats() -> dict[str, Any]:
+        return {'translation-memory': get_translation_memory().get_stats()}
+
+    @staticmethod
+    def api_get_result_runs(args: dict[str, str]) -> dict[str, Any]:
+        page, page_size = WebService.__page(args)
+        since, until = WebService.__day_range(args)
+        since_time = None if since is None else datetime.strptime(since, '%Y-%m-%d').timestamp()
+        until_time = None if until is None else \
+            (datetime.strptime(until, '%Y-%m-%d') + timedelta(days=1)).timestamp()
+        # One more than a page, to tell if there are more
+        runs = get_result_store().find_runs(args.get('agent'), WebService.__bool(args, 'success'),
+                                            since_time, until_time, page_size + 1,
+                                            (page - 1) * page_size)
+        return {'runs': [WebService.__run_to_dict(run) for run in runs[:page_size]],
+                'page': page, 'page-size': page_size, 'has-more': len(runs) > page_size}
+
+    @staticmethod
+    def api_get_result_run(run_id: str) -> dict[str, Any]:
+        store: ResultStore = get_result_store()
+        try:
+            results = store.find_results(run_id=int(run_id))
+        except ValueError:
+            raise ValidationError(f"Invalid run id: {run_id}")
+        if not results:
+            raise FileNotFoundError(f"Run not found: {run_id}")
+        return {'run-id': int(run_id), 'results': [{
+            'agent': e.agent, 'stage': e.stage, 'stage-item': e.stage_item, 'action': e.action,
+            'args': e.args, 'success': e.success, 'created-at': e.created_at,
+            'result': WebService.__to_json_value(e.get_result())} for e in results]}
+
+    @staticmethod
+    def api_get_result_agents(args: dict[str, str]) -> dict[str, Any]:
+        since, until = WebService.__day_range(args)
+        return {'agents': get_result_store().get_index().get_agent_stats(
+            args.get('agent'), since, until)}
+
+    @staticmethod
+    def api_get_result_stages(args: dict[str, str]) -> dict[str, Any]:
+        since, until = WebService.__day_range(args)
+        return {'stages': get_result_store().get_index().get_stage_stats(
+            args.get('agent'), since, until)}
+
+    @staticmethod
+    def api_get_result_hotspots(args: dict[str, str]) -> dict[str, Any]:
+        page, page_size = WebService.__page(args)
+        since, until = WebService.__day_range(args)
+        hotspots = get_result_store().get_index().get_failure_hotspots(
+            args.get('agent'), since, until, page_size + 1, (page - 1) * page_size)
+        return {'hotspots': hotspots[:page_size],
+                'page': page, 'page-size': page_size, 'has-more': len(hotspots) > page_size}
+
+    @staticmethod
+    def __run_to_dict(run: RunRecord) -> dict[str, Any]:
+        return {'id': run.run_id, 'agent': run.agent, 'success': run.success,
+                'created-at': run.created_at, 'duration-seconds': run.duration_seconds,
+                'links': {'results': f'/api/results/runs/{run.run_id}'}}
+
+    @staticmethod
+    def __page(args: dict[str, str]) -> tuple[int, int]:
+        try:
+            page = int(args.get('page', 1))
+            page_size = int(args.get('page-size', DEFAULT_PAGE_SIZE))
+        except ValueError:
+            raise ValidationError("page and page-size must be numbers")
+        if page < 1 or page_size < 1 or page_size > MAX_PAGE_SIZE:
+            raise ValidationError(f"page must be at least 1, and page-size from 1 to {MAX_PAGE_SIZE}")
+        return page, page_size
+
+    @staticmethod
+    def __day_range(args: dict[str, str]) -> tuple[Union[str, None], Union[str, None]]:
+        days = []
+        for key in ['since', 'until']:
+            day = args.get(key)
+            if day:
+                try:
+                    datetime.strptime(day, '%Y-%m-%d')
+                except ValueError:
+                    raise ValidationError(f"{key} must be a date, as YYYY-MM-DD, found: {day}")
+            days.append(day if day else None)
+        return days[0], days[1]
+
+    @staticmethod
+    def __bool(args: dict[str, str], key: str) -> Union[bool, None]:
+        value = args.get(key)
+        return None if not value else value.lower() == 'true'
+
+    @staticmethod
+    def __to_json_value(value: Any) -> Any:
+        if isinstance(value, (bytes, bytearray)):
+            return bytes(value).decode('utf-8', errors='replace')
+        return value
+
     def api_get_automation_agent_config(self, agent_name: str) -> dict[str, Any]:
         return {'agent_name': agent_name, 'agent': self.__config_loader.get_agent_config_with_unreplaced_variables(agent_name)}
 
@@ -78,11 +183,13 @@ class WebService:
         return self._with_default_page_variables(
             {'tag': tag, 'agents': agents, 'form_fields': all_form_fields})
 
-    def start_automation_async(self, task_id: str, data: dict[str, Any]) -> Task:
+    def start_automation_async(self,
+                               task_id: str,
+                               data: dict[str, Any],
+                               priority: TaskPriority = TaskPriority.INTERACTIVE) -> Task:
         try:
             task = AgentTask.of_defaults(self.__config_loader, data)
-            submit_task(task_id, task)
-            return task
+            return submit_task(task_id, task, priority)
         except Exception as ex:
             logger.exception(ex)
             raise ex
@@ -113,15 +220,54 @@ class WebService:
 
     @staticmethod
     def api_task(get_task_links: Callable[[str], dict[str, Any]], task_id: str) -> dict[str, Any]:
-        task: AgentTask = require_task(task_id)
+        task: Task = require_task(task_id)
         return {
             'id': task_id,
-            'agents': task.get_run_context().get_agent_names(),
+            'agents': task.get_agent_names(),
             'status': task.get_status(),
             'progress': task.get_progress(),
             'links': get_task_links(task_id)
         }
 
+    @staticmethod
+    def api_task_events(get_task_links: Callable[[str], dict[str, Any]],
+                        task_id: str,
+                        last_event_id: Union[str, None] = None) -> Iterator[str]:
+        """
+        Stream the events of a task, as server-sent events, until the task is completed.
+        :param get_task_links: Provides the links of the task.
+        :param task_id: The id of the task.
+        :param last_event_id: The id of the last event received, when reconnecting. If none,
+        the task, as returned by api_task, is sent first, then the events which follow.
+        :return: The server-sent events, each a string.
+        """
+        events = require_task(task_id).get_events()
+        if last_event_id and last_event_id.isdigit():
+            after_id = int(last_event_id)
+        else:
+            # Taken before the task, so that no event after it is missed
+            after_id = events.get_last_event_id()
+            yield TaskEvent(after_id, 'task', WebService.api_task(get_task_links, task_id)).to_sse()
+        for event in events.watch(after_id):
+            # A comment, to keep the connection open
+            yield ": heartbeat\n\n" if event is None else event.to_sse()
+
+    @staticmethod
+    def api_task_results(task_id: str, result_format: Union[str, None] = None) -> Iterator[str]:
+        """
+        Render the results of a task a fragment at a time, to be streamed.
+        :param task_id: The id of the task.
+        :param result_format: One of html, json or text. Defaults to json.
+        :return: The fragments of the rendered results.
+        """
+        try:
+            result_format = ResultFormat(result_format or ResultFormat.JSON)
+        except ValueError:
+            raise ValidationError(f"Invalid format: {result_format}, "
+                                  f"expected one of: {', '.join(e.value for e in ResultFormat)}")
+        return render(require_task(task_id).get_result_set(), result_format,
+                      AgentTask.secrets_masking_log_filter.redact)
+
     def _with_default_page_variables(self, variables: dict[str, Any] = None):
         if variables is None:
             variables = {}
@@ -1,4 +1,4 @@
-from flask import Flask, render_template, request
+from flask import Flask, Response, render_template, request, stream_with_context
 from flask_cors import CORS
 import uuid
 import logging.config
@@ -7,6 +7,7 @@ from app.request_data import RequestData, ValidationError
 from app.app import App
 from app.env import get_app_port, is_production
 from app.task import get_task, stop_task
+from app.task_queue import TaskPriority, TaskQueueFullError
 from app.web_service import WebService
 
 web_app = Flask(__name__)
@@ -22,10 +23,13 @@ def handle_error(e):
     if not is_production():
         print(e)
     error_data = {"error": e.message if hasattr(e, 'message') else str(e)}
+    # Too many requests, when the task queue is saturated
+    status, headers = (429, {"Retry-After": "30"}) if isinstance(e, TaskQueueFullError) \
+        else (400, {})
     if request.content_type and 'json' in request.content_type:
-        return error_data, 400
+        return error_data, status, headers
     return render_template(
-        AUTOMATION_INDEX_TEMPLATE, **web_service.automation_index(error_data)), 400
+        AUTOMATION_INDEX_TEMPLATE, **web_service.automation_index(error_data)), status, headers
 
 @web_app.route('/')
 def index():
@@ -85,7 +89,7 @@ def api_tasks():
     data = RequestData.task_config_from_json_body(task_id, request)
 
     if data['async'] is True:
-        web_service.start_automation_async(task_id, data)
+        web_service.start_automation_async(task_id, data, TaskPriority.BATCH)
         return { "id": task_id }, 201
 
     web_service.start_automation(task_id, data)
@@ -115,6 +119,32 @@ def api_task_by_id(task_id: str):
     return { "task": web_service.api_task(_api_get_task_links, task_id) }
 
 
+@web_app.route('/api/tasks/<task_id>/events', methods=['GET'])
+def api_task_events(task_id: str):
+    """
+    Stream the status, progress and action results of a task, as server-sent events, until
+    the task is completed. Reconnecting clients resume after the Last-Event-ID header.
+    """
+    _task_by_id(task_id)
+    events = web_service.api_task_events(
+        _api_get_task_links, task_id, request.headers.get('Last-Event-ID'))
+    return Response(stream_with_context(events), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
+@web_app.route('/api/tasks/<task_id>/results', methods=['GET'])
+def api_task_results(task_id: str):
+    """
+    Stream the results of a task, as rendered.
+    Format: format (html|json|text), defaults to json.
+    """
+    _task_by_id(task_id)
+    result_format = request.args.get('format')
+    fragments = web_service.api_task_results(task_id, result_format)
+    return Response(stream_with_context(fragments),
+                    mimetype=_RESULT_MIMETYPES.get(result_format, 'application/json'))
+
+
 @web_app.route('/api/agents', methods=['GET'])
 def api_get_agents():
     """
@@ -129,15 +159,73 @@ def api_get_agent_config_by_name(agent_name: str):
     return {**web_service.api_get_automation_agent_config(agent_name)}
 
 
+@web_app.route('/api/translation-memory', methods=['GET'])
+def api_get_translation_memory_stats():
+    """
+    Get the entries, hits, misses, hit rate and bytes saved of the translation memory.
+    Hits, misses and bytes saved are those of the translations made by this process.
+    """
+    return {**web_service.api_get_translation_memory_stats()}
+
+
+@web_app.route('/api/results/runs', methods=['GET'])
+def api_get_result_runs():
+    """
+    Get past runs, most recent first, a page at a time.
+    Filters: agent, success (true|false), since and until (dates as YYYY-MM-DD, inclusive).
+    Pagination: page (from 1), page-size.
+    """
+    return {**web_service.api_get_result_runs(request.args.to_dict())}
+
+
+@web_app.route('/api/results/runs/<run_id>', methods=['GET'])
+def api_get_result_run(run_id: str):
+    """
+    Get the results of a run, or 404 if there is no such run.
+    """
+    try:
+        return {**web_service.api_get_result_run(run_id)}
+    except FileNotFoundError as ex:
+        return {"error": str(ex)}, 404
+
+
+@web_app.route('/api/results/agents', methods=['GET'])
+def api_get_result_agents():
+    """
+    Get the runs, success rate and latency percentiles of each agent.
+    Filters: agent, since and until (dates as YYYY-MM-DD, inclusive).
+    """
+    return {**web_service.api_get_result_agents(request.args.to_dict())}
+
+
+@web_app.route('/api/results/stages', methods=['GET'])
+def api_get_result_stages():
+    """
+    Get the runs and success rate of each stage of each agent.
+    Filters: agent, since and until (dates as YYYY-MM-DD, inclusive).
+    """
+    return {**web_service.api_get_result_stages(request.args.to_dict())}
+
+
+@web_app.route('/api/results/hotspots', methods=['GET'])
+def api_get_result_hotspots():
+    """
+    Get the stage items which failed most often, most failures first, a page at a time.
+    Filters: agent, since and until (dates as YYYY-MM-DD, inclusive).
+    Pagination: page (from 1), page-size.
+    """
+    return {**web_service.api_get_result_hotspots(request.args.to_dict())}
+
+
+_RESULT_MIMETYPES = {'html': 'text/html', 'json': 'application/json', 'text': 'text/plain'}
+
+
 def _task_by_id(task_id: str, action = None):
     task = get_task(task_id)
 
     if task is None:
         raise FileNotFoundError(f"Task not found: {task_id}")
 
-    if not task.is_started():
-        raise ValidationError(f"Task not started: {task_id}")
-
     if action == 'stop':
         if task.is_completed():
             raise ValidationError(f"Task already completed: {task_id}")
@@ -150,7 +238,9 @@ def _get_task_links(task_id: str) -> dict[str, any]:
     return {'view': '/task/' + task_id, 'stop': '/task/' + task_id + '?action=stop'}
 
 def _api_get_task_links(task_id: str) -> dict[str, any]:
-    return {'view': '/api/tasks/' + task_id, 'stop': '/api/tasks/' + task_id + '?action=stop'}
+    return {'view': '/api/tasks/' + task_id, 'stop': '/api/tasks/' + task_id + '?action=stop',
+            'events': '/api/tasks/' + task_id + '/events',
+            'results': '/api/tasks/' + task_id + '/results'}
 
 def _render_task_index_template(info: str = None):
     return render_template(TASK_INDEX_TEMPLATE, **web_service.tasks(_get_task_links, info))
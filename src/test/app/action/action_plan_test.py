@@ -0,0 +1,61 @@
+import unittest
+
+from aideas.app.action.action import Action
+from aideas.app.action.action_plan import ActionPlan
+from aideas.app.action.action_result import ActionResult
+from aideas.app.action.variable_parser import to_results_variable
+from aideas.app.agent.agent_name import AgentName
+from test.app.test_functions import get_run_context
+
+agent_name: str = AgentName.PICTORY
+stage_name: str = "test-stage"
+element_name: str = "test-success-0"
+
+
+class ActionPlanTest(unittest.TestCase):
+    def test_of_given_same_signatures_returns_same_plan(self):
+        signatures = ('wait 1', 'log INFO "some message"')
+        self.assertIs(ActionPlan.of(agent_name, stage_name, element_name, signatures),
+                      ActionPlan.of(agent_name, stage_name, element_name, signatures))
+
+    def test_to_action_equals_action_of(self):
+        signatures = ('wait 1', 'log INFO "some message"', 'not is_displayed', 'none')
+        plan = ActionPlan.of(agent_name, stage_name, element_name, signatures)
+        for signature, planned_action in zip(signatures, plan.get_actions()):
+            self.assertFalse(planned_action.has_variables())
+            self.assertEqual(Action.of(agent_name, stage_name, element_name, signature),
+                             planned_action.to_action())
+
+    def test_to_action_resolves_variables_when_called(self):
+        curr_path = [agent_name, stage_name, element_name]
+        signature = f'return {to_results_variable(curr_path)}[0]'
+        planned_action = ActionPlan.of(
+            agent_name, stage_name, element_name, (signature,)).get_actions()[0]
+        self.assertTrue(planned_action.has_variables())
+
+        run_context = get_run_context([agent_name])
+        run_context.add_action_result(ActionResult(
+            Action.of(agent_name, stage_name, element_name, 'test-action'), True, ['first']))
+        self.assertEqual(['first'], planned_action.to_action(run_context).get_args())
+
+        run_context = get_run_context([agent_name])
+        run_context.add_action_result(ActionResult(
+            Action.of(agent_name, stage_name, element_name, 'test-action'), True, ['second']))
+        self.assertEqual(['second'], planned_action.to_action(run_context).get_args())
+
+    def test_run_stages_is_not_parsed_as_action(self):
+        planned_action = ActionPlan.of(
+            agent_name, stage_name, element_name, ('run_stages one two',)).get_actions()[0]
+        self.assertTrue(planned_action.is_run_stages())
+        with self.assertRaises(ValueError):
+            planned_action.to_action()
+
+    def test_invalid_signature_raises_when_action_is_created(self):
+        plan = ActionPlan.of(agent_name, stage_name, element_name, ('wait 1', 'log "unclosed'))
+        self.assertEqual('wait', plan.get_actions()[0].to_action().get_name())
+        with self.assertRaises(ValueError):
+            plan.get_actions()[1].to_action()
+
+
+if __name__ == '__main__':
+    unittest.main()
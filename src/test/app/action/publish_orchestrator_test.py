@@ -0,0 +1,91 @@
+import threading
+import time
+import unittest
+
+from content_publisher.app.content_publisher import PostResult
+
+from aideas.app.action.publish_orchestrator import PublishOrchestrator
+
+PLATFORMS = ['facebook', 'reddit', 'tiktok', 'x', 'youtube']
+
+
+class PublishOrchestratorTest(unittest.TestCase):
+    def test_publish_takes_as_long_as_the_slowest_platform(self):
+        def publish(platform: str) -> PostResult:
+            time.sleep(0.2)
+            return PostResult(success=True, post_url=f'https://{platform}.com/post')
+
+        finished: list[str] = []
+        start = time.monotonic()
+        results = PublishOrchestrator(publish).publish(
+            PLATFORMS, lambda platform, _: finished.append(platform))
+        seconds = time.monotonic() - start
+
+        self.assertLess(seconds, 0.2 * len(PLATFORMS) / 2)
+        self.assertEqual(PLATFORMS, list(results.keys()))
+        self.assertEqual(sorted(PLATFORMS), sorted(finished))
+        self.assertTrue(all(result.success for result in results.values()))
+
+    def test_publish_times_out_each_platform_on_its_own(self):
+        hung = threading.Event()
+
+        def publish(platform: str) -> PostResult:
+            if platform == 'youtube':
+                hung.wait(5)
+            return PostResult(success=True, post_url=f'https://{platform}.com/post')
+
+        try:
+            start = time.monotonic()
+            results = PublishOrchestrator(publish, timeout_seconds=5, timeouts={'youtube': 0.2}) \
+                .publish(['reddit', 'youtube'])
+            self.assertLess(time.monotonic() - start, 1)
+        finally:
+            hung.set()
+
+        self.assertTrue(results['reddit'].success)
+        self.assertFalse(results['youtube'].success)
+        self.assertIn('Timed out', results['youtube'].message)
+
+    def test_publish_retries_only_errors_raised_before_posting(self):
+        attempts: dict[str, int] = {}
+        lock = threading.Lock()
+
+        def publish(platform: str) -> PostResult:
+            with lock:
+                attempts[platform] = attempts.get(platform, 0) + 1
+                attempt = attempts[platform]
+            if platform == 'x':
+                raise ConnectionRefusedError('Connection refused')
+            if platform == 'tiktok':
+                raise ValueError('Unparsable response')
+            return PostResult(success=False, message=f'Attempt {attempt}')
+
+        results = PublishOrchestrator(publish, max_retries=2, backoff_seconds=0.01) \
+            .publish(['reddit', 'tiktok', 'x'])
+
+        self.assertEqual({'reddit': 1, 'tiktok': 1, 'x': 3}, attempts)
+        self.assertFalse(results['reddit'].success)
+        self.assertEqual('Unparsable response', results['tiktok'].message)
+        self.assertEqual('Connection refused', results['x'].message)
+
+    def test_publish_does_not_retry_a_platform_which_timed_out(self):
+        attempts: list[str] = []
+        finished = threading.Event()
+
+        def publish(platform: str) -> PostResult:
+            attempts.append(platform)
+            # Fails only after the platform timed out
+            time.sleep(0.3)
+            finished.set()
+            raise ConnectionRefusedError('Connection refused')
+
+        results = PublishOrchestrator(publish, timeout_seconds=0.1, max_retries=5, backoff_seconds=0) \
+            .publish(['youtube'])
+        self.assertIn('Timed out', results['youtube'].message)
+
+        self.assertTrue(finished.wait(1))
+        time.sleep(0.1)
+        self.assertEqual(['youtube'], attempts)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import copy
+import os
+import timeit
+import unittest
+
+from pyu.io.file import load_yaml
+
+from aideas.app.action.variable_parser import replace_all_variables
+from aideas.app.action.variable_template import VariableTemplate
+from test.app.test_functions import get_run_context
+
+AGENT_CONFIG_DIR = os.path.join('aideas', 'resources', 'config', 'agent')
+
+REPEAT = 20
+
+
+def load_agent_configs() -> dict[str, dict]:
+    configs = {}
+    for filename in sorted(os.listdir(AGENT_CONFIG_DIR)):
+        config = load_yaml(os.path.join(AGENT_CONFIG_DIR, filename))
+        if config:
+            configs[filename] = config
+    return configs
+
+
+class VariableTemplateBenchmark(unittest.TestCase):
+    """
+    Compares replacing the variables of the bundled agent configs via pyu, which scans every
+    string of a config each time, with rendering the configs compiled once. Both must produce
+    the same configs.
+    """
+    def test_render_compiled_configs_vs_replace_all_variables(self):
+        configs = load_agent_configs()
+        source = get_run_context(['test-agent']).get_run_config().to_dict()
+
+        def replace_all():
+            for config in configs.values():
+                replace_all_variables(copy.deepcopy(config), source, False)
+
+        templates = [VariableTemplate.compile(config) for config in configs.values()]
+
+        def render_all():
+            for template in templates:
+                template.render(source, False)
+
+        compile_seconds = timeit.timeit(
+            lambda: [VariableTemplate.compile(config) for config in configs.values()],
+            number=REPEAT)
+        replace_seconds = timeit.timeit(replace_all, number=REPEAT)
+        render_seconds = timeit.timeit(render_all, number=REPEAT)
+
+        differing = [name for name, template in zip(configs.keys(), templates)
+                     if template.render(source, False)
+                     != replace_all_variables(copy.deepcopy(configs[name]), source, False)]
+
+        print(f"\n{len(configs)} agent configs, "
+              f"{sum(e.get_variable_count() for e in templates)} variables, {REPEAT} runs"
+              f"\n  replace_all_variables: {replace_seconds * 1000 / REPEAT:.3f} ms per run"
+              f"\n  render (compiled):     {render_seconds * 1000 / REPEAT:.3f} ms per run"
+              f"\n  compile (once):        {compile_seconds * 1000 / REPEAT:.3f} ms per run"
+              f"\n  configs rendered differently: {differing}")
+        self.assertEqual([], differing)
+        self.assertLess(render_seconds, replace_seconds)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import unittest
+
+from aideas.app.action.variable_template import TextTemplate, VariableTemplate
+
+
+class VariableTemplateTest(unittest.TestCase):
+    def test_text_template_given_no_variables(self):
+        template = TextTemplate.of('no variables here')
+        self.assertFalse(template.has_variables())
+        self.assertEqual('no variables here', template.render(lambda name: None))
+
+    def test_text_template_renders_literals_and_variables(self):
+        template = TextTemplate.of('${OUTPUT_DIR}/videos/${TEXT_TITLE}.mp4')
+        self.assertEqual(('OUTPUT_DIR', 'TEXT_TITLE'), template.get_names())
+        values = {'OUTPUT_DIR': '/tmp/out', 'TEXT_TITLE': 'title'}
+        self.assertEqual('/tmp/out/videos/title.mp4', template.render(values.get))
+
+    def test_text_template_given_single_variable_renders_value_as_is(self):
+        template = TextTemplate.of('${LANGUAGE_CODES}')
+        self.assertEqual(['en', 'fr'], template.render({'LANGUAGE_CODES': ['en', 'fr']}.get))
+
+    def test_text_template_given_unresolved_variable_renders_none(self):
+        template = TextTemplate.of('${OUTPUT_DIR}/${UNKNOWN}')
+        self.assertIsNone(template.render({'OUTPUT_DIR': '/tmp/out'}.get))
+
+    def test_render_replaces_variables(self):
+        template = VariableTemplate.compile({
+            'title': '${TEXT_TITLE}',
+            'stages': {'upload': {'stage-items': {'file': 'upload ${VIDEO_FILE}', 'wait': 2}}},
+            'list': ['${TEXT_TITLE}', 'literal']
+        })
+        config = template.render({'TEXT_TITLE': 'title', 'VIDEO_FILE': 'video.mp4'})
+        self.assertEqual('title', config['title'])
+        self.assertEqual('upload video.mp4', config['stages']['upload']['stage-items']['file'])
+        self.assertEqual(2, config['stages']['upload']['stage-items']['wait'])
+        self.assertEqual(['title', 'literal'], config['list'])
+
+    def test_render_does_not_modify_compiled_config(self):
+        compiled = {'title': '${TEXT_TITLE}', 'nested': {'list': ['${TEXT_TITLE}']}}
+        template = VariableTemplate.compile(compiled)
+        config = template.render({'TEXT_TITLE': 'title'})
+        config['nested']['list'].append('added')
+        self.assertEqual({'title': '${TEXT_TITLE}', 'nested': {'list': ['${TEXT_TITLE}']}}, compiled)
+        self.assertEqual({'title': 'title', 'nested': {'list': ['title']}},
+                         template.render({'TEXT_TITLE': 'title'}))
+
+    def test_render_leaves_action_variables_for_the_run(self):
+        template = VariableTemplate.compile({
+            'stages': {'one': {'stage-items': {
+                'a': 'get_files ${results.me[0]}',
+                'b': 'log INFO ${context.count}',
+                'c': 'log INFO ${TEXT_TITLE}'}}}})
+        config = template.render({'TEXT_TITLE': 'title'})
+        items = config['stages']['one']['stage-items']
+        self.assertEqual('get_files ${results.me[0]}', items['a'])
+        self.assertEqual('log INFO ${context.count}', items['b'])
+        self.assertEqual('log INFO title', items['c'])
+        self.assertEqual([['stages', 'one', 'stage-items', 'a'], ['stages', 'one', 'stage-items', 'b']],
+                         template.get_action_variable_paths())
+
+    def test_render_resolves_self_variables(self):
+        template = VariableTemplate.compile({
+            'post-dialog': '//div[@role="dialog"]',
+            'search-for': ['${self.post-dialog}//form', '$self.items[1]'],
+            'items': ['zero', 'one']
+        })
+        config = template.render({'key': 'value'})
+        self.assertEqual(['//div[@role="dialog"]//form', 'one'], config['search-for'])
+
+    def test_render_resolves_self_variables_from_the_innermost_scope(self):
+        template = VariableTemplate.compile({
+            'title': 'agent',
+            'stages': {
+                'title': 'not a scope',
+                'one': {
+                    'title': 'stage',
+                    'stage-items': {'a': {'actions': ['log INFO ${self.title}']}}
+                },
+                'two': {'stage-items': {'a': {'actions': ['log INFO ${self.title}']}}}
+            }
+        })
+        config = template.render({'key': 'value'})
+        self.assertEqual(['log INFO stage'], config['stages']['one']['stage-items']['a']['actions'])
+        self.assertEqual(['log INFO agent'], config['stages']['two']['stage-items']['a']['actions'])
+
+    def test_render_given_check_replaced_and_unresolved_variable_raises(self):
+        template = VariableTemplate.compile({'title': '${UNKNOWN_VARIABLE}'})
+        with self.assertRaises(ValueError):
+            template.render({'key': 'value'}, True)
+        self.assertEqual({'title': '${UNKNOWN_VARIABLE}'}, template.render({'key': 'value'}, False))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+import threading
+import time
+import unittest
+
+from aideas.app.agent.agent_scheduler import AgentScheduler
+from aideas.app.config import AgentConfig
+
+
+def agent_config(tags: str = None, depends_on: list[str] = None) -> AgentConfig:
+    config = {'agent-type': 'generic'}
+    if tags:
+        config['agent-tags'] = tags
+    if depends_on:
+        config['depends-on'] = depends_on
+    return AgentConfig(config)
+
+
+class AgentSchedulerTest(unittest.TestCase):
+    def test_post_agents_depend_only_on_preceding_non_post_agents(self):
+        scheduler = AgentScheduler.of_configs({
+            'pictory': agent_config(),
+            'youtube': agent_config('post'),
+            'reddit': agent_config('post'),
+        }, 3)
+        self.assertEqual(set(), scheduler.get_dependencies('pictory'))
+        self.assertEqual({'pictory'}, scheduler.get_dependencies('youtube'))
+        self.assertEqual({'pictory'}, scheduler.get_dependencies('reddit'))
+
+    def test_non_post_agent_depends_on_all_preceding_agents(self):
+        scheduler = AgentScheduler.of_configs({
+            'youtube': agent_config('post'),
+            'reddit': agent_config('post'),
+            'translation': agent_config('custom'),
+        }, 3)
+        self.assertEqual({'youtube', 'reddit'}, scheduler.get_dependencies('translation'))
+
+    def test_tags_given_as_string_are_matched_whole(self):
+        scheduler = AgentScheduler.of_configs({
+            'pictory': agent_config(),
+            'youtube': agent_config('unlisted, post'),
+            'reddit': agent_config('repost'),
+        }, 3)
+        self.assertEqual({'pictory'}, scheduler.get_dependencies('youtube'))
+        self.assertEqual({'pictory', 'youtube'}, scheduler.get_dependencies('reddit'))
+
+    def test_post_agent_depends_on_preceding_agent_it_depends_on(self):
+        scheduler = AgentScheduler.of_configs({
+            'facebook': agent_config('post'),
+            'instagram': agent_config('post', ['facebook']),
+        }, 3)
+        self.assertEqual({'facebook'}, scheduler.get_dependencies('instagram'))
+
+    def test_run_given_independent_agents_runs_them_at_the_same_time(self):
+        agent_names = ['youtube', 'reddit', 'twitter']
+        scheduler = AgentScheduler.of_configs(
+            {name: agent_config('post') for name in agent_names}, len(agent_names))
+        barrier = threading.Barrier(len(agent_names), timeout=5)
+        completed = []
+
+        def run_agent(agent_name: str):
+            # Fails with BrokenBarrierError, unless all the agents run at the same time
+            barrier.wait()
+            completed.append(agent_name)
+
+        scheduler.run(run_agent, lambda agent_name: None, lambda: True)
+        self.assertEqual(set(agent_names), set(completed))
+
+    def test_run_given_single_worker_runs_agents_in_order(self):
+        agent_names = ['youtube', 'reddit', 'twitter']
+        scheduler = AgentScheduler.of_configs(
+            {name: agent_config('post') for name in agent_names}, 1)
+        completed = []
+
+        def run_agent(agent_name: str):
+            time.sleep(0.01)
+            completed.append(agent_name)
+
+        scheduler.run(run_agent, lambda agent_name: None, lambda: True)
+        self.assertEqual(agent_names, completed)
+
+    def test_run_waits_for_dependencies(self):
+        scheduler = AgentScheduler.of_configs({
+            'pictory': agent_config(),
+            'youtube': agent_config('post'),
+            'reddit': agent_config('post'),
+        }, 3)
+        completed = []
+
+        def run_agent(agent_name: str):
+            if agent_name == 'pictory':
+                time.sleep(0.05)
+            completed.append(agent_name)
+
+        scheduler.run(run_agent, lambda agent_name: None, lambda: True)
+        self.assertEqual('pictory', completed[0])
+        self.assertEqual(3, len(completed))
+
+    def test_run_skips_pending_agents_when_may_not_proceed(self):
+        scheduler = AgentScheduler.of_configs({
+            'pictory': agent_config(),
+            'youtube': agent_config('post'),
+            'reddit': agent_config('post'),
+        }, 3)
+        completed = []
+        skipped = []
+
+        scheduler.run(completed.append, skipped.append, lambda: len(completed) == 0)
+        self.assertEqual(['pictory'], completed)
+        self.assertEqual(['youtube', 'reddit'], skipped)
+
+
+if __name__ == '__main__':
+    unittest.main()
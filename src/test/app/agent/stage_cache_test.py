@@ -0,0 +1,165 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from aideas.app.action.action import Action
+from aideas.app.action.action_result import ActionResult
+from aideas.app.agent.agent import Agent
+from aideas.app.agent.stage_cache import StageCache, stage_cache_key
+from aideas.app.config import AgentConfig, Name
+from aideas.app.env import get_content_dir
+from aideas.app.result.result_set import ElementResultSet
+from aideas.app.run_context import RunContext
+
+AGENT_NAME = 'test-agent'
+
+AGENT_CONFIG = {'stages': {'stage-0': {'cache': True,
+                                       'stage-items': {'item-0': {'actions': ['noop']}}},
+                           'stage-1': {'stage-items': {'item-0': {'actions': ['noop']}}}}}
+
+
+class FileWritingAgent(Agent):
+    """Writes a file to the results dir of each stage."""
+    executed: list[str] = []
+
+    def _execute(self, config: AgentConfig, stage: Name, run_context: RunContext) -> ElementResultSet:
+        FileWritingAgent.executed.append(stage.id)
+        results_dir = os.path.join(self.get_results_dir(), stage.id)
+        os.makedirs(results_dir, exist_ok=True)
+        with open(os.path.join(results_dir, 'output.txt'), 'w') as file:
+            file.write(f'output of {stage.id}')
+        action = Action(AGENT_NAME, stage.id, 'item-0', 'noop', [])
+        run_context.add_action_result(ActionResult(action, True, f'result of {stage.id}'))
+        return run_context.get_element_results(AGENT_NAME, stage.id)
+
+
+class ContentWritingAgent(Agent):
+    """
+    At stage-0, saves a file via the output dirs of an action, and writes another to the content
+    dir, as an agent running at the same time would.
+    """
+    executed: list[str] = []
+
+    def _execute(self, config: AgentConfig, stage: Name, run_context: RunContext) -> ElementResultSet:
+        ContentWritingAgent.executed.append(stage.id)
+        action = Action(AGENT_NAME, stage.id, 'item-0', 'noop', [])
+        if stage.id == 'stage-0':
+            for output_dir in action.get_output_dirs():
+                with open(os.path.join(output_dir, 'stage-output.txt'), 'w') as file:
+                    file.write(f'output of {stage.id}')
+            with open(get_content_dir('other-agent-output.txt'), 'w') as file:
+                file.write('output of other agent')
+        run_context.add_action_result(ActionResult(action, True, f'result of {stage.id}'))
+        return run_context.get_element_results(AGENT_NAME, stage.id)
+
+
+def result_of(action_result: str) -> ElementResultSet:
+    action = Action(AGENT_NAME, 'stage-0', 'item-0', 'noop', [])
+    return ElementResultSet().add_action_result(ActionResult(action, True, action_result))
+
+
+class StageCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.__dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.__dir.cleanup)
+
+    def test_get_restores_result_and_files(self):
+        cache = StageCache(os.path.join(self.__dir.name, 'cache'), 1024 * 1024)
+        self.addCleanup(cache.close)
+        source = os.path.join(self.__dir.name, 'source')
+        os.makedirs(os.path.join(source, 'sub'))
+        with open(os.path.join(source, 'sub', 'file.txt'), 'w') as file:
+            file.write('content')
+
+        self.assertIsNone(cache.get('key', {'results': source}))
+        cache.put('key', AGENT_NAME, 'stage-0', result_of('cached'),
+                  {'results': source}, {'results': [os.path.join('sub', 'file.txt')]})
+
+        target = os.path.join(self.__dir.name, 'target')
+        result = cache.get('key', {'results': target})
+        self.assertEqual('cached', result.get_action_result('item-0', 'noop').get_result())
+        with open(os.path.join(target, 'sub', 'file.txt')) as file:
+            self.assertEqual('content', file.read())
+
+    def test_least_recently_used_are_evicted_when_over_max_bytes(self):
+        probe = StageCache(os.path.join(self.__dir.name, 'probe'), 1024 * 1024)
+        self.addCleanup(probe.close)
+        probe.put('key', AGENT_NAME, 'stage-0', result_of('0'), {}, {})
+        entry_size = probe.get_size()
+
+        cache = StageCache(os.path.join(self.__dir.name, 'cache'), entry_size * 2)
+        self.addCleanup(cache.close)
+        cache.put('key-0', AGENT_NAME, 'stage-0', result_of('0'), {}, {})
+        cache.put('key-1', AGENT_NAME, 'stage-0', result_of('1'), {}, {})
+        # Now key-1 is the least recently used
+        cache.get('key-0', {})
+        cache.put('key-2', AGENT_NAME, 'stage-0', result_of('2'), {}, {})
+
+        self.assertIsNotNone(cache.get('key-0', {}))
+        self.assertIsNone(cache.get('key-1', {}))
+        self.assertIsNotNone(cache.get('key-2', {}))
+        self.assertLessEqual(cache.get_size(), entry_size * 2)
+
+    def test_key_changes_with_content_of_referenced_file(self):
+        path = os.path.join(self.__dir.name, 'input.txt')
+        with open(path, 'w') as file:
+            file.write('first')
+        config = {'stage-items': {'item-0': {'actions': [f'read_file "{path}"']}}}
+        first = stage_cache_key(AGENT_NAME, 'stage-0', config, {}, {})
+        self.assertEqual(first, stage_cache_key(AGENT_NAME, 'stage-0', config, {}, {}))
+
+        with open(path, 'w') as file:
+            file.write('second')
+        self.assertNotEqual(first, stage_cache_key(AGENT_NAME, 'stage-0', config, {}, {}))
+
+    def test_cached_stage_is_not_executed_again(self):
+        cache = StageCache(os.path.join(self.__dir.name, 'cache'), 1024 * 1024)
+        self.addCleanup(cache.close)
+        FileWritingAgent.executed = []
+        with mock.patch('aideas.app.agent.agent.get_stage_cache', return_value=cache):
+            FileWritingAgent(AGENT_NAME, AGENT_CONFIG).run(RunContext({}, {}))
+            # The output dir of the agent is cleared, before this run
+            agent = FileWritingAgent(AGENT_NAME, AGENT_CONFIG)
+            result = agent.run(RunContext({}, {}))
+
+        self.assertEqual(['stage-0', 'stage-1', 'stage-1'], FileWritingAgent.executed)
+        self.assertEqual('result of stage-0',
+                         result.get_element_results('stage-0').get_action_result('item-0', 'noop')
+                         .get_result())
+        with open(os.path.join(agent.get_results_dir(), 'stage-0', 'output.txt')) as file:
+            self.assertEqual('output of stage-0', file.read())
+
+    def test_only_files_output_by_the_stage_are_cached(self):
+        cache = StageCache(os.path.join(self.__dir.name, 'cache'), 1024 * 1024)
+        self.addCleanup(cache.close)
+        stage_output = get_content_dir('stage-output.txt')
+        other_output = get_content_dir('other-agent-output.txt')
+        for path in [stage_output, other_output]:
+            self.addCleanup(lambda p=path: os.path.exists(p) and os.remove(p))
+        ContentWritingAgent.executed = []
+        with mock.patch('aideas.app.agent.agent.get_stage_cache', return_value=cache):
+            ContentWritingAgent(AGENT_NAME, AGENT_CONFIG).run(RunContext({}, {}))
+            os.remove(stage_output)
+            os.remove(other_output)
+            ContentWritingAgent(AGENT_NAME, AGENT_CONFIG).run(RunContext({}, {}))
+
+        self.assertEqual(['stage-0', 'stage-1', 'stage-1'], ContentWritingAgent.executed)
+        self.assertTrue(os.path.isfile(stage_output))
+        self.assertFalse(os.path.isfile(other_output))
+
+    def test_key_does_not_change_with_values_of_the_context_forked(self):
+        cache = StageCache(os.path.join(self.__dir.name, 'cache'), 1024 * 1024)
+        self.addCleanup(cache.close)
+        FileWritingAgent.executed = []
+        with mock.patch('aideas.app.agent.agent.get_stage_cache', return_value=cache):
+            FileWritingAgent(AGENT_NAME, AGENT_CONFIG).run(RunContext({}, {}).fork())
+            run_context = RunContext({}, {})
+            # As set by an agent running at the same time
+            run_context.set('other-agent-value', 'value of other agent')
+            FileWritingAgent(AGENT_NAME, AGENT_CONFIG).run(run_context.fork())
+
+        self.assertEqual(['stage-0', 'stage-1', 'stage-1'], FileWritingAgent.executed)
+
+if __name__ == '__main__':
+    unittest.main()
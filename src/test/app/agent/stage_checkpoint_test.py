@@ -0,0 +1,106 @@
+import os
+import pickle
+import tempfile
+import unittest
+from unittest import mock
+
+from aideas.app.action.action import Action
+from aideas.app.action.action_result import ActionResult
+from aideas.app.agent.agent import Agent
+from aideas.app.agent.stage_checkpoint import StageCheckpoints
+from aideas.app.config import AgentConfig, Name, RunArg
+from aideas.app.result.result_set import ElementResultSet
+from aideas.app.run_context import RunContext
+
+AGENT_NAME = 'test-agent'
+
+AGENT_CONFIG = {'clear-output-dir': False,
+                'stages': {'stage-0': {'stage-items': {'item-0': {'actions': ['noop']}}},
+                           'stage-1': {'stage-items': {'item-0': {'actions': ['noop']}}}}}
+
+
+class CrashingAgent(Agent):
+    """Sets a context value at each stage, and crashes at the stage set to crash at."""
+    executed: list[str] = []
+    crash_at: str = None
+
+    def _execute(self, config: AgentConfig, stage: Name, run_context: RunContext) -> ElementResultSet:
+        CrashingAgent.executed.append(stage.id)
+        if stage.id == CrashingAgent.crash_at:
+            raise RuntimeError(f'Crashed at: {stage.id}')
+        run_context.set(f'{stage.id}-value', f'value of {stage.id}')
+        action = Action(AGENT_NAME, stage.id, 'item-0', 'noop', [])
+        run_context.add_action_result(ActionResult(action, True, f'result of {stage.id}'))
+        return run_context.get_element_results(AGENT_NAME, stage.id)
+
+
+class StageCheckpointTest(unittest.TestCase):
+    def setUp(self):
+        self.__dir = tempfile.TemporaryDirectory()
+        self.__checkpoints = StageCheckpoints(self.__dir.name)
+        patcher = mock.patch('aideas.app.agent.agent.get_stage_checkpoints',
+                             return_value=self.__checkpoints)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.__dir.cleanup)
+        CrashingAgent.executed = []
+
+    def test_resume_skips_completed_stages_and_restores_results_and_values(self):
+        CrashingAgent.crash_at = 'stage-1'
+        with self.assertRaises(RuntimeError):
+            CrashingAgent(AGENT_NAME, AGENT_CONFIG).run(RunContext({}, {}))
+        CrashingAgent.crash_at = None
+
+        run_context = RunContext({}, {RunArg.RESUME.value: True})
+        result = CrashingAgent(AGENT_NAME, AGENT_CONFIG).run(run_context)
+
+        self.assertEqual(['stage-0', 'stage-1', 'stage-1'], CrashingAgent.executed)
+        self.assertTrue(result.is_successful())
+        self.assertEqual('result of stage-0',
+                         result.get_element_results('stage-0').get_action_result('item-0', 'noop')
+                         .get_result())
+        self.assertEqual('value of stage-0', run_context.get('stage-0-value'))
+        # Removed once all stages succeed
+        self.assertEqual([], os.listdir(self.__dir.name))
+
+    def test_without_resume_all_stages_are_run(self):
+        CrashingAgent.crash_at = 'stage-1'
+        with self.assertRaises(RuntimeError):
+            CrashingAgent(AGENT_NAME, AGENT_CONFIG).run(RunContext({}, {}))
+        CrashingAgent.crash_at = None
+
+        CrashingAgent(AGENT_NAME, AGENT_CONFIG).run(RunContext({}, {}))
+
+        self.assertEqual(['stage-0', 'stage-1', 'stage-0', 'stage-1'], CrashingAgent.executed)
+
+    def test_checkpoint_has_only_the_values_set_by_the_stages(self):
+        run_context = RunContext({}, {})
+        run_context.set('other-agent-value', 'value of other agent')
+        CrashingAgent.crash_at = 'stage-1'
+        with self.assertRaises(RuntimeError):
+            CrashingAgent(AGENT_NAME, AGENT_CONFIG).run(run_context.fork())
+
+        [filename] = os.listdir(self.__dir.name)
+        with open(os.path.join(self.__dir.name, filename), 'rb') as file:
+            checkpoint = pickle.load(file)
+        self.assertEqual({'stage-0-value': 'value of stage-0'}, checkpoint.get('stage-0').values)
+
+    def test_runs_with_other_run_args_do_not_overwrite_each_others_checkpoint(self):
+        CrashingAgent.crash_at = 'stage-1'
+        for language_code in ['en', 'fr']:
+            with self.assertRaises(RuntimeError):
+                CrashingAgent(AGENT_NAME, AGENT_CONFIG).run(
+                    RunContext({}, {RunArg.INPUT_LANGUAGE_CODE.value: language_code}))
+        CrashingAgent.crash_at = None
+        CrashingAgent.executed = []
+
+        CrashingAgent(AGENT_NAME, AGENT_CONFIG).run(RunContext(
+            {}, {RunArg.INPUT_LANGUAGE_CODE.value: 'en', RunArg.RESUME.value: True}))
+
+        self.assertEqual(['stage-1'], CrashingAgent.executed)
+        # That of the run with the other run args is kept
+        self.assertEqual(1, len(os.listdir(self.__dir.name)))
+
+
+if __name__ == '__main__':
+    unittest.main()
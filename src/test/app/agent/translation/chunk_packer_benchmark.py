@@ -0,0 +1,103 @@
+import os
+import time
+import unittest
+
+import webvtt
+
+from aideas.app.agent.translation.chunk_packer import encoded_size
+from aideas.app.agent.translation.translator import Translator, TextLines
+from test.app.agent.translation.stub_translation_service import StubTranslationService
+
+CONTENT_DIR = os.path.join('test', 'resources', 'test-content')
+
+# The fixtures are short, so we repeat them to get many chunks.
+REPEAT = 40
+
+CHUNK_SIZE = 2000
+
+SEPARATOR = ' ~~~ '
+
+# Per request, to simulate the latency of a remote service.
+DELAY_SECONDS = 0.02
+
+
+def legacy_chunkify(text_list: list[str], chunk_size: int) -> list[list[str]]:
+    # The packing which preceded ChunkPacker: greedy by characters, dropping oversize lines.
+    text_size = 0
+    result_list = []
+    chunk = []
+    for line in text_list:
+        line = line.strip()
+        if text_size + len(line) < chunk_size:
+            chunk.append(line)
+            text_size += len(line)
+        elif chunk and len(line) < chunk_size:
+            result_list.append(chunk)
+            chunk = [line]
+            text_size = len(line)
+    result_list.append(chunk)
+    return result_list
+
+
+def count_over_budget(chunks: list[list[str]], request_overhead: int) -> int:
+    # The size of each request, once encoded, is that of its text and of the rest of it.
+    return len([e for e in chunks
+                if request_overhead + encoded_size(SEPARATOR.join(e)) > CHUNK_SIZE])
+
+
+def load_fixtures() -> dict[str, list[str]]:
+    with open(os.path.join(CONTENT_DIR, 'video.txt')) as file:
+        text_lines = TextLines(file.read()).get_lines_without_breaks()
+    captions = [str(c.text).replace('\n', ' ')
+                for c in webvtt.read(os.path.join(CONTENT_DIR, 'subtitles.vtt'))]
+    # Oversize lines, as when a paragraph has no line breaks.
+    paragraph = [' '.join(text_lines * 4)]
+    return {
+        'text': text_lines * REPEAT,
+        'subtitles': captions * REPEAT,
+        'paragraphs': paragraph * REPEAT
+    }
+
+
+class ChunkPackerBenchmark(unittest.TestCase):
+    """
+    Compares the legacy packing with that of ChunkPacker, by request count, requests over the
+    budget once encoded, and lines dropped. Then translates each fixture via a stub service.
+    """
+    def test_request_count_and_latency(self):
+        stub = StubTranslationService(delay_seconds=DELAY_SECONDS)
+        try:
+            translator = Translator(stub.url, CHUNK_SIZE, 'benchmark', max_concurrency=1)
+            request_overhead = Translator.get_request_overhead(stub.url)
+            for name, lines in load_fixtures().items():
+                legacy = [e for e in legacy_chunkify(lines, CHUNK_SIZE) if e]
+                legacy_over = count_over_budget(legacy, request_overhead)
+                legacy_dropped = len(lines) - sum(len(e) for e in legacy)
+
+                packing = translator._pack(lines)
+                packed_over = count_over_budget(packing.chunks, request_overhead)
+                packed_dropped = len([e for e in packing.pieces_per_line if e < 1])
+
+                requests_before = stub.requests
+                start_time = time.time()
+                result = translator.translate(lines, 'en', 'de')
+                seconds = time.time() - start_time
+                requests = stub.requests - requests_before
+
+                print(f'\n{name}: {len(lines)} lines, chunk size: {CHUNK_SIZE}'
+                      f'\n  legacy: {len(legacy)} requests, {legacy_over} over budget, '
+                      f'{legacy_dropped} lines dropped'
+                      f'\n  packed: {requests} requests, {packed_over} over budget, '
+                      f'{packed_dropped} lines dropped, {seconds:.3f} seconds')
+
+                self.assertEqual(0, packed_over)
+                self.assertEqual(0, packed_dropped)
+                self.assertEqual(len(lines), len(result))
+                self.assertEqual(packing.get_request_count(), requests)
+            self.assertLessEqual(stub.max_request_size, CHUNK_SIZE)
+        finally:
+            stub.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+
+from aideas.app.agent.translation.chunk_packer import ChunkPacker, encoded_size
+
+SEPARATOR = ' ~~~ '
+
+
+def chunk_size(chunk: list[str]) -> int:
+    return encoded_size(SEPARATOR.join(chunk))
+
+
+class ChunkPackerTest(unittest.TestCase):
+    def test_pack_fills_chunks_in_order(self):
+        lines = ['one', 'two', 'three', 'four']
+        packing = ChunkPacker(13, SEPARATOR).pack(lines)
+        self.assertEqual([['one', 'two'], ['three'], ['four']], packing.chunks)
+        self.assertEqual(['1', '2', '3', '4'], packing.join([['1', '2'], ['3'], ['4']]))
+
+    def test_pack_budgets_on_encoded_size(self):
+        # Each of these characters is 6 characters once encoded
+        lines = ['привіт', 'світе']
+        packing = ChunkPacker(70, SEPARATOR).pack(lines)
+        self.assertEqual([['привіт'], ['світе']], packing.chunks)
+        for chunk in packing.chunks:
+            self.assertLessEqual(chunk_size(chunk), 70)
+
+    def test_pack_splits_oversize_line_at_sentence_boundaries(self):
+        line = 'First sentence here. Second sentence here! Third one?'
+        packing = ChunkPacker(25, SEPARATOR).pack(['Before.', line])
+        pieces = [piece for chunk in packing.chunks for piece in chunk]
+        self.assertEqual(['Before.', 'First sentence here.', 'Second sentence here!',
+                          'Third one?'], pieces)
+        for chunk in packing.chunks:
+            self.assertLessEqual(chunk_size(chunk), 25)
+        translated = [[e.upper() for e in chunk] for chunk in packing.chunks]
+        self.assertEqual(['BEFORE.', line.upper()], packing.join(translated))
+
+    def test_pack_splits_oversize_sentence_at_words_then_chars(self):
+        packing = ChunkPacker(12, SEPARATOR).pack(['a b c d e f', 'abcdefghijklmnopqrstuvwxyz'])
+        pieces = [piece for chunk in packing.chunks for piece in chunk]
+        self.assertEqual(['a b c d e f', 'abcdefghijkl', 'mnopqrstuvwx', 'yz'], pieces)
+        self.assertEqual([1, 3], packing.pieces_per_line)
+
+    def test_join_given_merged_lines_returns_none(self):
+        packing = ChunkPacker(100, SEPARATOR).pack(['one', 'two'])
+        self.assertIsNone(packing.join([['one two']]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+
+class StubTranslationService:
+    """
+    A local translation service, which translates each ~~~ separated segment of the text to
+    <target language>:<segment in upper case>, in the response format of
+    translate.googleapis.com. The first ``failures`` requests are answered with ``status``.
+    """
+    def __init__(self, delay_seconds: float = 0, failures: int = 0, status: int = 429):
+        self.delay_seconds = delay_seconds
+        self.failures = failures
+        self.status = status
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.max_request_size = 0
+        self.lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with stub.lock:
+                    stub.requests += 1
+                    stub.in_flight += 1
+                    stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+                    stub.max_request_size = max(stub.max_request_size,
+                                                len(stub.origin) + len(self.path))
+                    fail = stub.requests <= stub.failures
+                try:
+                    time.sleep(stub.delay_seconds)
+                    if fail:
+                        self.send_response(stub.status)
+                        self.send_header('Retry-After', '0')
+                        self.end_headers()
+                        return
+                    query = parse_qs(urlparse(self.path).query)
+                    text = query['q'][0]
+                    translated = ' ~~~ '.join(
+                        f"{query['tl'][0]}:{e.strip().upper()}" for e in text.split('~~~'))
+                    body = json.dumps([[[translated, text]]]).encode()
+                    self.send_response(200)
+                    self.send_header('Content-Type', 'application/json')
+                    self.send_header('Content-Length', str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                finally:
+                    with stub.lock:
+                        stub.in_flight -= 1
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.origin = f'http://127.0.0.1:{self.server.server_address[1]}'
+        self.url = f'{self.origin}/translate_a/single'
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,75 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from unittest.mock import MagicMock
+
+import webvtt
+
+from aideas.app.action.actions import TranslateSubtitlesAction
+from aideas.app.agent.translation.subtitles import group_captions, read_captions
+
+SUBTITLES_FILE = os.path.join('test', 'resources', 'test-content', 'subtitles.vtt')
+
+
+def translate(lines: list[str], _: str, to_lang: str) -> list[str]:
+    return [f'{to_lang}:{line}' for line in lines]
+
+
+class SubtitlesTest(unittest.TestCase):
+    def setUp(self):
+        self.__dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.__dir.cleanup()
+
+    def test_read_captions_reads_as_webvtt_does(self):
+        expected = [(c.start, c.end, c.text) for c in webvtt.read(SUBTITLES_FILE)]
+        result = [(c.start, c.end, c.text) for c in read_captions(SUBTITLES_FILE)]
+        self.assertEqual(expected, result)
+
+    def test_group_captions_groups_sentences(self):
+        captions = [webvtt.Caption('00:00:00.000', '00:00:01.000', 'Let us'),
+                    webvtt.Caption('00:00:01.000', '00:00:02.000', 'learn about'),
+                    webvtt.Caption('00:00:02.000', '00:00:03.000', 'captions.'),
+                    webvtt.Caption('00:00:03.000', '00:00:04.000', 'Yes!'),
+                    webvtt.Caption('00:00:04.000', '00:00:05.000', 'No end')]
+        groups = [(c.start, c.end, c.text) for c in group_captions(captions)]
+        self.assertEqual([('00:00:00.000', '00:00:03.000', 'Let uslearn about captions.'),
+                          ('00:00:03.000', '00:00:04.000', 'Yes!'),
+                          ('00:00:04.000', '00:00:05.000', 'No end')], groups)
+
+    def test_translate_resumes_from_last_written_caption(self):
+        filepath_in = os.path.join(self.__dir.name, 'subtitles.vtt')
+        shutil.copyfile(SUBTITLES_FILE, filepath_in)
+        filepath_out = os.path.join(self.__dir.name, 'subtitles.de.vtt')
+        group_count = len(list(group_captions(read_captions(filepath_in))))
+
+        translator = MagicMock()
+        translator.translate.side_effect = [['a', 'b'], Exception('Failed')]
+        action = TranslateSubtitlesAction(translator)
+
+        with mock.patch('aideas.app.action.actions.SUBTITLES_BATCH_SIZE', 2):
+            with self.assertRaises(Exception):
+                action._translate(filepath_in, [filepath_out], 'en', 'de')
+            self.assertFalse(os.path.exists(filepath_out))
+            self.assertEqual(2, len(list(read_captions(f'{filepath_out}.part'))))
+
+            translator.translate.side_effect = translate
+            action._translate(filepath_in, [filepath_out], 'en', 'de')
+
+        # Only the captions not written before the failure were translated, after it
+        translated = [line for call in translator.translate.call_args_list[2:] for line in call[0][0]]
+        self.assertEqual(group_count - 2, len(translated))
+
+        result = list(read_captions(filepath_out))
+        expected = list(group_captions(read_captions(filepath_in)))
+        self.assertEqual([(c.start, c.end) for c in expected], [(c.start, c.end) for c in result])
+        self.assertEqual(['a', 'b'], [c.text for c in result[:2]])
+        self.assertEqual([f'de:{c.text}' for c in expected[2:]], [c.text for c in result[2:]])
+        self.assertFalse(os.path.exists(f'{filepath_out}.part'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import threading
+import time
+import unittest
+
+from aideas.app.agent.translation.translation_client import TranslationClient, \
+    TranslationServiceError
+from aideas.app.agent.translation.translator import Translator
+from test.app.agent.translation.stub_translation_service import StubTranslationService
+
+
+class TranslationClientTest(unittest.TestCase):
+    def test_get_json_retries_after_too_many_requests(self):
+        stub = StubTranslationService(failures=2, status=429)
+        try:
+            client = TranslationClient(stub.url, 'test', backoff_seconds=0.01)
+            result = client.get_json({'q': 'hello', 'tl': 'de'})
+            self.assertEqual('de:HELLO', result[0][0][0])
+            self.assertEqual(3, stub.requests)
+        finally:
+            stub.close()
+
+    def test_get_json_given_persistent_server_error_raises(self):
+        stub = StubTranslationService(failures=10, status=503)
+        try:
+            client = TranslationClient(stub.url, 'test', max_retries=2, backoff_seconds=0.01)
+            with self.assertRaises(TranslationServiceError):
+                client.get_json({'q': 'hello', 'tl': 'de'})
+            self.assertEqual(3, stub.requests)
+        finally:
+            stub.close()
+
+    def test_translate_chunks_concurrently_keeping_order(self):
+        stub = StubTranslationService(delay_seconds=0.2)
+        try:
+            # 10 more than the size of a request without text puts each line in a chunk of its own.
+            translator = Translator(
+                stub.url, Translator.get_request_overhead(stub.url) + 10, 'test', max_concurrency=4)
+            lines = [f'line {i}' for i in range(8)]
+
+            start_time = time.time()
+            result = translator.translate(lines, 'en', 'de')
+            time_spent = time.time() - start_time
+
+            self.assertEqual([f'de:LINE {i}' for i in range(8)], result)
+            self.assertEqual(8, stub.requests)
+            self.assertEqual(4, stub.max_in_flight)
+            # Serially, this would take 8 x 0.2 seconds
+            self.assertLess(time_spent, 1.2)
+        finally:
+            stub.close()
+
+    def test_translate_languages_and_chunks_share_one_bounded_executor(self):
+        stub = StubTranslationService(delay_seconds=0.05)
+        try:
+            translator = Translator(
+                stub.url, Translator.get_request_overhead(stub.url) + 10, 'test', max_concurrency=2)
+            lines = [f'line {i}' for i in range(3)]
+
+            threads = set()
+
+            def translate(lang: str) -> list[str]:
+                threads.add(threading.get_ident())
+                return translator.translate(lines, 'en', lang)
+
+            result = translator.map(translate, ['de', 'fr', 'it'])
+            translator.close()
+
+            self.assertEqual([[f'{lang}:LINE {i}' for i in range(3)] for lang in ['de', 'fr', 'it']],
+                             result)
+            self.assertEqual(9, stub.requests)
+            self.assertLessEqual(stub.max_in_flight, 2)
+            self.assertLessEqual(len(threads), 2)
+        finally:
+            stub.close()
+
+    def test_given_different_max_concurrency_for_same_url_warns(self):
+        url = 'http://localhost:1/max-concurrency-test'
+        self.assertEqual(3, TranslationClient(url, 'test', max_concurrency=3).get_max_concurrency())
+        with self.assertLogs('aideas.app.agent.translation.translation_client', 'WARNING'):
+            client = TranslationClient(url, 'test', max_concurrency=5)
+        self.assertEqual(3, client.get_max_concurrency())
+
+
+if __name__ == '__main__':
+    unittest.main()
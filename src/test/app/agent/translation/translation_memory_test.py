@@ -0,0 +1,54 @@
+import os
+import tempfile
+import unittest
+
+from aideas.app.agent.translation.translation_memory import TranslationMemory
+from aideas.app.agent.translation.translator import Translator
+from test.app.agent.translation.stub_translation_service import StubTranslationService
+
+
+class TranslationMemoryTest(unittest.TestCase):
+    def setUp(self):
+        self.__dir = tempfile.TemporaryDirectory()
+        self.__memory = TranslationMemory(os.path.join(self.__dir.name, 'translation-memory.db'))
+
+    def tearDown(self):
+        self.__memory.close()
+        self.__dir.cleanup()
+
+    def test_get_all_finds_translations_of_normalized_segments(self):
+        self.__memory.put_all(['Hello  world', 'Bye'], ['Hallo Welt', 'Tschüss'], 'en', 'de')
+
+        result = self.__memory.get_all([' Hello world ', 'New', 'Bye'], 'en', 'de')
+
+        self.assertEqual(['Hallo Welt', None, 'Tschüss'], result)
+        self.assertEqual([None], self.__memory.get_all(['Bye'], 'en', 'fr'))
+        stats = self.__memory.get_stats()
+        self.assertEqual(2, stats['hits'])
+        self.assertEqual(2, stats['misses'])
+        self.assertEqual(0.5, stats['hit-rate'])
+        self.assertEqual(len(' Hello world Bye'), stats['bytes-saved'])
+
+    def test_translate_sends_only_lines_not_in_memory(self):
+        stub = StubTranslationService()
+        try:
+            translator = Translator(stub.url, 10000, 'test', memory=self.__memory)
+            text = 'Line one.\nLine two.\n\nLine three.'
+
+            first = translator.translate(text, 'en', 'de')
+            self.assertEqual('de:LINE ONE.\nde:LINE TWO.\n\nde:LINE THREE.', first)
+            self.assertEqual(1, stub.requests)
+
+            self.assertEqual(first, translator.translate(text, 'en', 'de'))
+            self.assertEqual(1, stub.requests)
+
+            edited = translator.translate('Line one.\nLine 2.\n\nLine three.', 'en', 'de')
+            self.assertEqual('de:LINE ONE.\nde:LINE 2.\n\nde:LINE THREE.', edited)
+            self.assertEqual(2, stub.requests)
+            self.assertEqual(4, self.__memory.get_stats()['misses'])
+        finally:
+            stub.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
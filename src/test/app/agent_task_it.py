@@ -2,7 +2,7 @@ import logging.config
 import unittest
 
 from aideas.app.config import RunArg
-from aideas.app.task import AgentTask
+from aideas.app.task import AgentTask, ProcessTask
 from test_functions import get_main_config_loader, init_logging
 
 init_logging(logging.config)
@@ -14,6 +14,12 @@ class AgentTaskIT(unittest.TestCase):
         # print(f'{result.pretty_str()}')
         self.assertTrue(result.is_successful())
 
+    def test_run_in_process(self):
+        task = ProcessTask.of(given_task(["test-agent"]))
+        result = task.start()
+        self.assertTrue(result.is_successful())
+        self.assertTrue(task.get_progress()["test-agent"].endswith("SUCCESS"))
+
 
 def given_task(agent_names: list[str] = None) -> AgentTask:
     config_loader = get_main_config_loader()
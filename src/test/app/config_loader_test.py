@@ -1,5 +1,7 @@
 from unittest import mock
 
+import os
+import tempfile
 import unittest
 
 from aideas.app.config import RunArg
@@ -47,5 +49,36 @@ class ConfigLoaderTest(unittest.TestCase):
             config_2_val = config_2[RunArg.SHARE_COVER_IMAGE.value]
             self.assertNotEqual(config_1_val, config_2_val)
 
+    def test_parsed_config_is_reloaded_when_file_changes(self):
+        with tempfile.TemporaryDirectory() as config_dir:
+            agent_dir = os.path.join(config_dir, 'agent')
+            os.makedirs(agent_dir)
+            parent_path = os.path.join(agent_dir, 'parent.config.yaml')
+            child_path = os.path.join(agent_dir, 'child.config.yaml')
+            ConfigLoaderTest.write(parent_path, 'one: parent\ntwo: parent\n')
+            ConfigLoaderTest.write(child_path, 'extends: parent\ntwo: child\n')
+            config_loader = ConfigLoader(config_dir, {'key': 'value'})
+
+            config = config_loader.load_from_path(child_path)
+            self.assertEqual({'one': 'parent', 'two': 'child'}, config)
+
+            # Callers may modify what they are given, without affecting the cache
+            config['one'] = 'modified'
+            self.assertEqual('parent', config_loader.load_from_path(child_path)['one'])
+
+            ConfigLoaderTest.write(parent_path, 'one: changed\ntwo: parent\n', 1)
+            self.assertEqual('changed', config_loader.load_from_path(child_path)['one'])
+
+            ConfigLoaderTest.write(child_path, 'extends: parent\ntwo: changed\n', 2)
+            self.assertEqual('changed', config_loader.load_from_path(child_path)['two'])
+
+    @staticmethod
+    def write(path: str, content: str, seconds_later: int = 0):
+        with open(path, 'w') as file:
+            file.write(content)
+        # Make sure the modification time changes, whatever the resolution of the file system
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + seconds_later * 1_000_000_000))
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,80 @@
+import os
+import tempfile
+import unittest
+
+from aideas.app.action.action import Action
+from aideas.app.action.action_result import ActionResult
+from aideas.app.result.result_index import latency_bucket, latency_bucket_upper_bound, to_day
+from aideas.app.result.result_set import StageResultSet
+from aideas.app.result.result_store import ResultStore
+
+
+def result_set(agent: str, *results: tuple[str, str, bool]) -> StageResultSet:
+    stage_result_set = StageResultSet()
+    for stage, stage_item, success in results:
+        action = Action(agent, stage, stage_item, 'click', [])
+        stage_result_set.add_action_result(ActionResult(action, success))
+    return stage_result_set
+
+
+class ResultIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.__dir = tempfile.TemporaryDirectory()
+        self.__db_path = os.path.join(self.__dir.name, 'results.db')
+        self.__blobs_dir = os.path.join(self.__dir.name, 'blobs')
+        self.__store = ResultStore(self.__db_path, self.__blobs_dir)
+        self.__store.save('youtube', result_set('youtube',
+                                                ('login', 'username', True),
+                                                ('post', 'upload', True)), duration_seconds=10)
+        self.__store.save('youtube', result_set('youtube',
+                                                ('login', 'username', True),
+                                                ('post', 'upload', False),
+                                                ('post', 'upload', True)), duration_seconds=20)
+        self.__store.save('youtube', result_set('youtube',
+                                                ('login', 'username', False)), duration_seconds=30)
+        self.__store.save('reddit', result_set('reddit', ('post', 'submit', False)))
+
+    def tearDown(self):
+        self.__store.close()
+        self.__dir.cleanup()
+
+    def test_get_agent_stats(self):
+        stats = self.__store.get_index().get_agent_stats()
+
+        self.assertEqual(['reddit', 'youtube'], [e['agent'] for e in stats])
+        youtube = stats[1]
+        self.assertEqual(3, youtube['runs'])
+        self.assertEqual(1, youtube['successes'])
+        self.assertEqual(0.3333, youtube['success-rate'])
+        self.assertEqual({'p50': latency_bucket_upper_bound(latency_bucket(20)),
+                          'p90': latency_bucket_upper_bound(latency_bucket(30)),
+                          'p99': latency_bucket_upper_bound(latency_bucket(30))},
+                         youtube['latency-seconds'])
+        self.assertLessEqual(20, youtube['latency-seconds']['p50'])
+        self.assertGreater(20 * 1.2, youtube['latency-seconds']['p50'])
+        self.assertEqual({'p50': None, 'p90': None, 'p99': None}, stats[0]['latency-seconds'])
+
+    def test_get_stage_stats_and_failure_hotspots(self):
+        index = self.__store.get_index()
+
+        stages = index.get_stage_stats(agent='youtube')
+        self.assertEqual([('login', 3, 2), ('post', 2, 1)],
+                         [(e['stage'], e['runs'], e['successes']) for e in stages])
+
+        hotspots = index.get_failure_hotspots()
+        self.assertEqual([('reddit', 'submit', 1, 1), ('youtube', 'username', 3, 1),
+                          ('youtube', 'upload', 2, 1)],
+                         [(e['agent'], e['stage-item'], e['runs'], e['failures']) for e in hotspots])
+        self.assertEqual(1, len(index.get_failure_hotspots(limit=1, offset=2)))
+
+    def test_filter_by_day(self):
+        today = to_day(self.__store.find_runs(limit=1)[0].created_at)
+        index = self.__store.get_index()
+
+        self.assertEqual(2, len(index.get_agent_stats(since=today, until=today)))
+        self.assertEqual([], index.get_agent_stats(until='2000-01-01'))
+        self.assertEqual([], index.get_failure_hotspots(since='2999-01-01'))
+
+
+if __name__ == '__main__':
+    unittest.main()
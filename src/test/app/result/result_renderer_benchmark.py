@@ -0,0 +1,80 @@
+import time
+import tracemalloc
+import unittest
+from collections.abc import Iterable
+
+from aideas.app.action.action import Action
+from aideas.app.action.action_result import ActionResult
+from aideas.app.result.result_renderer import ResultFormat, render
+from aideas.app.result.result_set import AgentResultSet, ResultSet
+
+STAGES = 10
+STAGE_ITEMS = 100
+ACTIONS_PER_STAGE_ITEM = 10
+
+
+def legacy_pretty_str(result_set: ResultSet, separator: str, tab: str, offset: int = 0) -> str:
+    # The rendering which preceded the renderer: one string, concatenated, recursively.
+    output: str = ''
+    for key in result_set.keys():
+        output = f'{output}{separator}{tab * offset}{key}'
+        value = result_set.get(key)
+        if isinstance(value, ResultSet):
+            output = f'{output}{legacy_pretty_str(value, separator, tab, offset + 1)}'
+        elif isinstance(value, Iterable):
+            for e in value:
+                output = f'{output}{separator}{tab * (offset + 1)}{e}'
+    return output
+
+
+def legacy_to_html(result_set: ResultSet) -> str:
+    return (legacy_pretty_str(result_set, "\n", "&emsp;&emsp;")
+            .replace("ActionResult(", "(")
+            .replace(", Action(", ", (")
+            .replace(", result: None)", ")")
+            .replace(", result: ResultSet(success-rate=0/0))", ")")
+            .replace("(success=True,", '(<span style="color:green">SUCCESS</span>,')
+            .replace("(success=False,", '(<span style="color:red">FAILURE</span>,')
+            .replace("\n", "<br/>"))
+
+
+def stream_html(result_set: ResultSet) -> int:
+    # As a streamed response does: each fragment is written, then discarded.
+    return sum(len(fragment) for fragment in render(result_set, ResultFormat.HTML))
+
+
+def measure(render_html, result_set: ResultSet) -> tuple[float, int]:
+    """
+    :return: The time taken, in seconds, and the peak memory allocated, in bytes, measured apart.
+    """
+    start_time = time.perf_counter()
+    render_html(result_set)
+    duration = time.perf_counter() - start_time
+    tracemalloc.start()
+    render_html(result_set)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return duration, peak
+
+
+class ResultRendererBenchmark(unittest.TestCase):
+    def test_render_html(self):
+        result_set = AgentResultSet()
+        for stage in range(STAGES):
+            for stage_item in range(STAGE_ITEMS):
+                for i in range(ACTIONS_PER_STAGE_ITEM):
+                    action = Action('benchmark-agent', f'stage-{stage}', f'stage-item-{stage_item}',
+                                    f'action_{i}', ['//button[@aria-label="Post"]'])
+                    result_set.add_action_result(ActionResult(action, i % 7 != 0))
+
+        legacy, legacy_peak = measure(legacy_to_html, result_set)
+        current, current_peak = measure(stream_html, result_set)
+        print(f'\n{STAGES * STAGE_ITEMS * ACTIONS_PER_STAGE_ITEM} action results, html: '
+              f'legacy: {legacy * 1000:.2f} ms, {legacy_peak / 1024:.0f} KiB peak, '
+              f'streamed: {current * 1000:.2f} ms, {current_peak / 1024:.0f} KiB peak')
+        self.assertLess(current, legacy)
+        self.assertLess(current_peak, legacy_peak)
+
+
+if __name__ == '__main__':
+    unittest.main()
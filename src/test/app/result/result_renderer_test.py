@@ -0,0 +1,66 @@
+import json
+import re
+import unittest
+
+from aideas.app.action.action import Action
+from aideas.app.action.action_result import ActionResult
+from aideas.app.result.result_renderer import ResultFormat, render
+from aideas.app.result.result_set import AgentResultSet, ResultSet
+
+
+def result_set() -> AgentResultSet:
+    agent_result_set = AgentResultSet()
+    for stage, action_name, success, result in [('post', 'enter_text', True, 'password=secret'),
+                                                ('login', 'click', False, None)]:
+        action = Action('youtube', stage, f'{stage}-item', action_name, ['arg'])
+        agent_result_set.add_action_result(ActionResult(action, success, result))
+    return agent_result_set
+
+
+def redact(value: str) -> str:
+    return value.replace('secret', '***')
+
+
+class ResultRendererTest(unittest.TestCase):
+    def test_render_html(self):
+        html = ''.join(render(result_set(), ResultFormat.HTML, redact))
+
+        self.assertEqual('<br/>youtube'
+                         '<br/>&emsp;&emsp;post'
+                         '<br/>&emsp;&emsp;&emsp;&emsp;post-item'
+                         '<br/>&emsp;&emsp;&emsp;&emsp;&emsp;&emsp;'
+                         '(<span style="color:green">SUCCESS</span>, '
+                         '(post-item.enter_text arg), result=password=***)'
+                         '<br/>&emsp;&emsp;login'
+                         '<br/>&emsp;&emsp;&emsp;&emsp;login-item'
+                         '<br/>&emsp;&emsp;&emsp;&emsp;&emsp;&emsp;'
+                         '(<span style="color:red">FAILURE</span>, '
+                         '(login-item.click arg), result=None)', html)
+
+    def test_render_json(self):
+        rendered = json.loads(''.join(render(result_set(), ResultFormat.JSON, redact)))
+
+        self.assertEqual(['post', 'login'], list(rendered['youtube'].keys()))
+        self.assertEqual([{'agent': 'youtube', 'stage': 'post', 'stage-item': 'post-item',
+                           'action': 'enter_text', 'args': ['arg'], 'success': True,
+                           'result': 'password=***'}],
+                         rendered['youtube']['post']['post-item'])
+        self.assertIsNone(rendered['youtube']['login']['login-item'][0]['result'])
+
+    def test_render_text_is_pretty_str_in_order_added(self):
+        text = ''.join(render(result_set(), ResultFormat.TEXT))
+
+        self.assertEqual(result_set().pretty_str(), text)
+        self.assertLess(text.index('post-item'), text.index('login-item'))
+
+    def test_render_text_redacts_each_entry_of_a_dict_with_its_key(self):
+        results = ResultSet(lambda _: True, {'login': {'user': 'me', 'password': 'secret'}})
+
+        text = ''.join(render(results, ResultFormat.TEXT,
+                              lambda value: re.sub(r'password=\S+', 'password=***', value)))
+
+        self.assertEqual('\nlogin\n\tuser=me\n\tpassword=***', text)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import time
+import unittest
+
+from aideas.app.action.action import Action
+from aideas.app.action.action_result import ActionResult
+from aideas.app.result.result_set import ResultSet, AgentResultSet
+
+AGENT_NAME = 'benchmark-agent'
+
+ITERATIONS = [100, 200, 400, 800]
+
+# Each stage item, as run by an iteration, has a few actions.
+ACTIONS_PER_STAGE_ITEM = 3
+
+
+def legacy_failure_count(result_set: ResultSet) -> int:
+    # The count which preceded the keys of failed results: every result tested, recursively.
+    failures = 0
+    for result in result_set.values():
+        if isinstance(result, ResultSet):
+            success = result.size() > 0 and legacy_failure_count(result) == 0
+        else:
+            success = all(e.is_success() for e in result)
+        if not success:
+            failures += 1
+    return failures
+
+
+def run_stage(iterations: int, is_successful) -> float:
+    """
+    Add the results of a stage having the given iterations, asking for the status of the run
+    after each stage item, as the event handler does.
+    :return: The time taken, in seconds.
+    """
+    result_set = AgentResultSet()
+    start_time = time.perf_counter()
+    for i in range(iterations):
+        for j in range(ACTIONS_PER_STAGE_ITEM):
+            action = Action(AGENT_NAME, 'iterate', f'stage-item-{i}', f'action_{j}', [])
+            result_set.add_action_result(ActionResult(action, True))
+        is_successful(result_set)
+    return time.perf_counter() - start_time
+
+
+class ResultSetBenchmark(unittest.TestCase):
+    def test_status_after_each_stage_item(self):
+        for iterations in ITERATIONS:
+            legacy = run_stage(iterations, lambda rs: legacy_failure_count(rs) == 0)
+            current = run_stage(iterations, lambda rs: rs.is_successful())
+            print(f'\n{iterations} iterations, status after each: '
+                  f'legacy: {legacy * 1000:.2f} ms, counters: {current * 1000:.2f} ms, '
+                  f'{legacy / current:.1f}x')
+            self.assertLess(current, legacy)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,3 +1,4 @@
+import copy
 import unittest
 import uuid
 from typing import Union
@@ -171,3 +172,25 @@ class AgentResulSetTest(Common.ResultSetTest):
 
     def _create_new(self, results: Union[dict[str, any], None] = None) -> AgentResultSet:
         return AgentResultSet(results)
+
+    def test_failure_added_to_existing_stage_item_fails_parents(self):
+        result_set = self._create_new()
+        result_set.add_action_result(Common.given_success_result('stage_item'))
+        self.assertTrue(result_set.is_successful())
+
+        result_set.add_action_result(Common.given_failure_result('stage_item'))
+
+        stage_results = result_set.get_stage_results(Common.AGENT_NAME)
+        self.assertEqual(1, stage_results.get_element_results(Common.STAGE_ID).failure_count())
+        self.assertEqual(1, stage_results.failure_count())
+        self.assertEqual(1, result_set.failure_count())
+        self.assertFalse(result_set.is_successful())
+
+    def test_copy_keeps_counts_and_links_to_parents(self):
+        result_set = copy.deepcopy(self._create_with_results(1))
+        self.assertTrue(result_set.is_successful())
+
+        result_set.add_action_result(Common.given_failure_result('success_stage_item_0', 'stage_0'))
+
+        self.assertEqual(1, result_set.failure_count())
+        self.assertFalse(result_set.is_successful())
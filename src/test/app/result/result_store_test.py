@@ -0,0 +1,83 @@
+import os
+import tempfile
+import time
+import unittest
+
+from aideas.app.action.action import Action
+from aideas.app.action.action_result import ActionResult
+from aideas.app.result.result_set import StageResultSet
+from aideas.app.result.result_store import ResultStore
+
+
+def result_set(agent: str, *results: tuple[str, str, bool, object]) -> StageResultSet:
+    stage_result_set = StageResultSet()
+    for stage, action_name, success, result in results:
+        action = Action(agent, stage, f'{stage}-item', action_name, ['arg-0', 1])
+        stage_result_set.add_action_result(ActionResult(action, success, result))
+    return stage_result_set
+
+
+class ResultStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.__dir = tempfile.TemporaryDirectory()
+        self.__blobs_dir = os.path.join(self.__dir.name, 'blobs')
+        self.__store = ResultStore(':memory:', self.__blobs_dir, blob_threshold=64)
+
+    def tearDown(self):
+        self.__store.close()
+        self.__dir.cleanup()
+
+    def test_save_then_load(self):
+        saved = result_set('youtube',
+                           ('login', 'click', True, None),
+                           ('login', 'enter', True, {'text': 'user'}),
+                           ('post', 'execute', False, b'stdout'))
+        run = self.__store.save('youtube', saved, 'agent:\n  name: youtube\n')
+
+        loaded = self.__store.load(run.run_id)
+
+        self.assertFalse(run.success)
+        self.assertEqual({'login', 'post'}, loaded.keys())
+        results = [r for e in loaded.values() for rs in e.values() for r in rs]
+        self.assertEqual(['click', 'enter', 'execute'], [r.get_action().get_name() for r in results])
+        self.assertEqual(['arg-0', '1'], results[0].get_action().get_args())
+        self.assertEqual([None, {'text': 'user'}, b'stdout'], [r.get_result() for r in results])
+        self.assertEqual([True, True, False], [r.is_success() for r in results])
+        self.assertEqual('agent:\n  name: youtube\n', self.__store.get_config(run))
+
+    def test_large_payloads_are_stored_once_as_blobs(self):
+        payload = 'x' * 1000
+        run_0 = self.__store.save('youtube', result_set('youtube', ('post', 'execute', True, payload)))
+        run_1 = self.__store.save('youtube', result_set('youtube', ('post', 'execute', True, payload)))
+
+        self.assertEqual(1, sum(len(files) for _, _, files in os.walk(self.__blobs_dir)))
+        for run in [run_0, run_1]:
+            self.assertEqual(payload, self.__store.find_results(run_id=run.run_id)[0].get_result())
+
+    def test_find_runs_by_agent_success_and_date(self):
+        start = time.time()
+        self.__store.save('youtube', result_set('youtube', ('post', 'execute', False, None)))
+        self.__store.save('youtube', result_set('youtube', ('post', 'execute', True, None)))
+        self.__store.save('reddit', result_set('reddit', ('post', 'execute', False, None)))
+        failed = self.__store.save('youtube', result_set('youtube', ('post', 'execute', False, None)))
+
+        runs = self.__store.find_runs(agent='youtube', success=False, since=start)
+
+        self.assertEqual(2, len(runs))
+        self.assertEqual(failed.run_id, runs[0].run_id)
+        self.assertEqual([], self.__store.find_runs(agent='youtube', until=start))
+        self.assertEqual(1, len(self.__store.find_runs(limit=1)))
+
+    def test_find_results_by_stage(self):
+        self.__store.save('youtube', result_set('youtube',
+                                                ('login', 'click', True, None),
+                                                ('post', 'execute', False, None)))
+
+        results = self.__store.find_results(agent='youtube', stage='post')
+
+        self.assertEqual(['execute'], [r.action for r in results])
+        self.assertEqual([False], [r.success for r in results])
+
+
+if __name__ == '__main__':
+    unittest.main()
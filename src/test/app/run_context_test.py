@@ -2,6 +2,8 @@ from unittest import mock
 
 import unittest
 
+from aideas.app.action.action import Action
+from aideas.app.action.action_result import ActionResult
 from aideas.app.run_context import RunContext
 from test.app.test_functions import get_run_context
 
@@ -37,5 +39,26 @@ class RunContextTest(unittest.TestCase):
                 result = run_context.get_language_codes_str()
                 self.assertEqual(result, expect)
 
+    def test_result_listeners_are_notified_of_results_added_to_forks(self):
+        run_context = RunContext({}, {})
+        results = []
+        run_context.add_result_listener(results.append)
+        result = ActionResult(Action('test-agent', 'stage', 'stage-item', 'click', []), True)
+
+        run_context.fork().add_action_result(result)
+
+        self.assertEqual([result], results)
+        self.assertEqual(1, run_context.get_result_set().size())
+
+    def test_event_listeners_are_notified_of_events_published_to_forks(self):
+        run_context = RunContext({}, {})
+        events = []
+        run_context.add_event_listener(lambda name, data: events.append((name, data)))
+
+        run_context.fork().publish_event('post', {'platform': 'reddit', 'success': True})
+
+        self.assertEqual([('post', {'platform': 'reddit', 'success': True})], events)
+
+
 if __name__ == '__main__':
     unittest.main()
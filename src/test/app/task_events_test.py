@@ -0,0 +1,64 @@
+import threading
+import unittest
+
+from aideas.app.task_events import TaskEvents
+
+
+class TaskEventsTest(unittest.TestCase):
+    def test_all_watchers_receive_all_events_in_order(self):
+        events = TaskEvents()
+        started = threading.Barrier(4)
+        received: dict[int, list[int]] = {}
+
+        def watch(watcher: int):
+            received[watcher] = []
+            started.wait(5)
+            for event in events.watch(heartbeat_seconds=5):
+                received[watcher].append(event.data['i'])
+
+        watchers = [threading.Thread(target=watch, args=(i,)) for i in range(3)]
+        for watcher in watchers:
+            watcher.start()
+        started.wait(5)
+        for i in range(100):
+            events.publish('result', {'i': i})
+        events.close()
+        for watcher in watchers:
+            watcher.join(5)
+
+        self.assertEqual({i: list(range(100)) for i in range(3)}, received)
+
+    def test_watch_resumes_after_event_id(self):
+        events = TaskEvents()
+        for status in ['RUNNING', 'SUCCESS']:
+            events.publish('status', {'status': status})
+        events.close()
+
+        watched = list(events.watch(after_id=1))
+
+        self.assertEqual([(2, 'status', {'status': 'SUCCESS'})],
+                         [(e.event_id, e.name, e.data) for e in watched])
+        self.assertEqual('id: 2\nevent: status\ndata: {"status": "SUCCESS"}\n\n', watched[0].to_sse())
+        self.assertIsNone(events.publish('status', {'status': 'STOPPED'}))
+
+    def test_watch_yields_none_when_no_event_within_heartbeat(self):
+        events = TaskEvents()
+
+        watched = events.watch(heartbeat_seconds=0.01)
+
+        self.assertIsNone(next(watched))
+        events.publish('status', {'status': 'RUNNING'})
+        self.assertEqual('RUNNING', next(watched).data['status'])
+
+    def test_only_most_recent_events_are_kept(self):
+        events = TaskEvents(max_events=3)
+        for i in range(5):
+            events.publish('result', {'i': i})
+
+        self.assertEqual([3, 4, 5], [e.event_id for e in events.get_events()])
+        self.assertEqual([5], [e.event_id for e in events.get_events(4)])
+        self.assertEqual([], events.get_events(5))
+
+
+if __name__ == '__main__':
+    unittest.main()
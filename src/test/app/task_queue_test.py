@@ -0,0 +1,67 @@
+import threading
+import unittest
+
+from aideas.app.task_queue import TaskPriority, TaskQueue, TaskQueueFullError
+
+
+class TaskQueueTest(unittest.TestCase):
+    def test_submit_given_queue_full_raises_error(self):
+        blocked = threading.Event()
+        task_queue = TaskQueue(lambda task_id: blocked.wait(5), 4, 1)
+        try:
+            # The first task is taken by the only worker, the next 4 fill the queue.
+            for i in range(5):
+                task_queue.submit(f'task-{i}')
+                if i == 0:
+                    self.__await_size(task_queue, 0)
+            with self.assertRaises(TaskQueueFullError):
+                task_queue.submit('task-5')
+        finally:
+            blocked.set()
+            task_queue.shutdown(True, 5)
+
+    def test_submit_given_batch_priority_leaves_room_for_interactive(self):
+        blocked = threading.Event()
+        task_queue = TaskQueue(lambda task_id: blocked.wait(5), 4, 1)
+        try:
+            task_queue.submit('running')
+            self.__await_size(task_queue, 0)
+            for i in range(3):
+                task_queue.submit(f'batch-{i}', TaskPriority.BATCH)
+            with self.assertRaises(TaskQueueFullError):
+                task_queue.submit('batch-3', TaskPriority.BATCH)
+            task_queue.submit('interactive-0', TaskPriority.INTERACTIVE)
+        finally:
+            blocked.set()
+            task_queue.shutdown(True, 5)
+
+    def test_interactive_tasks_run_before_batch_tasks(self):
+        blocked = threading.Event()
+        completed = []
+
+        def run_task(task_id: str):
+            blocked.wait(5)
+            completed.append(task_id)
+
+        task_queue = TaskQueue(run_task, 10, 1)
+        task_queue.submit('running')
+        self.__await_size(task_queue, 0)
+        task_queue.submit('batch-0', TaskPriority.BATCH)
+        task_queue.submit('interactive-0', TaskPriority.INTERACTIVE)
+        task_queue.submit('batch-1', TaskPriority.BATCH)
+        blocked.set()
+        self.__await_size(task_queue, 0)
+        task_queue.shutdown(True, 5)
+        self.assertEqual(['running', 'interactive-0', 'batch-0', 'batch-1'], completed)
+
+    @staticmethod
+    def __await_size(task_queue: TaskQueue, size: int):
+        for _ in range(500):
+            if task_queue.size() == size:
+                return
+            threading.Event().wait(0.01)
+        raise AssertionError(f'Expected queue size: {size}, found: {task_queue.size()}')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import time
+import unittest
+
+from aideas.app.task_store import TaskRecord, TaskStore
+
+
+class TaskStoreTest(unittest.TestCase):
+    def test_save_then_load(self):
+        store = TaskStore(':memory:')
+        store.save(TaskRecord('task-0', ['test-agent'], 'PENDING', {'test-agent': 'PENDING'}))
+        record = store.load('task-0')
+        self.assertEqual(['test-agent'], record.agents)
+        self.assertEqual('PENDING', record.status)
+        self.assertEqual({'test-agent': 'PENDING'}, record.progress)
+
+    def test_update(self):
+        store = TaskStore(':memory:')
+        store.save(TaskRecord('task-0', ['test-agent'], 'PENDING', {'test-agent': 'PENDING'}))
+        self.assertTrue(store.update('task-0', 'RUNNING', {'test-agent': 'PENDING >> RUNNING'}))
+        record = store.load('task-0')
+        self.assertEqual('RUNNING', record.status)
+        self.assertEqual({'test-agent': 'PENDING >> RUNNING'}, record.progress)
+
+    def test_update_given_task_not_stored_returns_false(self):
+        store = TaskStore(':memory:')
+        self.assertFalse(store.update('task-0', 'RUNNING', {}))
+        self.assertIsNone(store.load('task-0'))
+
+    def test_remove(self):
+        store = TaskStore(':memory:')
+        store.save(TaskRecord('task-0', ['test-agent'], 'SUCCESS', {}))
+        self.assertTrue(store.remove('task-0'))
+        self.assertEqual([], store.load_all())
+
+    def test_prune_removes_tasks_not_kept_by_age_then_count(self):
+        store = TaskStore(':memory:')
+        now = time.time()
+        store.save(TaskRecord('old', ['test-agent'], 'SUCCESS', {}, 0, now - 100, now - 100))
+        store.save(TaskRecord('old-pending', ['test-agent'], 'PENDING', {}, 0, now - 100, now - 100))
+        store.save(TaskRecord('old-running', ['test-agent'], 'RUNNING', {}, 0, now - 100, now - 100))
+        store.save(TaskRecord('task-0', ['test-agent'], 'FAILURE', {}, 0, now - 2, now - 2))
+        store.save(TaskRecord('task-1', ['test-agent'], 'SUCCESS', {}, 0, now - 1, now - 1))
+
+        self.assertEqual(3, store.prune(50, 1, ['old-running']))
+        self.assertEqual(['old-running', 'task-1'], [e.task_id for e in store.load_all()])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from aideas.app import task as task_module
+from aideas.app.result.result_set import AgentResultSet
+
+
+class RunAgentTaskInProcessTest(unittest.TestCase):
+    @mock.patch.object(task_module, 'ConfigLoader')
+    @mock.patch.object(task_module, 'AgentFactory')
+    @mock.patch.object(task_module, 'AgentTask')
+    def test_stop_thread_ends_with_the_task(self, agent_task, *_):
+        agent_task.return_value.start.return_value = AgentResultSet()
+        agent_task.return_value.get_progress.return_value = {'test-agent': 'PENDING >> SUCCESS'}
+        progress = {}
+
+        task_module._run_agent_task_in_process('config', {}, {}, {}, progress, threading.Event())
+
+        deadline = time.time() + 5
+        while time.time() < deadline and any(e.name == 'task-stop' for e in threading.enumerate()):
+            time.sleep(0.1)
+        self.assertFalse(any(e.name == 'task-stop' for e in threading.enumerate()))
+        agent_task.return_value.stop.assert_not_called()
+        self.assertEqual({'test-agent': 'PENDING >> SUCCESS'}, progress)
+
+
+
+class ProcessTaskTest(unittest.TestCase):
+    def test_progress_is_published_while_running(self):
+        running = threading.Event()
+        may_finish = threading.Event()
+
+        def run_in_process(*args) -> AgentResultSet:
+            progress = args[4]
+            progress['test-agent'] = 'PENDING >> RUNNING'
+            running.set()
+            may_finish.wait(5)
+            progress['test-agent'] = 'PENDING >> RUNNING >> SUCCESS'
+            return AgentResultSet()
+
+        manager = mock.MagicMock(dict=dict, Event=threading.Event)
+        executor = ThreadPoolExecutor(1)
+        self.addCleanup(executor.shutdown)
+        with mock.patch.object(task_module, '_get_process_manager', return_value=manager), \
+                mock.patch.object(task_module, '_get_process_executor', return_value=executor), \
+                mock.patch.object(task_module, '_run_agent_task_in_process', run_in_process):
+            task = task_module.ProcessTask('config', {}, {}, {}, {'test-agent': 'PENDING'})
+            thread = threading.Thread(target=task.start)
+            thread.start()
+            running.wait(5)
+            time.sleep(task_module._PROGRESS_POLL_SECONDS * 2)
+            progress_while_running = [e.data['progress'] for e in task.get_events().get_events()
+                                      if e.name == 'progress']
+            may_finish.set()
+            thread.join(5)
+
+        self.assertEqual(['PENDING >> RUNNING'], progress_while_running)
+        self.assertEqual('PENDING >> RUNNING >> SUCCESS',
+                         [e.data['progress'] for e in task.get_events().get_events()
+                          if e.name == 'progress'][-1])
+
+
+class QueuedTask(task_module.Task):
+    def _start(self):
+        return None
+
+    def get_agent_names(self) -> list[str]:
+        return ['test-agent']
+
+    def get_progress(self) -> dict[str, str]:
+        return {}
+
+
+class StopTaskTest(unittest.TestCase):
+    def test_task_stopped_while_queued_is_stored_as_stopped(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        store = task_module.init_task_store(os.path.join(temp_dir.name, 'tasks.db'))
+        self.addCleanup(task_module.shutdown)
+
+        task_module.add_task('queued-task', QueuedTask())
+        task_module.stop_task('queued-task')
+
+        self.assertEqual('STOPPED', store.load('queued-task').status)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import time
+import unittest
+
+from aideas.app import text
+from aideas.app.text import split_preserving_quotes
+
+# Action signatures as written in agent configs, the last with $TEXT_CONTENT expanded
+CONTENT = ' '.join(["Never have I ever played the game, 'not once'."] * 100)
+SIGNATURES = ['click "Sign in"',
+              'enter_text_at "#username" $USERNAME',
+              "wait_until_visible '//button[@aria-label=\"Post\"]' 30",
+              'open_url https://example.com/compose?draft=true',
+              'press_keys [\'ctrl\', "enter"]',
+              f'enter_text "{CONTENT}"']
+
+REPEATS = 200
+
+
+def legacy_split_preserving_quotes(value: str, separator: str = ' ') -> list:
+    # The tokenizer which preceded the scan by regex: one char at a time.
+    result_list = []
+    current = ""
+    in_single_quotes = False
+    in_double_quotes = False
+    i = 0
+    while i < len(value):
+        char = value[i]
+        if char == '"' and not in_single_quotes:
+            in_double_quotes = not in_double_quotes
+            current += char
+        elif char == "'" and not in_double_quotes:
+            in_single_quotes = not in_single_quotes
+            current += char
+        elif char == separator and not in_single_quotes and not in_double_quotes:
+            result_list.append(current)
+            current = ""
+            while i + 1 < len(value) and value[i + 1] == separator:
+                i += 1
+        else:
+            current += char
+        i += 1
+    result_list.append(current)
+    return result_list
+
+
+def run(split) -> float:
+    """
+    :return: The time taken to split all signatures, repeatedly, in seconds.
+    """
+    start_time = time.perf_counter()
+    for _ in range(REPEATS):
+        for signature in SIGNATURES:
+            split(signature)
+    return time.perf_counter() - start_time
+
+
+class TextBenchmark(unittest.TestCase):
+    def test_split_preserving_quotes(self):
+        uncached = text._split_preserving_quotes.__wrapped__
+        legacy = run(legacy_split_preserving_quotes)
+        scan = run(lambda signature: uncached(signature, ' ', False))
+        cached = run(split_preserving_quotes)
+        print(f'\n{REPEATS} x {len(SIGNATURES)} signatures, {len(SIGNATURES[-1])} chars at most: '
+              f'legacy: {legacy * 1000:.2f} ms, scan: {scan * 1000:.2f} ms ({legacy / scan:.1f}x), '
+              f'cached: {cached * 1000:.2f} ms ({legacy / cached:.1f}x)')
+        self.assertLess(scan, legacy)
+        self.assertLess(cached, scan)
+
+
+if __name__ == '__main__':
+    unittest.main()
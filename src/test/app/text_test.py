@@ -145,5 +145,19 @@ class TextTest(unittest.TestCase):
         self.assertEqual(result, expected)
 
 
+    def test_list_format_string_is_not_split_nor_unquoted(self):
+        result = split_preserving_quotes('"say" [\'a b\', "c"]. end', remove_quotes=True)
+        self.assertEqual(result, ['say', '[\'a b\', "c"].', 'end'])
+
+    def test_returned_list_is_not_shared(self):
+        result = split_preserving_quotes('click "Sign in" button')
+        result[1] = 'changed'
+        self.assertEqual(split_preserving_quotes('click "Sign in" button'), ['click', '"Sign in"', 'button'])
+
+    def test_long_quoted_text(self):
+        content = ' '.join(['word'] * 2000)
+        result = split_preserving_quotes(f'enter_text "{content}" next', remove_quotes=True)
+        self.assertEqual(result, ['enter_text', content, 'next'])
+
 if __name__ == '__main__':
     unittest.main()
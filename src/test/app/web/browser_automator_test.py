@@ -4,7 +4,7 @@ import unittest
 
 from aideas.app.config import AgentConfig, Name
 from aideas.app.run_context import RunContext
-from aideas.app.web.browser_automator import BrowserAutomationListener
+from aideas.app.web.browser_automator import BrowserAutomationListener, BrowserAutomator
 from test.app.test_functions import get_run_context
 from test.app.web.test_browser_automator import TestBrowserAutomator
 
@@ -32,6 +32,30 @@ stages:
             browser_automator.act_on_elements(AgentConfig(agent_config), Name.of("stage-1"), run_context)
             on_start.assert_called_once()
 
+    def test_locate_elements_given_items_with_variables_locates_only_the_others(self):
+        agent_config = load_yaml_str("""
+stages:
+  stage-1:
+    stage-items:
+      with-literal-query:
+        search-for: //button
+      with-context-variable:
+        search-for: //button[text()="${context.label}"]
+      without-search:
+        actions: log INFO none
+        """)
+        element_selector = mock.MagicMock()
+        element_selector.rank_queries.side_effect = lambda search_configs, key: search_configs
+        browser_automator = BrowserAutomator(
+            mock.MagicMock(), 1, 'test-agent', element_selector,
+            mock.MagicMock(), mock.MagicMock(), mock.MagicMock())
+
+        browser_automator._BrowserAutomator__locate_elements(
+            AgentConfig(agent_config), Name.of('stage-1'), get_run_context(['test-agent']))
+
+        located = element_selector.locate_all.call_args[0][0]
+        self.assertEqual([['//button']], [list(e.search_for().get_queries()) for e in located])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,79 @@
+import os
+import tempfile
+import time
+import unittest
+
+from aideas.app.config import SearchBy, SearchConfig, SearchConfigs
+from test.app.test_functions import create_webdriver
+from test.app.web.element_selector_test import get_element_selector
+
+# Each host element has a shadow root, holding more elements, one of which is the next host.
+PAGE = """
+<html>
+<body>
+<div id="content"></div>
+<script>
+  let parent = document.getElementById('content');
+  for (let depth = 0; depth < %(depth)d; depth++) {
+    const host = document.createElement('div');
+    parent.appendChild(host);
+    const shadow = host.attachShadow({mode: 'open'});
+    for (let i = 0; i < %(siblings)d; i++) {
+      const sibling = document.createElement('span');
+      sibling.setAttribute('class', 'sibling-' + i);
+      sibling.textContent = 'sibling ' + i;
+      shadow.appendChild(sibling);
+    }
+    parent = document.createElement('div');
+    shadow.appendChild(parent);
+  }
+  const target = document.createElement('button');
+  target.setAttribute('id', 'target');
+  target.setAttribute('type', 'button');
+  target.textContent = 'target';
+  parent.appendChild(target);
+</script>
+</body>
+</html>
+"""
+
+
+class ElementSelectorBenchmark(unittest.TestCase):
+    """
+    Compares the round trips to the browser, and the time taken, to select an element nested
+    within shadow roots, when searching element by element vs. searching within the page.
+    """
+    def test_shadow_attributes_vs_shadow_attributes_in_page(self):
+        with tempfile.TemporaryDirectory() as page_dir:
+            page = os.path.join(page_dir, 'shadow_page.html')
+            with open(page, 'w') as file:
+                file.write(PAGE % {'depth': 5, 'siblings': 20})
+
+            webdriver = create_webdriver()
+            try:
+                webdriver.get(f'file://{page}')
+                element_selector = get_element_selector(webdriver)
+                round_trips = [0]
+                execute = webdriver.execute
+
+                def count_round_trips(*args, **kwargs):
+                    round_trips[0] += 1
+                    return execute(*args, **kwargs)
+
+                webdriver.execute = count_round_trips
+
+                for search_by in [SearchBy.SHADOW_ATTRIBUTE, SearchBy.SHADOW_ATTRIBUTE_IN_PAGE]:
+                    round_trips[0] = 0
+                    start_time = time.time()
+                    element = element_selector.select_element(
+                        SearchConfigs(SearchConfig(search_by, 'id=target type=button')))
+                    seconds = time.time() - start_time
+                    print(f"\n{search_by.value}: {round_trips[0]} round trips, "
+                          f"{seconds * 1000:.1f} ms")
+                    self.assertEqual('target', element.get_attribute('id'))
+            finally:
+                webdriver.quit()
+
+
+if __name__ == '__main__':
+    unittest.main()
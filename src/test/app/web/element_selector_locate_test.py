@@ -0,0 +1,90 @@
+import unittest
+from unittest.mock import MagicMock
+
+from aideas.app.config import SearchBy, SearchConfig, SearchConfigs
+from aideas.app.env import get_cookies_file
+from aideas.app.web.element_selector import ElementSelector, ElementNotFoundError
+from test.app.web.noop_cookie_store import NoopCookieStore
+
+
+def get_element_selector(webdriver, timeout: float = 0) -> ElementSelector:
+    return ElementSelector(
+        webdriver, timeout, NoopCookieStore(webdriver, get_cookies_file("test-agent")))
+
+
+def xpaths(*queries: str) -> SearchConfigs:
+    return SearchConfigs(SearchConfig(SearchBy.XPATH, list(queries)))
+
+
+class ElementSelectorLocateTest(unittest.TestCase):
+    def test_select_element_evaluates_all_queries_in_one_call(self):
+        webdriver = MagicMock()
+        element = MagicMock()
+        webdriver.execute_script.return_value = [[1, element, True]]
+        search_configs = xpaths('//*[@id="a"]', '//*[@id="b"]', '//*[@id="c"]')
+
+        result = get_element_selector(webdriver).select_element(search_configs)
+
+        self.assertIs(element, result.get_delegate())
+        self.assertEqual(1, webdriver.execute_script.call_count)
+        queries = webdriver.execute_script.call_args[0][1]
+        self.assertEqual([['//*[@id="a"]', '//*[@id="b"]', '//*[@id="c"]']], queries)
+        self.assertEqual('//*[@id="b"]', search_configs.search_for().get_queries()[0])
+
+    def test_select_element_given_no_match_raises(self):
+        webdriver = MagicMock()
+        webdriver.execute_script.return_value = [[-1, None, False]]
+        with self.assertRaises(ElementNotFoundError):
+            get_element_selector(webdriver).select_element(xpaths('//*[@id="a"]'))
+
+    def test_select_element_given_timeout_settles_for_element_not_clickable(self):
+        webdriver = MagicMock()
+        element = MagicMock()
+        webdriver.execute_script.return_value = [[0, element, False]]
+        result = get_element_selector(webdriver, 0.6).select_element(xpaths('//*[@id="a"]'))
+        self.assertIs(element, result.get_delegate())
+        self.assertEqual(2, webdriver.execute_script.call_count)
+
+    def test_locate_all_locates_every_config_in_one_call(self):
+        webdriver = MagicMock()
+        webdriver.execute_script.return_value = [[1, None, True], [-1, None, False]]
+        shadow = SearchConfigs(SearchConfig(SearchBy.SHADOW_ATTRIBUTE, 'id=a'))
+
+        result = get_element_selector(webdriver).locate_all([
+            xpaths('//*[@id="a"]', '//*[@id="b"]'), shadow, xpaths('//*[@id="c"]')])
+
+        self.assertEqual([1, -1, -1], result)
+        self.assertEqual(1, webdriver.execute_script.call_count)
+        queries = webdriver.execute_script.call_args[0][1]
+        self.assertEqual([['//*[@id="a"]', '//*[@id="b"]'], ['//*[@id="c"]']], queries)
+
+    def test_select_element_prefers_query_located_earlier(self):
+        webdriver = MagicMock()
+        element_selector = get_element_selector(webdriver)
+        webdriver.execute_script.return_value = [[1, None, True]]
+        element_selector.locate_all([xpaths('//*[@id="a"]', '//*[@id="b"]')])
+
+        webdriver.execute_script.return_value = [[0, MagicMock(), True]]
+        search_configs = xpaths('//*[@id="a"]', '//*[@id="b"]')
+        element_selector.with_timeout(5).select_element(search_configs)
+
+        queries = webdriver.execute_script.call_args[0][1]
+        self.assertEqual([['//*[@id="b"]', '//*[@id="a"]']], queries)
+
+    def test_select_element_given_shadow_attributes_in_page_searches_in_one_call(self):
+        webdriver = MagicMock()
+        element = MagicMock()
+        webdriver.execute_script.return_value = [[0, element, True]]
+        search_configs = SearchConfigs(SearchConfig(
+            SearchBy.SHADOW_ATTRIBUTE_IN_PAGE, ['type=file data-media-type=image']))
+
+        result = get_element_selector(webdriver).select_element(search_configs)
+
+        self.assertIs(element, result.get_delegate())
+        self.assertEqual(1, webdriver.execute_script.call_count)
+        queries = webdriver.execute_script.call_args[0][1]
+        self.assertEqual([[{'type': 'file', 'data-media-type': 'image'}]], queries)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import time
+import unittest
+from unittest.mock import MagicMock
+
+from aideas.app.web.page_waiter import PageWaiter
+
+
+def probes(*results: list) -> MagicMock:
+    """
+    :param results: Each a list of: [millis since DOM mutation, millis since network activity,
+    requests in flight, document loaded]. The last is repeated.
+    """
+    webdriver = MagicMock()
+    results = list(results)
+
+    def execute_script(*_):
+        return results.pop(0) if len(results) > 1 else results[0]
+
+    webdriver.execute_script.side_effect = execute_script
+    return webdriver
+
+
+class PageWaiterTest(unittest.TestCase):
+    def test_wait_until_stable_returns_as_soon_as_page_settles(self):
+        webdriver = probes([0, 0, 2, False], [100, 100, 1, True], [600, 600, 0, True])
+        start_time = time.time()
+        settled = PageWaiter(webdriver, 0.01).wait_until_stable(10)
+        self.assertTrue(settled)
+        self.assertLess(time.time() - start_time, 1)
+        self.assertEqual(3, webdriver.execute_script.call_count)
+
+    def test_wait_until_stable_given_busy_page_times_out(self):
+        webdriver = probes([600, 0, 1, True])
+        start_time = time.time()
+        settled = PageWaiter(webdriver, 0.01).wait_until_stable(0.1)
+        self.assertFalse(settled)
+        self.assertGreaterEqual(time.time() - start_time, 0.1)
+
+    def test_wait_for_dom_mutation_quiet_ignores_network(self):
+        webdriver = probes([600, 0, 3, False])
+        self.assertTrue(PageWaiter(webdriver, 0.01).wait_for_dom_mutation_quiet(0.1))
+        self.assertFalse(PageWaiter(webdriver, 0.01).wait_for_network_idle(0.05))
+
+    def test_wait_given_negative_timeout_raises(self):
+        with self.assertRaises(ValueError):
+            PageWaiter(probes([600, 600, 0, True])).wait_until_stable(-1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+from unittest.mock import MagicMock
+
+from aideas.app.config import SearchBy, SearchConfig, SearchConfigs
+from aideas.app.env import get_cookies_file
+from aideas.app.web.element_selector import ElementSelector
+from aideas.app.web.selector_stats import SelectorStatsStore
+from test.app.web.noop_cookie_store import NoopCookieStore
+
+KEY = 'test-agent/stage/stage-item'
+HOUR = 60 * 60
+
+
+class SelectorStatsTest(unittest.TestCase):
+    def setUp(self):
+        self.__dir = tempfile.TemporaryDirectory()
+        self.__db_path = os.path.join(self.__dir.name, 'selector-stats.db')
+
+    def tearDown(self):
+        self.__dir.cleanup()
+
+    def test_rank_given_no_stats_keeps_order(self):
+        store = SelectorStatsStore(self.__db_path)
+        self.assertEqual(['a', 'b', 'c'], store.rank(KEY, ['a', 'b', 'c']))
+        store.close()
+
+    def test_rank_prefers_most_successful_query(self):
+        store = SelectorStatsStore(self.__db_path)
+        store.record(KEY, [('c', 0.1)], ['a', 'b'])
+        store.record(KEY, [('c', 0.3)], ['a', 'b'])
+        self.assertEqual(['c', 'a', 'b'], store.rank(KEY, ['a', 'b', 'c']))
+        self.assertEqual(['a', 'b', 'c'], store.rank('other/stage/item', ['a', 'b', 'c']))
+        stats = store.load(KEY, ['c'])['c']
+        self.assertAlmostEqual(0.2, stats.mean_seconds())
+        store.close()
+
+    def test_stats_are_shared_via_the_database(self):
+        writer = SelectorStatsStore(self.__db_path)
+        reader = SelectorStatsStore(self.__db_path)
+        writer.record(KEY, [('b', 0.1)], ['a'])
+        self.assertEqual(['b', 'a'], reader.rank(KEY, ['a', 'b']))
+        writer.close()
+        reader.close()
+
+    def test_past_outcomes_decay_so_that_a_changed_page_is_relearned(self):
+        with mock.patch('aideas.app.web.selector_stats.time') as time:
+            time.time.return_value = 0
+            store = SelectorStatsStore(self.__db_path, half_life_seconds=HOUR)
+            for _ in range(8):
+                store.record(KEY, [('a', 0.1)])
+            self.assertEqual(['a', 'b'], store.rank(KEY, ['b', 'a']))
+
+            # The page changed, 'a' no longer finds an element.
+            time.time.return_value = 10 * HOUR
+            store.record(KEY, [('b', 0.1)], ['a'])
+            self.assertEqual(['b', 'a'], store.rank(KEY, ['a', 'b']))
+            self.assertLess(store.load(KEY, ['a'])['a'].hits, 0.01)
+            store.close()
+
+    def test_element_selector_records_and_ranks_queries(self):
+        store = SelectorStatsStore(self.__db_path)
+        webdriver = MagicMock()
+        element = MagicMock()
+        webdriver.execute_script.return_value = [[1, element, True]]
+        element_selector = ElementSelector(
+            webdriver, 0, NoopCookieStore(webdriver, get_cookies_file("test-agent")),
+            selector_stats=store)
+
+        def search_configs() -> SearchConfigs:
+            return SearchConfigs(SearchConfig(SearchBy.XPATH, ['//a', '//b']))
+
+        element_selector.select_element(search_configs(), KEY)
+
+        self.assertEqual(['//b', '//a'], store.rank(KEY, ['//a', '//b']))
+        ranked = element_selector.rank_queries(search_configs(), KEY)
+        self.assertEqual(['//b', '//a'], ranked.search_for().get_queries())
+        store.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
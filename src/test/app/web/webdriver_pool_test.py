@@ -0,0 +1,131 @@
+from unittest import mock
+
+import unittest
+
+from aideas.app.config import BrowserConfig
+from aideas.app.web.webdriver_pool import WebDriverPool
+
+
+def browser_config(max_idle: int = 1, max_uses: int = 20) -> BrowserConfig:
+    return BrowserConfig({
+        'pool': {'max-idle': max_idle, 'max-uses': max_uses},
+        'chrome': {'options': {'args': ['headless']}}
+    })
+
+
+def create_webdriver(agent_name: str, config: BrowserConfig):
+    web_driver = mock.MagicMock()
+    web_driver.window_handles = ['handle-0']
+    return web_driver
+
+
+def create_cookie_keeping_webdriver(agent_name: str, config: BrowserConfig):
+    """Keeps cookies by domain, as a browser does, across the sites visited."""
+    web_driver = create_webdriver(agent_name, config)
+    web_driver.cookies = {}
+    web_driver.current_domain = None
+
+    def visit(domain: str, cookie: str):
+        web_driver.current_domain = domain
+        web_driver.cookies.setdefault(domain, {})[cookie] = 'session'
+
+    def execute_cdp_cmd(cmd: str, params: dict):
+        if cmd == 'Network.getAllCookies':
+            return {'cookies': [{'domain': domain, 'name': name}
+                                for domain, cookies in web_driver.cookies.items()
+                                for name in cookies]}
+        if cmd == 'Network.clearBrowserCookies':
+            web_driver.cookies.clear()
+        return {}
+
+    web_driver.visit = visit
+    web_driver.delete_all_cookies.side_effect = \
+        lambda: web_driver.cookies.pop(web_driver.current_domain, None)
+    web_driver.execute_cdp_cmd.side_effect = execute_cdp_cmd
+    return web_driver
+
+
+class WebDriverPoolTest(unittest.TestCase):
+    def test_lease_given_released_driver_reuses_it(self):
+        pool = WebDriverPool(create_webdriver)
+        web_driver = pool.lease('test-agent', browser_config())
+        pool.release(web_driver)
+        self.assertIs(web_driver, pool.lease('test-agent', browser_config()))
+        web_driver.execute_cdp_cmd.assert_any_call('Network.clearBrowserCookies', {})
+        web_driver.quit.assert_not_called()
+
+    def test_release_clears_cookies_of_every_domain(self):
+        pool = WebDriverPool(create_cookie_keeping_webdriver)
+        web_driver = pool.lease('test-agent', browser_config())
+        web_driver.visit('.first.example.com', 'login')
+        web_driver.visit('.second.example.com', 'login')
+        pool.release(web_driver)
+        self.assertIs(web_driver, pool.lease('other-agent', browser_config()))
+        self.assertEqual({}, web_driver.cookies)
+        web_driver.execute_cdp_cmd.assert_any_call(
+            'Storage.clearDataForOrigin',
+            {'origin': 'https://first.example.com', 'storageTypes': 'all'})
+
+    def test_lease_given_different_config_creates_driver(self):
+        pool = WebDriverPool(create_webdriver)
+        web_driver = pool.lease('test-agent', browser_config())
+        pool.release(web_driver)
+        other_config = BrowserConfig({'chrome': {'options': {'args': ['start-maximized']}}})
+        self.assertIsNot(web_driver, pool.lease('test-agent', other_config))
+
+    def test_release_given_user_data_dir_quits_driver_without_clearing_it(self):
+        pool = WebDriverPool(create_webdriver)
+        config = BrowserConfig({'pool': {'max-idle': 1},
+                                'chrome': {'options': {'args': ['user-data-dir=/tmp/profile']}}})
+        web_driver = pool.lease('test-agent', config)
+        pool.release(web_driver)
+        web_driver.quit.assert_called_once()
+        self.assertNotIn(mock.call('Network.clearBrowserCookies', {}),
+                         web_driver.execute_cdp_cmd.call_args_list)
+        self.assertEqual(0, pool.warm('test-agent', config))
+
+    def test_release_given_pooling_disabled_quits_driver(self):
+        pool = WebDriverPool(create_webdriver)
+        web_driver = pool.lease('test-agent', browser_config(0))
+        pool.release(web_driver)
+        web_driver.quit.assert_called_once()
+        self.assertEqual(0, pool.idle_count())
+
+    def test_release_given_max_uses_reached_evicts_driver(self):
+        pool = WebDriverPool(create_webdriver)
+        with mock.patch.object(WebDriverPool, 'warm'):
+            web_driver = pool.lease('test-agent', browser_config(1, 1))
+            pool.release(web_driver)
+            web_driver.quit.assert_called_once()
+            self.assertIsNot(web_driver, pool.lease('test-agent', browser_config(1, 1)))
+
+    def test_lease_given_crashed_driver_evicts_it(self):
+        pool = WebDriverPool(create_webdriver)
+        web_driver = pool.lease('test-agent', browser_config())
+        pool.release(web_driver)
+        type(web_driver).window_handles = mock.PropertyMock(side_effect=Exception('crashed'))
+        self.assertIsNot(web_driver, pool.lease('test-agent', browser_config()))
+        web_driver.quit.assert_called_once()
+
+    def test_warm_creates_idle_drivers_up_to_max_idle(self):
+        pool = WebDriverPool(create_webdriver)
+        self.assertEqual(2, pool.warm('test-agent', browser_config(2), 3))
+        self.assertEqual(2, pool.idle_count(browser_config(2)))
+
+    def test_release_given_driver_not_leased_quits_driver(self):
+        pool = WebDriverPool(create_webdriver)
+        web_driver = create_webdriver('test-agent', browser_config())
+        pool.release(web_driver)
+        web_driver.quit.assert_called_once()
+        self.assertEqual(0, pool.idle_count())
+
+    def test_shutdown_quits_idle_drivers(self):
+        pool = WebDriverPool(create_webdriver)
+        web_driver = pool.lease('test-agent', browser_config())
+        pool.release(web_driver)
+        pool.shutdown()
+        web_driver.quit.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()